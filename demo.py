@@ -6,7 +6,6 @@ Shows game mechanics without requiring pygame
 
 import sys
 import os
-import time
 
 # Add the game directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'game'))
@@ -29,7 +28,6 @@ def demo_plant_growth():
         # Simulate growth over time
         print("Simulating plant growth...")
         for i in range(6):
-            time.sleep(0.5)  # Simulate time passing
             plant.update(2.0)  # 2 seconds of growth
             
             print(f"Time {i*2}s: Stage = {plant.get_current_stage()}, "
@@ -75,7 +73,6 @@ def demo_garden_management():
         # Simulate garden updates
         print("Simulating garden updates...")
         for i in range(3):
-            time.sleep(0.5)
             garden.update(3.0)  # 3 seconds of growth
             
             print(f"Update {i+1}:")
@@ -109,7 +106,6 @@ def demo_economy():
         # Simulate market changes
         print("Simulating market changes...")
         for i in range(3):
-            time.sleep(0.5)
             economy.update_market_prices()
             
             print(f"Day {i+1} prices:")
@@ -0,0 +1,89 @@
+"""
+Achievements
+Threshold achievements over game counters (earnings, harvests, level, ...)
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# (counter, threshold, name) of one achievement
+Achievement = Tuple[str, float, str]
+
+
+class AchievementTracker:
+    """Unlocks achievements as the counters they watch pass their thresholds
+
+    The thresholds of each counter are kept sorted behind a cursor at the
+    first one not reached yet, with that threshold cached on its own. A
+    counter is only reported when it changes, and a report that crosses
+    nothing is one comparison however many achievements exist; a report
+    that crosses several unlocks them all with one bisect.
+    """
+
+    def __init__(self, definitions: Optional[Dict[str, Dict[float, str]]] = None):
+        self.thresholds = {}  # Counter -> thresholds, sorted from the cursor on
+        self.names = {}  # Counter -> achievement names, parallel to thresholds
+        self.cursors = {}  # Counter -> index of the first locked threshold
+        self.next_thresholds = {}  # Counter -> first locked threshold (inf when none)
+        self.values = {}  # Counter -> last reported value
+        self.unlocked = []  # Every unlocked achievement, in unlock order
+        self.pending = []  # Unlocked achievements not collected yet
+        for counter, achievements in (definitions or {}).items():
+            self.add_all(counter, achievements)
+
+    def add(self, counter: str, threshold: float, name: str):
+        """Add an achievement, unlocking it at once if its counter is already past it"""
+        thresholds = self.thresholds.setdefault(counter, [])
+        names = self.names.setdefault(counter, [])
+        cursor = self.cursors.setdefault(counter, 0)
+        index = bisect_right(thresholds, threshold, lo=cursor)
+        thresholds.insert(index, threshold)
+        names.insert(index, name)
+        self.next_thresholds[counter] = thresholds[cursor]
+        if counter in self.values:
+            self.report(counter, self.values[counter])
+
+    def add_all(self, counter: str, achievements: Dict[float, str]):
+        """Add every {threshold: name} achievement of a counter"""
+        for threshold, name in achievements.items():
+            self.add(counter, threshold, name)
+
+    def report(self, counter: str, value: float) -> List[Achievement]:
+        """Record a counter's new value and return the achievements it unlocked"""
+        self.values[counter] = value
+        if value < self.next_thresholds.get(counter, float("inf")):
+            return []
+
+        thresholds = self.thresholds[counter]
+        cursor = self.cursors[counter]
+        reached = bisect_right(thresholds, value, lo=cursor)
+        unlocked = [(counter, thresholds[i], self.names[counter][i]) for i in range(cursor, reached)]
+        self.cursors[counter] = reached
+        self.next_thresholds[counter] = thresholds[reached] if reached < len(thresholds) else float("inf")
+        self.unlocked.extend(unlocked)
+        self.pending.extend(unlocked)
+        return unlocked
+
+    def next_achievement(self, counter: str) -> Optional[Tuple[float, str]]:
+        """Threshold and name of a counter's next locked achievement"""
+        cursor = self.cursors.get(counter, 0)
+        thresholds = self.thresholds.get(counter, [])
+        if cursor >= len(thresholds):
+            return None
+        return thresholds[cursor], self.names[counter][cursor]
+
+    def get_unlocked(self, counter: Optional[str] = None) -> List[Achievement]:
+        """Unlocked achievements, optionally of one counter only"""
+        return [achievement for achievement in self.unlocked if counter is None or achievement[0] == counter]
+
+    def collect(self) -> List[Achievement]:
+        """Take the achievements unlocked since the last collect (for notifications)"""
+        pending, self.pending = self.pending, []
+        return pending
+
+    def get_summary(self) -> Dict:
+        """Unlocked and total achievement counts"""
+        return {
+            "unlocked": len(self.unlocked),
+            "total": sum(len(thresholds) for thresholds in self.thresholds.values())
+        }
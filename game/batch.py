@@ -0,0 +1,353 @@
+"""
+Batch Simulation
+Runs seeded headless games over a grid of balance parameters
+
+Example:
+    python -m game.batch --param WATERING_BONUS=0.3,0.5,0.7 \\
+        --param PLANT_TYPES.carrot.growth_time=6,8 --seeds 1000 --output balance_runs
+
+Each parameter point is played once per seed by a simple scripted player.
+Per-run metrics are appended to a columnar results directory as each point
+finishes; points already in that directory are skipped on later runs.
+"""
+
+import argparse
+import copy
+import hashlib
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# The game modules import each other by bare name
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+if GAME_DIR not in sys.path:
+    sys.path.insert(0, GAME_DIR)
+
+import constants
+import plant
+from game_state import GameState
+
+# Default values of every constant a parameter point has overridden so far
+_DEFAULTS = {}
+
+# Three in-game days per run unless told otherwise
+DEFAULT_DURATION = 3 * constants.DAY_LENGTH
+
+# Metric columns written for every run besides the money curve
+RUN_COLUMNS = {
+    "point": np.int64,
+    "seed": np.int64,
+    "final_money": np.float64,
+    "total_earnings": np.float64,
+    "harvests": np.int64,
+    "mutations": np.int64,
+}
+
+
+def _game_modules() -> List:
+    """Loaded game modules, each holding its own copy of the constants"""
+    return [module for module in list(sys.modules.values())
+            if os.path.dirname(os.path.abspath(getattr(module, "__file__", None) or os.sep)) == GAME_DIR]
+
+
+def apply_parameters(params: Dict[str, float]):
+    """Set the constants for one parameter point, starting from the defaults
+
+    Keys name a constant ("WATERING_BONUS") or a value inside a constant
+    dictionary ("PLANT_TYPES.carrot.growth_time"). Constants overridden by an
+    earlier point and missing here go back to their defaults.
+    """
+    values = {name: copy.deepcopy(default) for name, default in _DEFAULTS.items()}
+    for key, value in params.items():
+        name, *path = key.split(".")
+        if name not in values:
+            if not hasattr(constants, name):
+                raise KeyError(f"Unknown constant: {name}")
+            _DEFAULTS[name] = copy.deepcopy(getattr(constants, name))
+            values[name] = copy.deepcopy(_DEFAULTS[name])
+        if path:
+            target = values[name]
+            for part in path[:-1]:
+                target = target[part]
+            if path[-1] not in target:
+                raise KeyError(f"Unknown constant: {key}")
+            target[path[-1]] = value
+        else:
+            values[name] = value
+
+    for module in _game_modules():
+        for name, value in values.items():
+            if hasattr(module, name):
+                setattr(module, name, value)
+
+    # Rebuild the species specs and growth rate lookup from the new values
+    plant.load_species(constants.CATALOG.with_species(constants.PLANT_TYPES))
+
+
+def _tend_garden(game_state: GameState):
+    """Scripted player turn: harvest, water to full, restock seeds and replant"""
+    garden = game_state.garden
+    game_state.harvest_plants()
+
+    # Water until nothing is thirsty (a unit per pass), so full plants get WATERING_BONUS
+    while game_state.water_plants()["applied"]:
+        pass
+
+    # Plant the unlocked crop with the best sale price per seed cost
+    def price_ratio(plant_type: str) -> float:
+        item = game_state.shop.get_item("seeds", plant_type)
+        price = game_state.economy.prices[constants.CATALOG.species_ids[plant_type]]
+        return price / max(1, item["cost"]) if item else 0.0
+    seed_type = max(game_state.unlocked_plants, key=price_ratio)
+
+    # Buy the seeds for every free tile (or as many as we can afford) in one checkout
+    free = [(x, y) for x, y in garden.get_plantable_positions() if garden.get_plant(x, y) is None]
+    cost = game_state.shop.get_item_cost("seeds", seed_type)
+    wanted = len(free) - game_state.player.seeds.get(seed_type, 0)
+    affordable = wanted if cost == 0 else min(wanted, int(game_state.economy.money // cost))
+    if affordable > 0:
+        game_state.purchase_items([("seeds", seed_type, affordable)])
+    
+    for x, y in free:
+        if not game_state.plant_seed(x, y, seed_type):
+            break
+
+
+def run_game(params: Dict[str, float], seed: int, duration: float, interval: float) -> Dict:
+    """Play one seeded headless game and return its metrics
+
+    The scripted player takes a turn every interval seconds, right after the
+    money balance is sampled.
+    """
+    apply_parameters(params)
+    turns = int(round(duration / interval))
+    money = np.empty(turns + 1)
+    with GameState(seed=seed) as game_state:
+        for turn in range(turns):
+            money[turn] = game_state.economy.money
+            _tend_garden(game_state)
+            game_state.simulate(interval)
+        money[turns] = game_state.economy.money
+
+    return {
+        "seed": seed,
+        "final_money": game_state.economy.money,
+        "total_earnings": game_state.total_earnings,
+        "harvests": game_state.plants_harvested,
+        "mutations": game_state.mutations_found,
+        "money": money
+    }
+
+
+def point_key(params: Dict[str, float], seeds: Sequence[int], duration: float, interval: float) -> str:
+    """Cache key for one parameter point and run configuration"""
+    config = {
+        "params": sorted(params.items()),
+        "seeds": list(seeds),
+        "duration": duration,
+        "interval": interval
+    }
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResultsStore:
+    """Append-only columnar results directory
+
+    Each column is a raw binary file of fixed-size rows, described by
+    columns.json; points.jsonl records every finished parameter point and
+    its row count. Rows past the last recorded point (left by an
+    interrupted batch) are dropped when the store is opened.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.points = []
+        points_path = os.path.join(path, "points.jsonl")
+        if os.path.exists(points_path):
+            with open(points_path) as f:
+                self.points = [json.loads(line) for line in f if line.strip()]
+        self.rows = sum(point["rows"] for point in self.points)
+
+        self.columns = {}
+        columns_path = os.path.join(path, "columns.json")
+        if os.path.exists(columns_path):
+            with open(columns_path) as f:
+                self.columns = json.load(f)
+        for name in self.columns:
+            self._truncate(name)
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, name + ".bin")
+
+    def _row_shape(self, name: str) -> Tuple[np.dtype, Tuple[int, ...]]:
+        spec = self.columns[name]
+        return np.dtype(spec["dtype"]), tuple(spec["shape"])
+
+    def _truncate(self, name: str):
+        """Cut a column file back to the rows of recorded points"""
+        dtype, shape = self._row_shape(name)
+        size = self.rows * dtype.itemsize * int(np.prod(shape))
+        column_path = self._column_path(name)
+        if os.path.exists(column_path) and os.path.getsize(column_path) > size:
+            with open(column_path, "r+b") as f:
+                f.truncate(size)
+
+    def evaluated_keys(self) -> set:
+        """Cache keys of every parameter point already in the store"""
+        return {point["key"] for point in self.points}
+
+    def append(self, key: str, params: Dict[str, float], columns: Dict[str, np.ndarray]):
+        """Append one finished parameter point's rows"""
+        if not self.columns:
+            self.columns = {name: {"dtype": values.dtype.str, "shape": list(values.shape[1:])}
+                            for name, values in columns.items()}
+            with open(os.path.join(self.path, "columns.json"), "w") as f:
+                json.dump(self.columns, f, indent=2)
+        elif set(columns) != set(self.columns):
+            raise ValueError(f"Results in {self.path} have columns {sorted(self.columns)}")
+
+        rows = 0
+        for name, values in columns.items():
+            dtype, shape = self._row_shape(name)
+            if values.shape[1:] != shape:
+                raise ValueError(f"Column {name} in {self.path} has row shape {shape}")
+            with open(self._column_path(name), "ab") as f:
+                values.astype(dtype).tofile(f)
+            rows = len(values)
+
+        # Recording the point commits its rows
+        point = {"key": key, "params": params, "rows": rows}
+        with open(os.path.join(self.path, "points.jsonl"), "a") as f:
+            f.write(json.dumps(point) + "\n")
+        self.points.append(point)
+        self.rows += rows
+
+
+def load_results(path: str) -> Dict[str, np.ndarray]:
+    """Load every column of a results directory
+
+    Parameter values are joined in as "param:<name>" columns (NaN for runs
+    whose point didn't set that parameter).
+    """
+    store = ResultsStore(path)
+    results = {}
+    for name in store.columns:
+        dtype, shape = store._row_shape(name)
+        results[name] = np.fromfile(store._column_path(name), dtype=dtype).reshape((store.rows,) + shape)
+
+    names = sorted({name for point in store.points for name in point["params"]})
+    for name in names:
+        results["param:" + name] = np.concatenate([
+            np.full(point["rows"], point["params"].get(name, np.nan), dtype=np.float64)
+            for point in store.points
+        ])
+    return results
+
+
+def parameter_points(grid: Dict[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """Every combination of the grid's parameter values"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+class _InlineExecutor(Executor):
+    """Runs submitted work immediately in this process"""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def run_batch(grid: Dict[str, Sequence[float]], seeds: Sequence[int], duration: float,
+              interval: float, output: str, workers: Optional[int] = None) -> int:
+    """Play every parameter point of the grid once per seed
+
+    Points whose cache key is already in the output store are skipped.
+    workers=0 plays in this process. Returns the number of games played.
+    """
+    store = ResultsStore(output)
+    evaluated = store.evaluated_keys()
+    pending = {}
+    for params in parameter_points(grid):
+        key = point_key(params, seeds, duration, interval)
+        if key not in evaluated and key not in pending:
+            pending[key] = params
+    if not pending:
+        return 0
+
+    executor = _InlineExecutor() if workers == 0 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        with executor:
+            futures = {
+                executor.submit(run_game, params, seed, duration, interval): key
+                for key, params in pending.items() for seed in seeds
+            }
+            finished = {key: [] for key in pending}
+            point_index = len(store.points)
+            for future in as_completed(futures):
+                key = futures[future]
+                finished[key].append(future.result())
+                if len(finished[key]) < len(seeds):
+                    continue
+
+                # Stream the point to disk as soon as all its seeds are done
+                runs = sorted(finished.pop(key), key=lambda run: run["seed"])
+                for run in runs:
+                    run["point"] = point_index
+                columns = {name: np.array([run[name] for run in runs], dtype=dtype)
+                           for name, dtype in RUN_COLUMNS.items()}
+                columns["money"] = np.stack([run["money"] for run in runs])
+                store.append(key, pending[key], columns)
+                point_index += 1
+    finally:
+        # Games played in this process leave the constants overridden
+        if workers == 0:
+            apply_parameters({})
+    return len(pending) * len(seeds)
+
+
+def _parse_param(text: str) -> Tuple[str, List[float]]:
+    """Parse NAME=v1,v2,... into a parameter name and its values"""
+    name, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"Expected NAME=v1,v2,... but got {text!r}")
+    parsed = []
+    for value in values.split(","):
+        try:
+            parsed.append(int(value))
+        except ValueError:
+            parsed.append(float(value))
+    return name.strip(), parsed
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Run seeded headless games over a grid of balance parameters")
+    parser.add_argument("--param", action="append", type=_parse_param, default=[],
+                        help="Constant and values to sweep, e.g. WATERING_BONUS=0.3,0.5 or PLANT_TYPES.corn.base_value=40,50")
+    parser.add_argument("--seeds", type=int, default=100, help="Games per parameter point")
+    parser.add_argument("--first-seed", type=int, default=0, help="Seed of the first game")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Game seconds per run")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between player turns and money samples")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 plays in this process)")
+    parser.add_argument("--output", default="batch_results", help="Results directory")
+    args = parser.parse_args(argv)
+
+    grid = dict(args.param)
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    points = len(parameter_points(grid))
+    print(f"Sweeping {points} parameter points x {args.seeds} seeds into {args.output}")
+    played = run_batch(grid, seeds, args.duration, args.interval, args.output, args.workers)
+    print(f"Played {played} games ({points * args.seeds - played} cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Game Catalog
+Loads the species and shop item catalog and compiles it into lookup arrays
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+
+# Bump when the compiled layout changes so old caches are rebuilt
+COMPILED_VERSION = 1
+
+# Field name -> accepted types, for each kind of catalog entry
+SPECIES_FIELDS = {
+    "name": (str,),
+    "growth_time": (int, float),
+    "water_need": (int,),
+    "base_value": (int,),
+    "mutation_chance": (int, float),
+    "color": (list,),
+}
+ITEM_FIELDS = {
+    "name": (str,),
+    "cost": (int,),
+    "description": (str,),
+}
+
+# Category the species' seed entries are sold under
+SEED_CATEGORY = "seeds"
+
+
+class CatalogError(ValueError):
+    """The catalog file is malformed"""
+
+
+def _unique_keys(pairs: List[Tuple[str, object]]) -> Dict:
+    """JSON object hook that rejects repeated keys instead of keeping the last"""
+    result = {}
+    for key, value in pairs:
+        if key in result:
+            raise CatalogError(f"Duplicate key {key!r}")
+        result[key] = value
+    return result
+
+
+def _check_fields(where: str, entry, fields: Dict[str, tuple], optional: Tuple[str, ...] = ()):
+    """Check an entry has exactly the expected fields with the expected types"""
+    if not isinstance(entry, dict):
+        raise CatalogError(f"{where}: expected an object")
+    missing = [name for name in fields if name not in entry]
+    if missing:
+        raise CatalogError(f"{where}: missing {', '.join(missing)}")
+    unknown = [name for name in entry if name not in fields and name not in optional]
+    if unknown:
+        raise CatalogError(f"{where}: unknown field {', '.join(unknown)}")
+    for name, types in fields.items():
+        # bool is an int subclass, but never a valid number here
+        if isinstance(entry[name], bool) or not isinstance(entry[name], types):
+            raise CatalogError(f"{where}.{name}: expected {' or '.join(t.__name__ for t in types)}")
+
+
+def _check_item(where: str, item):
+    _check_fields(where, item, ITEM_FIELDS)
+    if item["cost"] < 0:
+        raise CatalogError(f"{where}.cost: must not be negative")
+
+
+def compile_catalog(data: Dict) -> Dict[str, np.ndarray]:
+    """Validate parsed catalog data and compile it into flat arrays
+
+    Species and items are numbered in file order; those numbers are the
+    type ids and item ids the game uses.
+    """
+    _check_fields("catalog", data, {"version": (int,), "species": (dict,), "items": (dict,)})
+    if data["version"] != 1:
+        raise CatalogError(f"catalog.version: unsupported version {data['version']}")
+    if not data["species"]:
+        raise CatalogError("catalog.species: at least one species is required")
+
+    species = []
+    for key, entry in data["species"].items():
+        where = f"species.{key}"
+        _check_fields(where, entry, SPECIES_FIELDS, optional=("seed",))
+        if entry["growth_time"] <= 0:
+            raise CatalogError(f"{where}.growth_time: must be positive")
+        if entry["water_need"] < 1:
+            raise CatalogError(f"{where}.water_need: must be at least 1")
+        if entry["base_value"] < 0:
+            raise CatalogError(f"{where}.base_value: must not be negative")
+        if not 0.0 <= entry["mutation_chance"] <= 1.0:
+            raise CatalogError(f"{where}.mutation_chance: must be between 0 and 1")
+        color = entry["color"]
+        if len(color) != 3 or not all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255
+                                      for c in color):
+            raise CatalogError(f"{where}.color: expected three integers from 0 to 255")
+        if "seed" in entry:
+            _check_item(f"{where}.seed", entry["seed"])
+        species.append((key, entry))
+
+    if SEED_CATEGORY in data["items"]:
+        raise CatalogError(f"items.{SEED_CATEGORY}: seeds are listed under their species")
+    items = [(SEED_CATEGORY, key, entry["seed"]) for key, entry in species if "seed" in entry]
+    for category, entries in data["items"].items():
+        if not isinstance(entries, dict):
+            raise CatalogError(f"items.{category}: expected an object")
+        for key, item in entries.items():
+            _check_item(f"items.{category}.{key}", item)
+            items.append((category, key, item))
+
+    categories = list(dict.fromkeys(category for category, _, _ in items))
+    category_ids = {category: index for index, category in enumerate(categories)}
+    return {
+        "version": np.array(COMPILED_VERSION),
+        "species_keys": np.array([key for key, _ in species], dtype=str),
+        "species_names": np.array([entry["name"] for _, entry in species], dtype=str),
+        "growth_time": np.array([entry["growth_time"] for _, entry in species], dtype=np.float64),
+        "water_need": np.array([entry["water_need"] for _, entry in species], dtype=np.int64),
+        "base_value": np.array([entry["base_value"] for _, entry in species], dtype=np.int64),
+        "mutation_chance": np.array([entry["mutation_chance"] for _, entry in species], dtype=np.float64),
+        "color": np.array([entry["color"] for _, entry in species], dtype=np.uint8).reshape(-1, 3),
+        "item_categories": np.array(categories, dtype=str),
+        "item_category": np.array([category_ids[category] for category, _, _ in items], dtype=np.int64),
+        "item_keys": np.array([key for _, key, _ in items], dtype=str),
+        "item_names": np.array([item["name"] for _, _, item in items], dtype=str),
+        "item_costs": np.array([item["cost"] for _, _, item in items], dtype=np.int64),
+        "item_descriptions": np.array([item["description"] for _, _, item in items], dtype=str),
+    }
+
+
+class Catalog:
+    """Compiled catalog of species and shop items
+
+    Species and items are referred to by interned integer ids, with their
+    properties in dense arrays indexed by those ids.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.species_keys = arrays["species_keys"].tolist()
+        self.species_names = arrays["species_names"].tolist()
+        self.growth_time = arrays["growth_time"]
+        self.water_need = arrays["water_need"]
+        self.base_value = arrays["base_value"]
+        self.mutation_chance = arrays["mutation_chance"]
+        self.color = arrays["color"]
+        self.species_ids = {key: index for index, key in enumerate(self.species_keys)}
+
+        self.item_categories = arrays["item_categories"].tolist()
+        self.item_category = arrays["item_category"]
+        self.item_keys = arrays["item_keys"].tolist()
+        self.item_names = arrays["item_names"].tolist()
+        self.item_costs = arrays["item_costs"]
+        self.item_descriptions = arrays["item_descriptions"].tolist()
+        self.item_ids = {(self.item_categories[category], key): index
+                         for index, (category, key) in enumerate(zip(self.item_category.tolist(), self.item_keys))}
+
+    def with_species(self, plant_types: Dict[str, Dict]) -> "Catalog":
+        """Copy of the catalog with species values from a PLANT_TYPES-style dict
+
+        Species keep their ids; ones missing from plant_types keep their values.
+        """
+        catalog = copy.copy(self)
+        ids = [self.species_ids[key] for key in plant_types]
+        catalog.species_names = list(self.species_names)
+        for type_id, data in zip(ids, plant_types.values()):
+            catalog.species_names[type_id] = data["name"]
+        for field in ("growth_time", "water_need", "base_value", "mutation_chance", "color"):
+            column = getattr(self, field).copy()
+            column[ids] = [data[field] for data in plant_types.values()]
+            setattr(catalog, field, column)
+        return catalog
+
+    def plant_types(self) -> Dict[str, Dict]:
+        """Species in the PLANT_TYPES constant's format"""
+        return {
+            key: {
+                "name": self.species_names[index],
+                "growth_time": float(self.growth_time[index]),
+                "water_need": int(self.water_need[index]),
+                "base_value": int(self.base_value[index]),
+                "mutation_chance": float(self.mutation_chance[index]),
+                "color": tuple(self.color[index].tolist())
+            }
+            for index, key in enumerate(self.species_keys)
+        }
+
+    def shop_items(self) -> Dict[str, Dict[str, Dict]]:
+        """Items by category in the Shop.items format (fresh dicts)"""
+        items = {category: {} for category in self.item_categories}
+        costs = self.item_costs.tolist()
+        for index, category in enumerate(self.item_category.tolist()):
+            items[self.item_categories[category]][self.item_keys[index]] = {
+                "name": self.item_names[index],
+                "cost": costs[index],
+                "description": self.item_descriptions[index]
+            }
+        return items
+
+
+def _default_cache_path(path: str) -> str:
+    root, _ = os.path.splitext(path)
+    return root + ".cache.npz"
+
+
+def _write_cache(cache_path: str, arrays: Dict[str, np.ndarray]):
+    """Write the compiled arrays atomically (best effort: the cache is optional)"""
+    try:
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".npz")
+        with os.fdopen(handle, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if "temp_path" in locals() and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load_catalog(path: str = CATALOG_PATH, cache_path: Optional[str] = None) -> Catalog:
+    """Load a catalog file, reusing its compiled cache when it is current
+
+    The cache (catalog.cache.npz next to the file by default) stores the
+    compiled arrays with a hash of the source, so later starts only hash the
+    file and load arrays instead of parsing and validating it again.
+    """
+    cache_path = cache_path or _default_cache_path(path)
+    with open(path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha1(source).hexdigest()
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                if int(cached["version"]) == COMPILED_VERSION and str(cached["source_hash"]) == digest:
+                    return Catalog({name: cached[name] for name in cached.files})
+        except (OSError, KeyError, ValueError):
+            pass  # Unreadable or stale cache: recompile
+
+    try:
+        arrays = compile_catalog(json.loads(source.decode("utf-8"), object_pairs_hook=_unique_keys))
+    except ValueError as e:
+        raise CatalogError(f"{path}: {e}") from e
+    arrays["source_hash"] = np.array(digest)
+    _write_cache(cache_path, arrays)
+    return Catalog(arrays)
@@ -2,6 +2,8 @@
 Game Constants and Configuration
 """
 
+from catalog import load_catalog
+
 # Screen dimensions
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
@@ -10,6 +12,8 @@ SCREEN_HEIGHT = 768
 GRID_SIZE = 32
 GRID_WIDTH = 20
 GRID_HEIGHT = 15
+CHUNK_SIZE = 32  # Tiles per side of a garden chunk
+SPATIAL_BUCKET_SIZE = 8  # Tiles per side of a plant lookup bucket
 
 # Colors
 BLACK = (0, 0, 0)
@@ -37,12 +41,67 @@ WATERING_BONUS = 0.5
 FERTILIZER_BONUS = 0.3
 MUTATION_CHANCE = 0.05
 RARE_MUTATION_CHANCE = 0.02
+WATER_DECAY_INTERVAL = 10.0  # seconds per unit of water lost
+
+# Plant simulation modes
+GROWTH_MODE_VECTORIZED = "vectorized"  # Every plant advanced each frame
+GROWTH_MODE_SCHEDULED = "scheduled"  # Only plants with due growth events
+GROWTH_MODE_LAZY = "lazy"  # Plants catch up only when observed
+GROWTH_MODE_SHARDED = "sharded"  # Vectorized, split across worker processes
+GROWTH_MODE = GROWTH_MODE_VECTORIZED
+SHARD_MIN_ROWS = 250000  # Plants per worker before sharded mode uses worker processes
+
+# World timing (seconds)
+WEATHER_CHANGE_INTERVAL = 30.0
+DAY_LENGTH = 300.0
+
+# Pest infestations
+PEST_DURATION = 30.0  # seconds
+PEST_INITIAL_PLANTS = 3  # Plants destroyed where the pests land
+PEST_SPREAD_INTERVAL = 5.0  # seconds between contagion steps
+PEST_SPREAD_CHANCE = 0.25  # Chance per step for each plant next to a newly infested tile
+
+# Time warp (world simulation speed multiplier)
+MAX_TIME_WARP = 1000.0
+
+# Interactive loop timing
+SIM_TICK_RATE = 20  # Fixed simulation steps per second in the interactive loop
+MAX_CATCH_UP_STEPS = 5  # Most steps run in one frame; older backlog is dropped
+RENDER_FPS = 60  # Frame rate cap for drawing
 
 # Economy
 STARTING_MONEY = 100
 BASIC_SEED_COST = 10
 FERTILIZER_COST = 25
 BASIC_PLANT_VALUE = 20
+MARKET_VOLATILITY = 0.1  # Largest daily price multiplier change
+PRICE_HISTORY_LENGTH = 365  # Daily prices remembered per plant type
+PRICE_EMA_ALPHA = 0.3  # Weight of the newest price in the moving average
+PRICE_TREND_WINDOW = 7  # Days the latest price is compared against
+PRICE_TREND_THRESHOLD = 0.02  # Relative move that counts as rising or falling
+LEDGER_CHUNK_SIZE = 4096  # Transactions per ledger chunk
+LEDGER_MEMORY_CHUNKS = 16  # Full ledger chunks kept in memory before spilling to disk
+
+# Achievements over game counters ({counter: {threshold: name}}); money
+# milestones live in the economy
+ACHIEVEMENTS = {
+    "plants_harvested": {
+        1: "First Crop",
+        50: "Green Thumb",
+        250: "Seasoned Harvester",
+        1000: "Harvest Machine"
+    },
+    "mutations_found": {
+        1: "Something's Different",
+        10: "Mutant Collector",
+        50: "Genetic Pioneer"
+    },
+    "level": {
+        5: "Apprentice Gardener",
+        10: "Journeyman Gardener",
+        25: "Master Gardener"
+    }
+}
 
 # Game states
 STATE_MENU = "menu"
@@ -51,33 +110,9 @@ STATE_SHOP = "shop"
 STATE_INVENTORY = "inventory"
 STATE_PAUSED = "paused"
 
-# Plant types
-PLANT_TYPES = {
-    "carrot": {
-        "name": "Carrot",
-        "growth_time": 8.0,
-        "water_need": 2,
-        "base_value": 15,
-        "mutation_chance": 0.08,
-        "color": ORANGE
-    },
-    "tomato": {
-        "name": "Tomato",
-        "growth_time": 12.0,
-        "water_need": 3,
-        "base_value": 25,
-        "mutation_chance": 0.06,
-        "color": RED
-    },
-    "corn": {
-        "name": "Corn",
-        "growth_time": 15.0,
-        "water_need": 4,
-        "base_value": 35,
-        "mutation_chance": 0.04,
-        "color": YELLOW
-    }
-}
+# Plant types, from the species catalog (game/catalog.json)
+CATALOG = load_catalog()
+PLANT_TYPES = CATALOG.plant_types()
 
 # Growth stages
 GROWTH_STAGES = [
@@ -3,31 +3,132 @@ Economy Class
 Manages money, market prices, and economic systems
 """
 
-import random
 import time
-from typing import Dict, List
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from constants import *
-from plant import Plant
+from achievements import AchievementTracker
+from ledger import Ledger
+from plant import Plant, PlantTable, SPECIES, plant_values
+from rng import RandomStreams
+
+
+class PriceHistory:
+    """Fixed-capacity ring buffer of prices with running statistics
+    
+    Prefix sums of the prices and their squares are kept alongside the
+    ring, so the mean and variance of any trailing window take O(1).
+    Min and max over the whole horizon come from monotonic queues, and the
+    exponential moving average is updated as prices arrive.
+    """
+    
+    def __init__(self, capacity: int = PRICE_HISTORY_LENGTH, ema_alpha: float = PRICE_EMA_ALPHA):
+        self.capacity = capacity
+        self.ema_alpha = ema_alpha
+        self.prices = np.zeros(capacity)
+        
+        # Prefix sums over every price ever added; slot i % (capacity + 1)
+        # holds the sum of the first i prices
+        self.sums = np.zeros(capacity + 1)
+        self.square_sums = np.zeros(capacity + 1)
+        self.count = 0  # Prices added so far
+        self.ema = 0.0
+        
+        # (index, price) pairs with increasing / decreasing prices
+        self.min_queue = deque()
+        self.max_queue = deque()
+    
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    def append(self, price: float):
+        """Add the newest price, dropping the oldest once full"""
+        index = self.count
+        self.prices[index % self.capacity] = price
+        slots = self.capacity + 1
+        self.sums[(index + 1) % slots] = self.sums[index % slots] + price
+        self.square_sums[(index + 1) % slots] = self.square_sums[index % slots] + price * price
+        self.count += 1
+        self.ema = price if index == 0 else self.ema + self.ema_alpha * (price - self.ema)
+        
+        for queue, beaten in ((self.min_queue, lambda last: last >= price),
+                              (self.max_queue, lambda last: last <= price)):
+            while queue and beaten(queue[-1][1]):
+                queue.pop()
+            queue.append((index, price))
+            if queue[0][0] <= index - self.capacity:
+                queue.popleft()
+    
+    def latest(self) -> float:
+        """Most recent price"""
+        return float(self.prices[(self.count - 1) % self.capacity]) if self.count else 0.0
+    
+    def _window(self, window: Optional[int]) -> int:
+        """Clamp a window length to the prices held"""
+        return len(self) if window is None else max(0, min(window, len(self)))
+    
+    def _window_sums(self, window: int):
+        slots = self.capacity + 1
+        end, start = self.count % slots, (self.count - window) % slots
+        return self.sums[end] - self.sums[start], self.square_sums[end] - self.square_sums[start]
+    
+    def mean(self, window: Optional[int] = None) -> float:
+        """Mean of the last window prices (all held prices by default)"""
+        window = self._window(window)
+        if window == 0:
+            return 0.0
+        total, _ = self._window_sums(window)
+        return float(total / window)
+    
+    def variance(self, window: Optional[int] = None) -> float:
+        """Population variance of the last window prices"""
+        window = self._window(window)
+        if window == 0:
+            return 0.0
+        total, squares = self._window_sums(window)
+        return float(max(0.0, squares / window - (total / window) ** 2))
+    
+    def minimum(self) -> float:
+        """Lowest price held"""
+        return float(self.min_queue[0][1]) if self.min_queue else 0.0
+    
+    def maximum(self) -> float:
+        """Highest price held"""
+        return float(self.max_queue[0][1]) if self.max_queue else 0.0
+    
+    def values(self) -> np.ndarray:
+        """Held prices, oldest first"""
+        if self.count <= self.capacity:
+            return self.prices[:self.count].copy()
+        split = self.count % self.capacity
+        return np.concatenate([self.prices[split:], self.prices[:split]])
 
 class Economy:
-    """Economic system for the game"""
+    """Economic system for the game
     
-    def __init__(self):
+    Market prices are arrays indexed by species type id; base_prices,
+    current_prices and price_multipliers are dict views of them by plant type.
+    """
+    
+    def __init__(self, rng: Optional[RandomStreams] = None, achievements: Optional[AchievementTracker] = None):
         self.money = STARTING_MONEY
         self.total_earned = 0
         self.total_spent = 0
         
-        # Market prices and fluctuations
-        self.base_prices = {
-            "carrot": 15,
-            "tomato": 25,
-            "corn": 35,
-            "strawberry": 50,
-            "sunflower": 40
-        }
+        # Every transaction, stamped with the economy's own game clock
+        self.time = 0.0
+        self.ledger = Ledger()
         
-        self.current_prices = self.base_prices.copy()
-        self.price_multipliers = {plant: 1.0 for plant in self.base_prices}
+        # Market prices and fluctuations, indexed by type id
+        self.plant_types = [spec.plant_type for spec in SPECIES]
+        self.base_values = np.array([spec.base_value for spec in SPECIES], dtype=np.int64)
+        self.prices = self.base_values.copy()
+        self.multipliers = np.ones(len(SPECIES))
+        
+        # Price fluctuations are keyed by (market update, plant type)
+        self.market_rng = (rng if rng is not None else RandomStreams()).stream("market")
+        self.market_updates = 0
         
         # Market events
         self.market_boom = False
@@ -36,8 +137,7 @@ class Economy:
         self.market_crash_timer = 0.0
         
         # Price history for trends
-        self.price_history = {plant: [] for plant in self.base_prices}
-        self.max_history_length = 10
+        self.price_history = {plant: PriceHistory() for plant in self.plant_types}
         
         # Economic milestones
         self.milestones = {
@@ -49,9 +149,30 @@ class Economy:
             10000: "Plant Legend"
         }
         self.achieved_milestones = set()
+        
+        # Milestones are achievements over total earnings, checked as money comes in
+        self.achievements = achievements if achievements is not None else AchievementTracker()
+        self.achievements.add_all("total_earned", self.milestones)
+    
+    @property
+    def base_prices(self) -> Dict[str, int]:
+        """Base price by plant type"""
+        return dict(zip(self.plant_types, self.base_values.tolist()))
+    
+    @property
+    def current_prices(self) -> Dict[str, int]:
+        """Current market price by plant type"""
+        return dict(zip(self.plant_types, self.prices.tolist()))
+    
+    @property
+    def price_multipliers(self) -> Dict[str, float]:
+        """Market fluctuation multiplier by plant type"""
+        return dict(zip(self.plant_types, self.multipliers.tolist()))
     
     def update(self, dt: float):
         """Update economy state"""
+        self.time += dt
+        
         # Update market events
         if self.market_boom:
             self.market_boom_timer -= dt
@@ -62,23 +183,54 @@ class Economy:
             self.market_crash_timer -= dt
             if self.market_crash_timer <= 0:
                 self._end_market_crash()
+    
+    def time_to_next_event(self) -> float:
+        """Seconds until the next market event ends (infinite if none)"""
+        timers = [float("inf")]
+        if self.market_boom:
+            timers.append(self.market_boom_timer)
+        if self.market_crash:
+            timers.append(self.market_crash_timer)
+        return max(0.0, min(timers))
+    
+    def add_money(self, amount: int, kind: str = "other", item: str = ""):
+        """Add money to player's balance
         
-        # Check milestones
+        kind and item say where it came from (e.g. "sale", "carrot") in the ledger.
+        """
+        self.money += amount
+        self.total_earned += amount
+        self.ledger.append(self.time, kind, item, amount)
         self._check_milestones()
     
-    def add_money(self, amount: int):
-        """Add money to player's balance"""
+    def add_sales(self, sales: Dict[str, int]):
+        """Credit the proceeds of selling several plant types as one payment"""
+        amount = sum(sales.values())
         self.money += amount
         self.total_earned += amount
+        self.ledger.extend(self.time, "sale", list(sales), list(sales.values()))
+        self._check_milestones()
     
-    def spend_money(self, amount: int) -> bool:
-        """Spend money from player's balance"""
+    def spend_money(self, amount: int, kind: str = "other", item: str = "") -> bool:
+        """Spend money from player's balance (kind and item as in add_money)"""
         if self.money >= amount:
             self.money -= amount
             self.total_spent += amount
+            self.ledger.append(self.time, kind, item, -amount)
             return True
         return False
     
+    def spend_many(self, purchases: List[Tuple[str, str, int]]) -> bool:
+        """Pay for several (kind, item, amount) purchases as one debit, or none of them"""
+        amount = sum(cost for _, _, cost in purchases)
+        if self.money < amount:
+            return False
+        self.money -= amount
+        self.total_spent += amount
+        for kind, item, cost in purchases:
+            self.ledger.append(self.time, kind, item, -cost)
+        return True
+    
     def can_afford(self, cost: int) -> bool:
         """Check if player can afford a cost"""
         return self.money >= cost
@@ -87,55 +239,46 @@ class Economy:
         """Get current money balance"""
         return self.money
     
+    def _market_multiplier(self) -> float:
+        """Value multiplier from the current market event"""
+        if self.market_boom:
+            return 1.5
+        elif self.market_crash:
+            return 0.7
+        return 1.0
+    
     def calculate_plant_value(self, plant: Plant) -> int:
         """Calculate the value of a harvested plant"""
-        base_value = self.current_prices.get(plant.plant_type, 20)
-        
-        # Apply plant-specific modifiers
-        value = base_value
-        
-        # Stage bonus (more mature plants worth more)
-        stage_bonus = 1.0 + (plant.current_stage * 0.1)
-        value *= stage_bonus
-        
-        # Mutation bonus
-        if plant.is_mutated:
-            value *= 2.0  # Mutated plants worth double
-        
-        # Care bonus
-        care_bonus = 1.0
-        if plant.fertilized:
-            care_bonus += 0.2
-        if plant.water_level >= plant.max_water_level:
-            care_bonus += 0.1
+        return int(plant_values(self.prices[plant.spec.type_id], plant.current_stage, plant.is_mutated, plant.fertilized,
+                                plant.water_level >= plant.max_water_level, self._market_multiplier()))
+    
+    def calculate_values(self, table: PlantTable, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Values of many plants straight from their table columns
         
-        value *= care_bonus
+        Rows default to every active row; the result lines up with them.
+        Gives the same values as calculate_plant_value in one vectorized pass.
+        """
+        if rows is None:
+            rows = np.flatnonzero(table.active[:table.size])
+        if table.lazy:
+            table.sync_rows(rows)  # Stage and water only catch up when read
         
-        # Market condition bonus
-        if self.market_boom:
-            value = int(value * 1.5)
-        elif self.market_crash:
-            value = int(value * 0.7)
-        
-        return max(1, int(value))
+        return plant_values(self.prices[table.type_id[rows]], table.stage[rows], table.mutated[rows],
+                            table.fertilized[rows], table.water_level[rows] >= table.max_water_level[rows],
+                            self._market_multiplier())
     
     def update_market_prices(self):
         """Update market prices (called daily)"""
-        for plant_type in self.base_prices:
-            # Random price fluctuation
-            fluctuation = random.uniform(-0.1, 0.1)
-            self.price_multipliers[plant_type] += fluctuation
-            
-            # Keep multipliers within reasonable bounds
-            self.price_multipliers[plant_type] = max(0.5, min(2.0, self.price_multipliers[plant_type]))
-            
-            # Update current price
-            self.current_prices[plant_type] = int(self.base_prices[plant_type] * self.price_multipliers[plant_type])
-            
-            # Add to price history
-            self.price_history[plant_type].append(self.current_prices[plant_type])
-            if len(self.price_history[plant_type]) > self.max_history_length:
-                self.price_history[plant_type].pop(0)
+        self.market_updates += 1
+        
+        # Random price fluctuation, kept within reasonable bounds
+        rolls = np.array([self.market_rng.random_at(self.market_updates, plant_type) for plant_type in self.plant_types])
+        self.multipliers = np.clip(self.multipliers + MARKET_VOLATILITY * (2.0 * rolls - 1.0), 0.5, 2.0)
+        self._reset_prices()
+        
+        # Add to price history
+        for plant_type, price in zip(self.plant_types, self.prices.tolist()):
+            self.price_history[plant_type].append(price)
     
     def trigger_market_boom(self):
         """Trigger a market boom event"""
@@ -144,8 +287,7 @@ class Economy:
             self.market_boom_timer = 60.0  # Boom lasts 1 minute
             
             # Increase all prices
-            for plant_type in self.current_prices:
-                self.current_prices[plant_type] = int(self.current_prices[plant_type] * 1.5)
+            self.prices = (self.prices * 1.5).astype(np.int64)
     
     def trigger_market_crash(self):
         """Trigger a market crash event"""
@@ -154,8 +296,7 @@ class Economy:
             self.market_crash_timer = 45.0  # Crash lasts 45 seconds
             
             # Decrease all prices
-            for plant_type in self.current_prices:
-                self.current_prices[plant_type] = int(self.current_prices[plant_type] * 0.7)
+            self.prices = (self.prices * 0.7).astype(np.int64)
     
     def _end_market_boom(self):
         """End market boom event"""
@@ -163,8 +304,7 @@ class Economy:
         self.market_boom_timer = 0.0
         
         # Reset prices to normal
-        for plant_type in self.current_prices:
-            self.current_prices[plant_type] = int(self.base_prices[plant_type] * self.price_multipliers[plant_type])
+        self._reset_prices()
     
     def _end_market_crash(self):
         """End market crash event"""
@@ -172,23 +312,23 @@ class Economy:
         self.market_crash_timer = 0.0
         
         # Reset prices to normal
-        for plant_type in self.current_prices:
-            self.current_prices[plant_type] = int(self.base_prices[plant_type] * self.price_multipliers[plant_type])
+        self._reset_prices()
+    
+    def _reset_prices(self):
+        """Set current prices from the base prices and market multipliers"""
+        self.prices = (self.base_values * self.multipliers).astype(np.int64)
     
     def _check_milestones(self):
-        """Check for economic milestones"""
-        for milestone_amount in sorted(self.milestones.keys()):
-            if (self.total_earned >= milestone_amount and 
-                milestone_amount not in self.achieved_milestones):
-                self.achieved_milestones.add(milestone_amount)
-                # Could trigger achievement notification here
+        """Check for economic milestones (only needed when earnings change)"""
+        for _, milestone_amount, _ in self.achievements.report("total_earned", self.total_earned):
+            self.achieved_milestones.add(milestone_amount)
     
     def get_market_summary(self) -> Dict:
         """Get summary of market conditions"""
         return {
-            "current_prices": self.current_prices.copy(),
-            "base_prices": self.base_prices.copy(),
-            "price_multipliers": self.price_multipliers.copy(),
+            "current_prices": self.current_prices,
+            "base_prices": self.base_prices,
+            "price_multipliers": self.price_multipliers,
             "market_boom": self.market_boom,
             "market_crash": self.market_crash,
             "boom_timer": self.market_boom_timer,
@@ -206,36 +346,74 @@ class Economy:
             "next_milestone": self._get_next_milestone()
         }
     
+    def get_income_by_type(self) -> Dict[str, float]:
+        """Sale income per plant type over the whole session"""
+        return self.ledger.totals_by_item("sale")
+    
+    def get_spending_by_kind(self) -> Dict[str, float]:
+        """Money spent per kind of purchase over the whole session"""
+        return {kind: -amount for kind, amount in self.ledger.totals_by_kind(sign=-1).items()}
+    
+    def get_daily_net(self) -> Dict[int, float]:
+        """Income minus spending for each day so far"""
+        return self.ledger.daily_net()
+    
+    def get_rolling_spend(self, window: float = DAY_LENGTH) -> float:
+        """Money spent over the last window seconds"""
+        return self.ledger.rolling_spend(self.time, window)
+    
     def _get_next_milestone(self) -> str:
         """Get the next milestone to achieve"""
-        for milestone_amount in sorted(self.milestones.keys()):
-            if milestone_amount > self.total_earned:
-                return f"{self.milestones[milestone_amount]} ({milestone_amount - self.total_earned} more needed)"
-        return "All milestones achieved!"
+        milestone = self.achievements.next_achievement("total_earned")
+        if milestone is None:
+            return "All milestones achieved!"
+        milestone_amount, name = milestone
+        return f"{name} ({milestone_amount - self.total_earned} more needed)"
     
-    def get_price_trend(self, plant_type: str) -> str:
-        """Get price trend for a plant type"""
+    def get_price_trend(self, plant_type: str, window: int = PRICE_TREND_WINDOW) -> str:
+        """Get price trend for a plant type
+        
+        Compares the latest price with the mean of the last window prices.
+        """
         if plant_type not in self.price_history or len(self.price_history[plant_type]) < 2:
             return "stable"
         
         history = self.price_history[plant_type]
-        if len(history) >= 2:
-            recent_change = history[-1] - history[-2]
-            if recent_change > 0:
-                return "rising"
-            elif recent_change < 0:
-                return "falling"
+        mean = history.mean(window)
+        change = (history.latest() - mean) / mean if mean else 0.0
+        if change > PRICE_TREND_THRESHOLD:
+            return "rising"
+        elif change < -PRICE_TREND_THRESHOLD:
+            return "falling"
         
         return "stable"
     
+    def get_price_statistics(self, plant_type: str, window: Optional[int] = None) -> Dict:
+        """Windowed price statistics for a plant type (whole history by default)"""
+        history = self.price_history[plant_type]
+        return {
+            "latest": history.latest(),
+            "mean": history.mean(window),
+            "std": history.variance(window) ** 0.5,
+            "ema": history.ema,
+            "min": history.minimum(),
+            "max": history.maximum(),
+            "samples": min(len(history), window) if window is not None else len(history)
+        }
+    
     def get_best_investment(self) -> str:
-        """Get recommendation for best plant to invest in"""
+        """Get recommendation for best plant to invest in
+        
+        Ranks plants by their smoothed (moving average) price against the
+        base price, so a single lucky day doesn't dominate.
+        """
         best_plant = None
         best_ratio = 0
         
-        for plant_type, current_price in self.current_prices.items():
-            base_price = self.base_prices[plant_type]
-            ratio = current_price / base_price
+        for plant_type, current_price, base_price in zip(self.plant_types, self.prices.tolist(),
+                                                         self.base_values.tolist()):
+            history = self.price_history[plant_type]
+            ratio = (history.ema if len(history) else current_price) / base_price
             
             if ratio > best_ratio:
                 best_ratio = ratio
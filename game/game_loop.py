@@ -4,15 +4,22 @@ Main game loop handling input, updates, and rendering
 """
 
 import pygame
-from typing import Dict, List
+from typing import Dict, List, Optional
 from constants import *
 from renderer import Renderer
 from input_handler import InputHandler
+from sim_thread import Command, SimulationThread
+from timestep import FixedTimestep, Interpolator
 
 class GameLoop:
-    """Main game loop for the plant-growing game"""
+    """Main game loop for the plant-growing game
     
-    def __init__(self, screen: pygame.Surface, game_state, clock: pygame.time.Clock):
+    Threaded, the game state advances on a SimulationThread: input goes to
+    it as commands and drawing uses the snapshots it publishes. Otherwise
+    the loop steps the game state itself between frames.
+    """
+    
+    def __init__(self, screen: pygame.Surface, game_state, clock: pygame.time.Clock, threaded: bool = False):
         self.screen = screen
         self.game_state = game_state
         self.clock = clock
@@ -25,9 +32,21 @@ class GameLoop:
         self.running = True
         self.paused = False
         
-        # Performance
-        self.fps = 60
+        # Performance: the simulation steps at a fixed rate, drawing at up to fps
+        self.fps = RENDER_FPS
         self.last_time = pygame.time.get_ticks()
+        self.timestep = FixedTimestep()
+        
+        # Drawn positions and sizes are blended between the last two steps
+        visible_width = SCREEN_WIDTH // GRID_SIZE + 1
+        visible_height = SCREEN_HEIGHT // GRID_SIZE + 1
+        visible = (0, 0, visible_width, visible_height)
+        self.simulation = SimulationThread(game_state, visible) if threaded else None
+        if self.simulation is not None:
+            self.interpolator = self.simulation.interpolator
+        else:
+            self.interpolator = Interpolator(visible)
+            self.interpolator.capture(game_state)
         
         # UI state
         self.show_shop = False
@@ -40,19 +59,41 @@ class GameLoop:
     
     def run(self):
         """Main game loop"""
-        while self.running:
-            # Handle events
-            self._handle_events()
-            
-            # Update game state
-            if not self.paused:
+        if self.simulation is not None:
+            self.simulation.start()
+        try:
+            while self.running:
+                # Handle events
+                self._handle_events()
+                
+                # Update game state
                 self._update()
-            
-            # Render everything
-            self._render()
-            
-            # Cap frame rate
-            self.clock.tick(self.fps)
+                
+                # Render everything
+                self._render()
+                
+                # Cap frame rate
+                self.clock.tick(self.fps)
+        finally:
+            if self.simulation is not None:
+                self.simulation.stop()
+            self.game_state.close()
+    
+    def _command(self, command: Command, *args):
+        """Run command(game_state, *args) where the game state lives
+        
+        On the simulation thread when threaded (its notification arrives
+        with the next update), otherwise right away.
+        """
+        if self.simulation is not None:
+            self.simulation.submit(command, *args)
+            return
+        message = command(self.game_state, *args)
+        if message:
+            self._add_notification(message)
+        
+        # Show the change now rather than at the next step
+        self.interpolator.refresh(self.game_state)
     
     def _handle_events(self):
         """Handle pygame events"""
@@ -78,6 +119,8 @@ class GameLoop:
                 self.show_help = False
             else:
                 self.paused = not self.paused
+                if self.simulation is not None:
+                    self.simulation.paused = self.paused
         
         elif key == pygame.K_e:
             if not self.paused:
@@ -99,29 +142,29 @@ class GameLoop:
         
         elif key == pygame.K_SPACE:
             if not self.paused and not (self.show_shop or self.show_inventory or self.show_help):
-                self._handle_interaction()
+                self._command(_interact)
         
         # Movement keys
         elif key in [pygame.K_w, pygame.K_UP]:
-            self.game_state.player.move("up", True)
+            self._command(_move_player, "up", True)
         elif key in [pygame.K_s, pygame.K_DOWN]:
-            self.game_state.player.move("down", True)
+            self._command(_move_player, "down", True)
         elif key in [pygame.K_a, pygame.K_LEFT]:
-            self.game_state.player.move("left", True)
+            self._command(_move_player, "left", True)
         elif key in [pygame.K_d, pygame.K_RIGHT]:
-            self.game_state.player.move("right", True)
+            self._command(_move_player, "right", True)
     
     def _handle_keyup(self, key):
         """Handle key release events"""
         # Movement keys
         if key in [pygame.K_w, pygame.K_UP]:
-            self.game_state.player.move("up", False)
+            self._command(_move_player, "up", False)
         elif key in [pygame.K_s, pygame.K_DOWN]:
-            self.game_state.player.move("down", False)
+            self._command(_move_player, "down", False)
         elif key in [pygame.K_a, pygame.K_LEFT]:
-            self.game_state.player.move("left", False)
+            self._command(_move_player, "left", False)
         elif key in [pygame.K_d, pygame.K_RIGHT]:
-            self.game_state.player.move("right", False)
+            self._command(_move_player, "right", False)
     
     def _handle_mouse_click(self, pos, button):
         """Handle mouse click events"""
@@ -133,46 +176,6 @@ class GameLoop:
             else:
                 self._handle_garden_click(pos)
     
-    def _handle_interaction(self):
-        """Handle space bar interaction"""
-        player_x, player_y = self.game_state.player.get_grid_position()
-        
-        # Check if player is on a plantable tile
-        if self.game_state.garden._is_plantable_soil(player_x, player_y):
-            plant = self.game_state.garden.get_plant(player_x, player_y)
-            
-            if plant is None:
-                # Plant a seed
-                selected_seed = self.game_state.player.get_selected_seed()
-                if self.game_state.plant_seed(player_x, player_y, selected_seed):
-                    self._add_notification(f"Planted {selected_seed}!")
-                else:
-                    self._add_notification("Can't plant here!")
-            
-            elif plant.is_harvestable():
-                # Harvest the plant
-                if self.game_state.harvest_plant(player_x, player_y):
-                    value = plant.get_value()
-                    self._add_notification(f"Harvested {plant.name} for {value} coins!")
-                else:
-                    self._add_notification("Can't harvest this plant!")
-            
-            else:
-                # Water or fertilize the plant
-                selected_tool = self.game_state.player.get_selected_tool()
-                
-                if selected_tool == "basic_watering_can":
-                    if self.game_state.water_plant(player_x, player_y):
-                        self._add_notification("Watered the plant!")
-                    else:
-                        self._add_notification("Plant doesn't need water!")
-                
-                elif selected_tool == "fertilizer_spreader":
-                    if self.game_state.garden.fertilize_plant(player_x, player_y):
-                        self._add_notification("Applied fertilizer!")
-                    else:
-                        self._add_notification("Plant already fertilized!")
-    
     def _handle_shop_click(self, pos):
         """Handle clicks in the shop interface"""
         # This would handle shop item selection and purchase
@@ -191,22 +194,35 @@ class GameLoop:
         grid_x = pos[0] // GRID_SIZE
         grid_y = pos[1] // GRID_SIZE
         
-        # Check if it's a valid garden position
-        if (0 <= grid_x < self.game_state.garden.width and 
-            0 <= grid_y < self.game_state.garden.height):
-            
-            # Move player to clicked position
-            self.game_state.player.x = (grid_x * GRID_SIZE) + (GRID_SIZE // 2)
-            self.game_state.player.y = (grid_y * GRID_SIZE) + (GRID_SIZE // 2)
+        self._command(_move_player_to, grid_x, grid_y)
     
     def _update(self):
         """Update game state"""
         current_time = pygame.time.get_ticks()
         dt = (current_time - self.last_time) / 1000.0  # Convert to seconds
         self.last_time = current_time
+        if self.paused:
+            return
+        
+        if self.simulation is not None:
+            # The simulation thread steps itself; collect what it has to say
+            if self.simulation.error is not None:
+                raise self.simulation.error
+            for message in self.simulation.take_notifications():
+                self._add_notification(message)
+            self._update_notifications(dt)
+            return
         
-        # Update game state
-        self.game_state.update(dt)
+        # Step the game state at the fixed tick rate, capturing the last step for drawing
+        steps = self.timestep.advance(dt)
+        for _ in range(steps):
+            self.game_state.update(self.timestep.step)
+        if steps:
+            self.interpolator.capture(self.game_state, steps)
+        
+        # Announce achievements unlocked since the last frame
+        for _, _, name in self.game_state.achievements.collect():
+            self._add_notification(f"Achievement unlocked: {name}!")
         
         # Update notifications
         self._update_notifications(dt)
@@ -252,41 +268,49 @@ class GameLoop:
         pygame.display.flip()
     
     def _render_game(self):
-        """Render the main game view"""
+        """Render the main game view from the latest snapshots"""
+        snapshots = self.interpolator.read()
+        latest = snapshots[1]
+        alpha = self.simulation.alpha(snapshots) if self.simulation is not None else self.timestep.alpha
+        
         # Render garden
-        self.renderer.render_garden(self.game_state.garden)
+        self.renderer.render_soil(latest.soil, *latest.soil_size)
         
-        # Render plants
-        for plant in self.game_state.garden.plants.values():
-            self.renderer.render_plant(plant)
+        # Render plants on screen, sized between the last two steps
+        for visual, size in self.interpolator.plants(alpha, snapshots):
+            self.renderer.render_plant_visual(visual.x, visual.y, dict(visual.props, size=size))
         
         # Render player
-        self.renderer.render_player(self.game_state.player)
+        self.renderer.render_player(self.interpolator.player_position(alpha, snapshots), latest.player_direction)
         
         # Render UI
-        self._render_game_ui()
+        self._render_game_ui(latest.hud)
     
-    def _render_game_ui(self):
-        """Render in-game UI elements"""
+    def _render_game_ui(self, hud: Dict):
+        """Render in-game UI elements from a snapshot's HUD values"""
         # Money display
-        money_text = f"Money: {self.game_state.economy.money}"
+        money_text = f"Money: {hud['money']}"
         self.renderer.render_text(money_text, 10, 10, WHITE, 24)
         
         # Day display
-        day_text = f"Day: {self.game_state.day}"
+        day_text = f"Day: {hud['day']}"
         self.renderer.render_text(day_text, 10, 40, WHITE, 20)
         
         # Weather display
-        weather_text = f"Weather: {self.game_state.weather.title()}"
+        weather_text = f"Weather: {hud['weather'].title()}"
         self.renderer.render_text(weather_text, 10, 70, WHITE, 20)
         
         # Selected seed/tool
-        seed_text = f"Seed: {self.game_state.player.get_selected_seed()}"
+        seed_text = f"Seed: {hud['seed']}"
         self.renderer.render_text(seed_text, 10, 100, WHITE, 18)
         
-        tool_text = f"Tool: {self.game_state.player.get_selected_tool()}"
+        tool_text = f"Tool: {hud['tool']}"
         self.renderer.render_text(tool_text, 10, 125, WHITE, 18)
         
+        # Garden care counters
+        care_text = f"Ready: {hud['harvestable']}  Thirsty: {hud['thirsty']}"
+        self.renderer.render_text(care_text, 10, 150, WHITE, 18)
+        
         # Controls help
         controls = [
             "WASD: Move",
@@ -301,12 +325,13 @@ class GameLoop:
             self.renderer.render_text(control, SCREEN_WIDTH - 200, 10 + (i * 20), LIGHT_GRAY, 16)
     
     def _render_shop(self):
-        """Render shop interface"""
-        self.renderer.render_shop(self.game_state.shop, self.game_state.economy)
+        """Render shop interface from the latest snapshot"""
+        hud = self.interpolator.read()[1].hud
+        self.renderer.render_shop(hud["shop"], hud["money"])
     
     def _render_inventory(self):
-        """Render inventory interface"""
-        self.renderer.render_inventory(self.game_state.player)
+        """Render inventory interface from the latest snapshot"""
+        self.renderer.render_inventory(self.interpolator.read()[1].hud["inventory"])
     
     def _render_help(self):
         """Render help interface"""
@@ -332,3 +357,62 @@ class GameLoop:
                     alpha=alpha
                 )
                 y_offset += 30
+
+
+# Player commands, run wherever the game state lives (see GameLoop._command)
+
+def _move_player(game_state, direction: str, pressed: bool):
+    """Start or stop moving the player in a direction"""
+    game_state.player.move(direction, pressed)
+
+
+def _move_player_to(game_state, grid_x: int, grid_y: int):
+    """Move the player onto a clicked garden tile"""
+    # Check if it's a valid garden position
+    if (0 <= grid_x < game_state.garden.width and
+            0 <= grid_y < game_state.garden.height):
+        
+        # Move player to clicked position
+        game_state.player.x = (grid_x * GRID_SIZE) + (GRID_SIZE // 2)
+        game_state.player.y = (grid_y * GRID_SIZE) + (GRID_SIZE // 2)
+
+
+def _interact(game_state) -> Optional[str]:
+    """Space bar interaction: plant, harvest, water or fertilize the tile underfoot"""
+    player_x, player_y = game_state.player.get_grid_position()
+    
+    # Check if player is on a plantable tile
+    if not game_state.garden._is_plantable_soil(player_x, player_y):
+        return None
+    
+    # Look the tile up in the spatial index (a one-tile rect query)
+    plants = game_state.garden.get_plants_in_rect(player_x, player_y, player_x + 1, player_y + 1)
+    plant = plants[0] if plants else None
+    
+    if plant is None:
+        # Plant a seed
+        selected_seed = game_state.player.get_selected_seed()
+        if game_state.plant_seed(player_x, player_y, selected_seed):
+            return f"Planted {selected_seed}!"
+        return "Can't plant here!"
+    
+    elif plant.is_harvestable():
+        # Harvest the plant
+        value = game_state.economy.calculate_plant_value(plant)
+        if game_state.harvest_plant(player_x, player_y):
+            return f"Harvested {plant.name} for {value} coins!"
+        return "Can't harvest this plant!"
+    
+    # Water or fertilize the plant
+    selected_tool = game_state.player.get_selected_tool()
+    
+    if selected_tool == "basic_watering_can":
+        if game_state.water_plant(player_x, player_y):
+            return "Watered the plant!"
+        return "Plant doesn't need water!"
+    
+    elif selected_tool == "fertilizer_spreader":
+        if game_state.garden.fertilize_plant(player_x, player_y):
+            return "Applied fertilizer!"
+        return "Plant already fertilized!"
+    return None
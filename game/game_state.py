@@ -4,26 +4,40 @@ Handles all game data, player progress, and world state
 """
 
 import time
-from typing import Dict, List, Optional
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 from constants import *
+from achievements import AchievementTracker
 from player import Player
 from garden import Garden
+from plant import SPECIES, FINAL_STAGE
 from shop import Shop
 from economy import Economy
+from rng import RandomStreams
 
 class GameState:
     """Main game state manager"""
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.current_state = STATE_PLAYING
         self.game_time = 0.0
         self.day = 1
+        self.time_warp = 1.0  # World seconds per real second
+        
+        # Seeded random streams, one per subsystem
+        self.rng = RandomStreams(seed)
+        self.weather_rng = self.rng.stream("weather")
+        self.event_rng = self.rng.stream("events")
+        
+        # Achievements, checked whenever the counter they watch changes
+        self.achievements = AchievementTracker(ACHIEVEMENTS)
         
         # Core systems
-        self.player = Player()
-        self.garden = Garden()
+        self.player = Player(achievements=self.achievements)
+        self.garden = Garden(rng=self.rng)
         self.shop = Shop()
-        self.economy = Economy()
+        self.economy = Economy(rng=self.rng, achievements=self.achievements)
         
         # Game progression
         self.unlocked_plants = ["carrot"]
@@ -40,38 +54,88 @@ class GameState:
         self.total_earnings = 0
         self.mutations_found = 0
         
+    def close(self):
+        """Release the garden's worker processes and shared memory (sharded mode)"""
+        self.garden.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def update(self, dt: float):
         """Update game state"""
+        # The player moves in real time; the world runs at the time warp speed
+        self.player.update(dt)
+        self._update_world(dt * self.time_warp)
+    
+    def _update_world(self, dt: float):
+        """Advance garden, economy, weather and days by dt world seconds"""
         self.game_time += dt
         self.weather_timer += dt
         
         # Update systems
-        self.player.update(dt)
         self.garden.update(dt)
         self.economy.update(dt)
         
         # Update weather (every 30 seconds)
-        if self.weather_timer >= 30.0:
+        while self.weather_timer >= WEATHER_CHANGE_INTERVAL:
             self._update_weather()
-            self.weather_timer = 0.0
+            self.weather_timer -= WEATHER_CHANGE_INTERVAL
             
         # Check for day change (every 5 minutes)
-        if self.game_time >= 300.0:
+        while self.game_time >= DAY_LENGTH:
             self.day += 1
-            self.game_time = 0.0
+            self.game_time -= DAY_LENGTH
             self._start_new_day()
     
+    def simulate(self, seconds: float, step: Optional[float] = None) -> int:
+        """Advance the whole game headlessly by the given number of seconds
+        
+        Without a step, each update jumps straight to the next scheduled
+        event (weather change, new day, market or garden timer); plant growth
+        is integrated exactly across any interval. Returns the update count.
+        Raises ValueError for negative seconds or a step that isn't positive.
+        """
+        if not seconds >= 0:
+            raise ValueError(f"seconds must not be negative, got {seconds}")
+        if step is not None and not step > 0:
+            raise ValueError(f"step must be positive, got {step}")
+        
+        updates = 0
+        remaining = seconds
+        while remaining > 0:
+            # Never take an empty step, even if an event is due right now
+            dt = min(remaining, step if step is not None else max(self._time_to_next_event(), 1e-6))
+            self.player.update(dt)
+            self._update_world(dt)
+            remaining -= dt
+            updates += 1
+        return updates
+    
+    def _time_to_next_event(self) -> float:
+        """World seconds until the next timed weather, day, market or garden event"""
+        return min(
+            WEATHER_CHANGE_INTERVAL - self.weather_timer,
+            DAY_LENGTH - self.game_time,
+            self.economy.time_to_next_event(),
+            self.garden.time_to_next_event()
+        )
+    
+    def set_time_warp(self, multiplier: float):
+        """Set how many world seconds pass per real second"""
+        self.time_warp = max(0.0, min(MAX_TIME_WARP, multiplier))
+    
     def _update_weather(self):
         """Update weather conditions"""
-        import random
-        
         weather_chances = {
             "sunny": 0.6,
             "cloudy": 0.25,
             "rainy": 0.15
         }
         
-        rand = random.random()
+        rand = self.weather_rng.random()
         cumulative = 0
         for weather, chance in weather_chances.items():
             cumulative += chance
@@ -89,18 +153,16 @@ class GameState:
     
     def _check_random_events(self):
         """Check for random events"""
-        import random
-        
         # Rainstorm (free watering)
-        if self.weather == "rainy" and random.random() < 0.3:
+        if self.weather == "rainy" and self.event_rng.random_at(self.day, "rain") < 0.3:
             self.garden.apply_rain_effect()
             
         # Market boom (price increase)
-        if random.random() < 0.1:
+        if self.event_rng.random_at(self.day, "market_boom") < 0.1:
             self.economy.trigger_market_boom()
             
         # Pest infestation
-        if random.random() < 0.05:
+        if self.event_rng.random_at(self.day, "pests") < 0.05:
             self.garden.trigger_pest_infestation()
     
     def get_player_position(self):
@@ -113,23 +175,45 @@ class GameState:
     
     def purchase_item(self, item_type: str, item_name: str) -> bool:
         """Purchase an item from the shop"""
-        item = self.shop.get_item(item_type, item_name)
-        if not item:
-            return False
-            
-        if self.can_afford(item["cost"]):
-            self.economy.spend_money(item["cost"])
-            
-            if item_type == "seed":
-                self.player.add_seed(item_name)
-            elif item_type == "tool":
-                self.player.add_tool(item_name)
-            elif item_type == "expansion":
-                self.garden_expansions += 1
-                self.garden.expand()
-                
-            return True
-        return False
+        return self.purchase_items([(item_type, item_name, 1)])["purchased"]
+    
+    def purchase_items(self, lines: Iterable[Tuple[str, str, int]]) -> Dict:
+        """Buy every (category, item, quantity) line, or nothing at all
+        
+        Lines (or a shop Cart) are priced against one snapshot of the shop's
+        prices; affordability is checked and money debited once, and the
+        inventory is credited in bulk. Expansions beyond what the garden has
+        room for are invalid, as are fertilizers, which have no inventory to
+        go into (the fertilizer spreader tool does the fertilizing).
+        """
+        limits = {"expansions": self.garden.max_expansions - self.garden.expansions, "fertilizers": 0}
+        quote = self.shop.quote(lines, limits)
+        result = {"purchased": False, "total": quote["total"],
+                  "items": sum(quantity for _, quantity, _ in quote["lines"]), "invalid": quote["invalid"]}
+        if quote["invalid"]:
+            result["reason"] = "invalid"
+            return result
+        if not quote["lines"]:
+            result["reason"] = "empty"
+            return result
+        if not self.economy.spend_many([(record["category"], record["item"], cost)
+                                        for record, _, cost in quote["lines"]]):
+            result["reason"] = "unaffordable"
+            return result
+        
+        for record, quantity, _ in quote["lines"]:
+            # Shop categories are plural ("seeds", "tools", "expansions")
+            if record["category"] == "seeds":
+                self.player.add_seed(record["item"], quantity)
+            elif record["category"] == "tools":
+                self.player.add_tool(record["item"])
+            elif record["category"] == "expansions":
+                for _ in range(quantity):
+                    if self.garden.expand():
+                        self.garden_expansions += 1
+        
+        result["purchased"] = True
+        return result
     
     def plant_seed(self, x: int, y: int, seed_type: str) -> bool:
         """Plant a seed in the garden"""
@@ -143,18 +227,78 @@ class GameState:
         """Water a plant in the garden"""
         return self.garden.water_plant(x, y)
     
+    def water_plants(self, positions: Optional[Iterable[Tuple[int, int]]] = None,
+                     region: Optional[Tuple[int, int, int, int]] = None,
+                     mask: Optional[np.ndarray] = None, origin: Tuple[int, int] = (0, 0)) -> Dict:
+        """Water many plants at once (targets as in Garden.select_plants)"""
+        return self.garden.water_plants(positions, region, mask, origin)
+    
+    def fertilize_plants(self, positions: Optional[Iterable[Tuple[int, int]]] = None,
+                         region: Optional[Tuple[int, int, int, int]] = None,
+                         mask: Optional[np.ndarray] = None, origin: Tuple[int, int] = (0, 0)) -> Dict:
+        """Fertilize many plants at once (targets as in Garden.select_plants)"""
+        return self.garden.fertilize_plants(positions, region, mask, origin)
+    
+    def harvest_plants(self, positions: Optional[Iterable[Tuple[int, int]]] = None,
+                       region: Optional[Tuple[int, int, int, int]] = None,
+                       mask: Optional[np.ndarray] = None, origin: Tuple[int, int] = (0, 0)) -> Dict:
+        """Harvest every ready plant among the targets, settling the sale at once
+        
+        Targets are as in Garden.select_plants; with none, every ready plant
+        is harvested. Proceeds are paid in a single economy transaction.
+        """
+        if positions is None and region is None and mask is None:
+            plants, missing = self.garden.get_harvestable_plants(), 0
+        else:
+            plants, missing = self.garden.select_plants(positions, region, mask, origin)
+        targeted = len(plants)
+        table = self.garden.plant_table
+        rows = self.garden.plant_rows(plants)
+        harvestable = table.stage[rows] == FINAL_STAGE
+        ready = list(compress(plants, harvestable.tolist()))
+        rows = rows[harvestable]
+        
+        # Value everything in one pass before the plants leave the garden
+        values = self.economy.calculate_values(table, rows)
+        earnings = int(values.sum())
+        mutations = int(np.count_nonzero(table.mutated[rows]))
+        if ready:
+            by_type = np.bincount(table.type_id[rows], weights=values, minlength=len(SPECIES))
+            self.economy.add_sales({spec.plant_type: int(amount) for spec, amount in zip(SPECIES, by_type)
+                                    if amount > 0})
+        self.garden.remove_plants(ready)
+        
+        self.plants_harvested += len(ready)
+        self.total_earnings += earnings
+        self.mutations_found += mutations
+        if ready:
+            self._check_achievements(mutations > 0)
+        return {"targeted": targeted, "harvested": len(ready), "missing": missing,
+                "earnings": earnings, "mutations": mutations}
+    
+    def get_garden_value(self) -> int:
+        """Current market value of every plant in the garden"""
+        return int(self.economy.calculate_values(self.garden.plant_table).sum())
+    
     def harvest_plant(self, x: int, y: int) -> bool:
         """Harvest a plant from the garden"""
         plant = self.garden.get_plant(x, y)
         if plant and plant.is_harvestable():
             value = self.economy.calculate_plant_value(plant)
-            self.economy.add_money(value)
+            self.economy.add_money(value, "sale", plant.plant_type)
             self.garden.remove_plant(x, y)
             self.plants_harvested += 1
             self.total_earnings += value
             
-            if plant.is_mutated():
+            if plant.is_mutated:
                 self.mutations_found += 1
+            self._check_achievements(plant.is_mutated)
                 
             return True
         return False
+    
+    def _check_achievements(self, mutated: bool):
+        """Report the harvest counters after a harvest"""
+        self.achievements.report("plants_harvested", self.plants_harvested)
+        if mutated:
+            self.achievements.report("mutations_found", self.mutations_found)
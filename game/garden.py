@@ -3,25 +3,161 @@ Garden Class
 Manages the grid-based garden system and plant placement
 """
 
-from typing import Dict, List, Optional, Tuple
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
 from constants import *
-from plant import Plant
+from plant import Plant, PlantTable, FINAL_STAGE, STEP_EPSILON, detach_plants
+from rng import RandomStreams
+from spatial import DensePositions, SpatialIndex
+from shards import ShardPool, SharedPlantTable
+
+class GrowthScheduler:
+    """Priority queue of upcoming plant growth events
+    
+    Between events a plant grows at a constant rate, so the time of its next
+    stage transition or water decay can be computed in closed form. Only
+    plants whose deadline has passed or whose care state changed are touched,
+    and the plants due in a step are integrated together on the table columns.
+    """
+    
+    def __init__(self, table: PlantTable):
+        self.table = table
+        self.table.lagging = True
+        self.table.changed = set()
+        self.queue = []  # (deadline, row, version) heap
+    
+    def schedule_rows(self, rows: np.ndarray):
+        """(Re)compute the next event of rows that are already up to date
+        
+        Any events already queued for the rows are invalidated.
+        """
+        table = self.table
+        table.version[rows] += 1
+        eta = table.times_to_next_event(rows)
+        pending = np.isfinite(eta)
+        queue = self.queue
+        for entry in zip((table.time + eta[pending]).tolist(), rows[pending].tolist(),
+                         table.version[rows[pending]].tolist()):
+            heapq.heappush(queue, entry)
+    
+    def _schedule_changed(self):
+        """Reschedule rows whose state was changed from outside"""
+        table = self.table
+        if not table.changed:
+            return
+        rows = np.fromiter(table.changed, dtype=np.intp, count=len(table.changed))
+        table.changed.clear()
+        rows = rows[table.active[rows]]
+        table.sync_rows(rows)
+        self.schedule_rows(rows)
+    
+    def advance(self, dt: float):
+        """Advance the clock by dt, processing every event that falls due
+        
+        Rows never affect each other while growing, so every row with an
+        event in the step is integrated to the end of the step in one
+        vectorized pass, crossing as many events as it reaches.
+        """
+        table = self.table
+        target = table.time + dt
+        self._schedule_changed()
+        
+        queue = self.queue
+        due = []
+        while queue and queue[0][0] <= target + STEP_EPSILON:
+            _, row, version = heapq.heappop(queue)
+            if version == table.version[row] and table.active[row]:
+                due.append(row)  # Stale entries are skipped
+        table.time = target
+        if not due:
+            return
+        
+        # Claim the time first so mutations applied through views don't resync
+        rows = np.array(due, dtype=np.intp)
+        remaining = target - table.synced_at[rows]
+        table.synced_at[rows] = target
+        table.integrate_rows(rows, remaining)
+        table.changed.difference_update(due)  # Mutations, already integrated
+        self.schedule_rows(rows)
+    
+    def __len__(self) -> int:
+        return len(self.queue)
+
+
+# Tiles pests can spread to from an infested tile
+PEST_NEIGHBOUR_OFFSETS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.int64)
+
+
+class GardenChunk:
+    """Soil, water and fertilizer for one CHUNK_SIZE x CHUNK_SIZE block of tiles
+    
+    Tiles start barren (soil quality 0) until the garden unlocks them.
+    """
+    
+    def __init__(self, chunk_x: int, chunk_y: int):
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        self.origin_x = chunk_x * CHUNK_SIZE
+        self.origin_y = chunk_y * CHUNK_SIZE
+        
+        # Tile state, indexed [local y, local x]
+        self.soil_quality = np.zeros((CHUNK_SIZE, CHUNK_SIZE), dtype=np.float64)
+        self.water_levels = np.zeros((CHUNK_SIZE, CHUNK_SIZE), dtype=np.int8)
+        self.fertilizer_levels = np.zeros((CHUNK_SIZE, CHUNK_SIZE), dtype=np.int8)
+        
+        self.plant_count = 0  # Plants growing in this chunk
+
 
 class Garden:
-    """Grid-based garden system for growing plants"""
+    """Grid-based garden system for growing plants
     
-    def __init__(self):
-        self.width = GRID_WIDTH
-        self.height = GRID_HEIGHT
+    The map is split into chunks that are only allocated once tiles in them
+    are unlocked, so memory grows with the cultivated area rather than the
+    map bounds. Tiles outside allocated chunks are barren.
+    """
+    
+    def __init__(self, growth_mode: str = GROWTH_MODE, rng: Optional[RandomStreams] = None,
+                 width: int = GRID_WIDTH, height: int = GRID_HEIGHT, shard_workers: Optional[int] = None,
+                 shard_min_rows: int = SHARD_MIN_ROWS):
+        self.width = width
+        self.height = height
         
-        # Grid system
-        self.grid = [[None for _ in range(self.width)] for _ in range(self.height)]
+        # Sparse grid system
+        self.chunks = {}  # (chunk x, chunk y) -> GardenChunk
+        self.active_chunks = set()  # Keys of chunks holding plants
         self.plants = {}  # (x, y) -> Plant mapping
+        self.spatial_index = SpatialIndex()  # Plants bucketed by area for region queries
+        self.plant_positions = DensePositions()  # Packed positions for O(1) random picks
+        
+        # Seeded random streams keep outcomes independent of evaluation order
+        self.rng = rng if rng is not None else RandomStreams()
+        self.pest_rng = self.rng.stream("pests")
+        
+        # Column storage behind every Plant (in shared memory when sharded)
+        table_type = SharedPlantTable if growth_mode == GROWTH_MODE_SHARDED else PlantTable
+        self.plant_table = table_type(rng=self.rng.stream("mutations"), index_states=True)
         
-        # Garden state
-        self.soil_quality = [[1.0 for _ in range(self.width)] for _ in range(self.height)]
-        self.water_levels = [[0 for _ in range(self.width)] for _ in range(self.height)]
-        self.fertilizer_levels = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        # Scheduled mode only touches plants with due growth events
+        self.growth_mode = growth_mode
+        self.scheduler = None
+        self.shards = None
+        if growth_mode == GROWTH_MODE_SHARDED:
+            self.shards = ShardPool(self.plant_table, shard_workers, shard_min_rows)
+        elif growth_mode == GROWTH_MODE_SCHEDULED:
+            self.scheduler = GrowthScheduler(self.plant_table)
+        elif growth_mode == GROWTH_MODE_LAZY:
+            self.plant_table.lagging = True
+            self.plant_table.lazy = True
+        
+        # Unlocked area (x0, y0, x1, y1): the starting plot, centered on the map
+        start_width = min(self.width, GRID_WIDTH)
+        start_height = min(self.height, GRID_HEIGHT)
+        start_x = (self.width - start_width) // 2
+        start_y = (self.height - start_height) // 2
+        self.unlocked = (start_x, start_y, start_x + start_width, start_y + start_height)
+        self.plantable_tiles = 0  # Kept up to date, never recounted
+        self._unlock(self.unlocked, 1.0, 0)
         
         # Garden expansions
         self.expansions = 1
@@ -31,28 +167,35 @@ class Garden:
         self.rain_timer = 0.0
         self.pest_infestation = False
         self.pest_timer = 0.0
+        self.infestations = 0  # Infestation count, keying the contagion rolls
+        self.pest_spread_steps = 0
+        self.pest_front = np.zeros((0, 2), dtype=np.int64)  # Tiles infested by the last step
         
         # Initialize starting garden area
         self._initialize_garden()
     
     def _initialize_garden(self):
         """Initialize the starting garden area"""
-        # Start with a 5x5 garden in the center
-        start_x = (self.width // 2) - 2
-        start_y = (self.height // 2) - 2
-        
-        for y in range(start_y, start_y + 5):
-            for x in range(start_x, start_x + 5):
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.soil_quality[y][x] = 1.0
-                    self.water_levels[y][x] = 2
-                    self.fertilizer_levels[y][x] = 0
+        # Start with a watered 5x5 garden in the center
+        center_x = self.width // 2
+        center_y = self.height // 2
+        plot = (center_x - 2, center_y - 2, center_x + 3, center_y + 3)
+        self._unlock(plot, 1.0, 0)
+        for chunk, area in self._chunk_areas(plot):
+            chunk.water_levels[area] = 2
+            chunk.fertilizer_levels[area] = 0
     
     def update(self, dt: float):
         """Update garden state"""
-        # Update all plants
-        for plant in self.plants.values():
-            plant.update(dt)
+        # Update plants
+        if self.scheduler is not None:
+            self.scheduler.advance(dt)
+        elif self.shards is not None:
+            self.shards.update(dt)  # Worker processes advance their shards, once it pays off
+        elif self.plant_table.lazy:
+            self.plant_table.time += dt  # Plants catch up when observed
+        else:
+            self.plant_table.update(dt)  # All plants in one vectorized pass
         
         # Update weather effects
         if self.rain_timer > 0:
@@ -60,30 +203,60 @@ class Garden:
             if self.rain_timer <= 0:
                 self._end_rain_effect()
         
-        # Update pest infestation
+        # Update pest infestation, spreading at every step it passes
         if self.pest_infestation:
             self.pest_timer += dt
-            if self.pest_timer >= 30.0:  # Pests last 30 seconds
+            while (self.pest_spread_steps + 1) * PEST_SPREAD_INTERVAL <= min(self.pest_timer, PEST_DURATION) + STEP_EPSILON:
+                self._spread_pests()
+            if self.pest_timer >= PEST_DURATION:
                 self._end_pest_infestation()
     
+    def close(self):
+        """Stop shard workers and free shared plant storage (sharded mode)"""
+        if self.shards is not None:
+            self.shards.close()
+            self.plant_table.close()
+            self.shards = None
+    
+    def time_to_next_event(self) -> float:
+        """Seconds until rain or a pest infestation ends (infinite if none)
+        
+        Plant growth doesn't need to be stepped: every growth mode
+        integrates it exactly across any interval.
+        """
+        timers = [float("inf")]
+        if self.rain_timer > 0:
+            timers.append(self.rain_timer)
+        if self.pest_infestation:
+            next_spread = (self.pest_spread_steps + 1) * PEST_SPREAD_INTERVAL
+            timers.append(min(next_spread, PEST_DURATION) - self.pest_timer)
+        return max(0.0, min(timers))
+    
     def plant_seed(self, x: int, y: int, seed_type: str) -> bool:
         """Plant a seed at the specified grid position"""
         if not self._is_valid_position(x, y):
             return False
         
-        if self.grid[y][x] is not None:
+        if (x, y) in self.plants:
             return False  # Position already occupied
         
         if not self._is_plantable_soil(x, y):
             return False  # Not plantable soil
         
+        if seed_type not in CATALOG.species_ids:
+            return False  # Unknown seed type
+        
         # Create new plant
-        plant = Plant(seed_type, x, y)
-        self.grid[y][x] = plant
+        plant = Plant(seed_type, x, y, self.plant_table)
         self.plants[(x, y)] = plant
+        self.spatial_index.insert(x, y, plant)
+        self.plant_positions.add(x, y)
+        chunk = self._get_chunk(x, y)
+        chunk.plant_count += 1
+        self.active_chunks.add((chunk.chunk_x, chunk.chunk_y))
         
         # Apply soil quality effects
-        soil_quality = self.soil_quality[y][x]
+        soil_quality = self.get_soil_quality(x, y)
         if soil_quality < 0.5:
             plant.growth_progress *= 0.8  # Slower growth on poor soil
         
@@ -94,14 +267,16 @@ class Garden:
         if not self._is_valid_position(x, y):
             return False
         
-        plant = self.grid[y][x]
+        plant = self.plants.get((x, y))
         if plant is None:
             return False
         
         # Water the plant
         if plant.water():
             # Update soil water level
-            self.water_levels[y][x] = min(5, self.water_levels[y][x] + 1)
+            chunk = self._get_chunk(x, y)
+            local = (y - chunk.origin_y, x - chunk.origin_x)
+            chunk.water_levels[local] = min(5, chunk.water_levels[local] + 1)
             return True
         
         return False
@@ -111,41 +286,242 @@ class Garden:
         if not self._is_valid_position(x, y):
             return False
         
-        plant = self.grid[y][x]
+        plant = self.plants.get((x, y))
         if plant is None:
             return False
         
         # Apply fertilizer
         if plant.fertilize():
             # Update soil fertilizer level
-            self.fertilizer_levels[y][x] = min(3, self.fertilizer_levels[y][x] + 1)
+            chunk = self._get_chunk(x, y)
+            local = (y - chunk.origin_y, x - chunk.origin_x)
+            chunk.fertilizer_levels[local] = min(3, chunk.fertilizer_levels[local] + 1)
             return True
         
         return False
     
+    def select_plants(self, positions: Optional[Iterable[Tuple[int, int]]] = None,
+                      region: Optional[Tuple[int, int, int, int]] = None,
+                      mask: Optional[np.ndarray] = None,
+                      origin: Tuple[int, int] = (0, 0)) -> Tuple[List[Plant], int]:
+        """Resolve a bulk operation's targets to garden plants
+        
+        Targets are a list of (x, y) positions, a region (x0, y0, x1, y1)
+        excluding x1 and y1, or a boolean mask indexed [y, x] whose top-left
+        tile is at origin; with none of them, every plant is targeted.
+        Returns the plants and the number of targeted tiles without one.
+        """
+        if region is not None:
+            return self.spatial_index.query_rect(*region), 0
+        if mask is not None:
+            ys, xs = np.nonzero(mask)
+            positions = zip((xs + origin[0]).tolist(), (ys + origin[1]).tolist())
+        elif positions is None:
+            return list(self.plants.values()), 0
+        
+        # Tiles off the map never hold plants, so one lookup validates both
+        plants = self.plants
+        targets = list(dict.fromkeys(map(tuple, positions)))  # Each tile once
+        found = [plants[position] for position in targets if position in plants]
+        return found, len(targets) - len(found)
+    
+    def plant_rows(self, plants: List[Plant]) -> np.ndarray:
+        """Table rows of garden plants, brought up to date for a bulk read or write"""
+        table = self.plant_table
+        rows = np.fromiter((plant._row for plant in plants), dtype=np.intp, count=len(plants))
+        if table.lagging:
+            table.sync_rows(rows)
+        return rows
+    
+    def _raise_soil_levels(self, plants: List[Plant], levels: str, cap: int):
+        """Add one to a soil level grid under each plant, up to a cap"""
+        by_chunk = {}
+        for plant in plants:
+            by_chunk.setdefault((plant.x // CHUNK_SIZE, plant.y // CHUNK_SIZE), []).append(plant)
+        for key, chunk_plants in by_chunk.items():
+            chunk = self.chunks[key]
+            local_y = np.array([plant.y for plant in chunk_plants]) - chunk.origin_y
+            local_x = np.array([plant.x for plant in chunk_plants]) - chunk.origin_x
+            grid = getattr(chunk, levels)
+            grid[local_y, local_x] = np.minimum(cap, grid[local_y, local_x] + 1)
+    
+    def water_plants(self, positions: Optional[Iterable[Tuple[int, int]]] = None,
+                     region: Optional[Tuple[int, int, int, int]] = None,
+                     mask: Optional[np.ndarray] = None,
+                     origin: Tuple[int, int] = (0, 0)) -> Dict:
+        """Water every targeted plant in one pass (see select_plants)
+        
+        Same outcome as calling water_plant on each target.
+        """
+        plants, missing = self.select_plants(positions, region, mask, origin)
+        thirsty = self._water_rows(self.plant_rows(plants))
+        self._raise_soil_levels([plant for plant, applied in zip(plants, thirsty.tolist()) if applied],
+                                "water_levels", 5)
+        return {"targeted": len(plants), "applied": int(np.count_nonzero(thirsty)), "missing": missing}
+    
+    def _water_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Give one unit of water to each up-to-date row that can take it
+        
+        Returns which of the rows were watered.
+        """
+        table = self.plant_table
+        thirsty = table.water_level[rows] < table.max_water_level[rows]
+        watered = rows[thirsty]
+        table.water_level[watered] += 1
+        table.last_watered[watered] = table.growth_timer[watered]
+        table.refresh_rates(watered)
+        if table.changed is not None:
+            table.changed.update(watered.tolist())
+        return thirsty
+    
+    def fertilize_plants(self, positions: Optional[Iterable[Tuple[int, int]]] = None,
+                         region: Optional[Tuple[int, int, int, int]] = None,
+                         mask: Optional[np.ndarray] = None,
+                         origin: Tuple[int, int] = (0, 0)) -> Dict:
+        """Fertilize every targeted plant in one pass (see select_plants)
+        
+        Same outcome as calling fertilize_plant on each target.
+        """
+        plants, missing = self.select_plants(positions, region, mask, origin)
+        table = self.plant_table
+        rows = self.plant_rows(plants)
+        unfertilized = ~table.fertilized[rows]
+        fertilized = rows[unfertilized]
+        table.fertilized[fertilized] = True
+        table.refresh_rates(fertilized)
+        if table.changed is not None:
+            table.changed.update(fertilized.tolist())
+        self._raise_soil_levels([plant for plant, applied in zip(plants, unfertilized.tolist()) if applied],
+                                "fertilizer_levels", 3)
+        return {"targeted": len(plants), "applied": int(fertilized.size), "missing": missing}
+    
     def get_plant(self, x: int, y: int) -> Optional[Plant]:
         """Get plant at specified position"""
         if not self._is_valid_position(x, y):
             return None
-        return self.grid[y][x]
+        return self.plants.get((x, y))
+    
+    def get_plants_in_rect(self, x0: int, y0: int, x1: int, y1: int, **filters) -> List[Plant]:
+        """Plants with x0 <= x < x1 and y0 <= y < y1
+        
+        Takes the SpatialIndex filters: stage, harvestable, mutated, fertilized.
+        """
+        return self.spatial_index.query_rect(x0, y0, x1, y1, **filters)
+    
+    def get_plants_in_radius(self, x: int, y: int, radius: float, **filters) -> List[Plant]:
+        """Plants within a tile distance of a position (SpatialIndex filters apply)"""
+        return self.spatial_index.query_radius(x, y, radius, **filters)
+    
+    def get_nearest_plants(self, x: int, y: int, k: int = 1, **filters) -> List[Plant]:
+        """Up to k plants closest to a position (SpatialIndex filters apply)"""
+        return self.spatial_index.nearest(x, y, k, **filters)
+    
+    def _indexed_plants(self, rows: set) -> List[Plant]:
+        """Plants for a set of table rows, in row order"""
+        if self.plant_table.lazy:
+            self._catch_up()
+        views = self.plant_table.views
+        return [views[row] for row in sorted(rows)]
+    
+    def _catch_up(self):
+        """Bring the stage and care sets of lazily evaluated plants up to date
+        
+        Only plants that have passed an event since they were last synced are
+        evaluated; the rest catch up when read.
+        """
+        table = self.plant_table
+        table.sync_due_rows(np.flatnonzero(table.active[:table.size]))
+    
+    def get_plants_at_stage(self, stage: int) -> List[Plant]:
+        """Plants currently in a growth stage"""
+        return self._indexed_plants(self.plant_table.stage_rows[stage])
+    
+    def get_harvestable_plants(self) -> List[Plant]:
+        """Plants ready for harvest"""
+        return self.get_plants_at_stage(FINAL_STAGE)
+    
+    def get_thirsty_plants(self) -> List[Plant]:
+        """Plants that can take more water"""
+        return self._indexed_plants(self.plant_table.thirsty_rows)
+    
+    def get_unfertilized_plants(self) -> List[Plant]:
+        """Plants that haven't been fertilized"""
+        return self._indexed_plants(self.plant_table.unfertilized_rows)
+    
+    def get_care_counts(self) -> Dict:
+        """Plant counts per stage and care state, from the live row sets
+        
+        Lazily evaluated plants are only synced if they have passed an event.
+        """
+        table = self.plant_table
+        if table.lazy:
+            self._catch_up()
+        return {
+            "stages": {GROWTH_STAGES[stage]: len(rows) for stage, rows in enumerate(table.stage_rows)},
+            "harvestable": len(table.stage_rows[FINAL_STAGE]),
+            "thirsty": len(table.thirsty_rows),
+            "unfertilized": len(table.unfertilized_rows)
+        }
     
     def remove_plant(self, x: int, y: int) -> bool:
         """Remove plant from specified position"""
         if not self._is_valid_position(x, y):
             return False
         
-        if self.grid[y][x] is not None:
-            plant = self.grid[y][x]
-            del self.plants[(x, y)]
-            self.grid[y][x] = None
-            
-            # Improve soil quality slightly when plant is harvested
-            self.soil_quality[y][x] = min(1.5, self.soil_quality[y][x] + 0.1)
-            
+        if (x, y) in self.plants:
+            self.remove_plants([self.plants[(x, y)]])
             return True
         
         return False
     
+    def remove_plants(self, plants: Iterable[Plant]) -> int:
+        """Remove garden plants in one pass
+        
+        Rows are freed together and the spatial index, position set and
+        chunk counts are updated in bulk. The removed plants are detached
+        into the loose table, so anyone holding one can keep reading it.
+        Repeated plants are removed once; a plant that isn't in the garden
+        raises ValueError before anything changes.
+        """
+        plants = list({id(plant): plant for plant in plants}.values())
+        garden_plants = self.plants
+        for plant in plants:
+            if garden_plants.get((plant.x, plant.y)) is not plant:
+                raise ValueError(f"No such plant in the garden at ({plant.x}, {plant.y})")
+        if not plants:
+            return 0
+        table = self.plant_table
+        rows = self.plant_rows(plants)
+        xs = np.fromiter((plant.x for plant in plants), dtype=np.int64, count=len(plants))
+        ys = np.fromiter((plant.y for plant in plants), dtype=np.int64, count=len(plants))
+        
+        for position in zip(xs.tolist(), ys.tolist()):
+            del garden_plants[position]
+        self.spatial_index.remove_many(xs, ys)
+        self.plant_positions.remove_many(xs, ys)
+        views = table.views
+        for row in rows.tolist():
+            views[row] = None
+        detach_plants(plants)
+        table.remove_rows(rows)
+        
+        # Group the removed plants by chunk (keyed chunk x * chunk rows + chunk y)
+        chunk_rows = -(-self.height // CHUNK_SIZE)
+        chunk_keys, inverse, counts = np.unique((xs // CHUNK_SIZE) * chunk_rows + ys // CHUNK_SIZE,
+                                                return_inverse=True, return_counts=True)
+        for index, chunk_key in enumerate(chunk_keys.tolist()):
+            key = divmod(chunk_key, chunk_rows)
+            chunk = self.chunks[key]
+            chunk.plant_count -= int(counts[index])
+            if chunk.plant_count == 0:
+                self.active_chunks.discard(key)
+            
+            # Improve soil quality slightly when plants are harvested
+            removed = inverse == index
+            local = (ys[removed] - chunk.origin_y, xs[removed] - chunk.origin_x)
+            chunk.soil_quality[local] = np.minimum(1.5, chunk.soil_quality[local] + 0.1)
+        return len(plants)
+    
     def expand(self) -> bool:
         """Expand the garden area"""
         if self.expansions >= self.max_expansions:
@@ -153,17 +529,12 @@ class Garden:
         
         self.expansions += 1
         
-        # Increase plantable area
+        # Grow the unlocked area on every side; new tiles start as fair soil
         expansion_size = 2
-        center_x = self.width // 2
-        center_y = self.height // 2
-        
-        for y in range(center_y - expansion_size, center_y + expansion_size + 1):
-            for x in range(center_x - expansion_size, center_x + expansion_size + 1):
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    if self.soil_quality[y][x] == 0:
-                        self.soil_quality[y][x] = 0.8
-                        self.water_levels[y][x] = 1
+        x0, y0, x1, y1 = self.unlocked
+        self.unlocked = (max(0, x0 - expansion_size), max(0, y0 - expansion_size),
+                         min(self.width, x1 + expansion_size), min(self.height, y1 + expansion_size))
+        self._unlock(self.unlocked, 0.8, 1)
         
         return True
     
@@ -171,15 +542,17 @@ class Garden:
         """Apply rain effect to all plants"""
         self.rain_timer = 20.0  # Rain lasts 20 seconds
         
-        # Water all plants
-        for plant in self.plants.values():
-            plant.water()
+        # Water all plants (every active row of the garden table) in one pass
+        table = self.plant_table
+        rows = np.flatnonzero(table.active[:table.size])
+        if table.lagging:
+            table.sync_rows(rows)
+        self._water_rows(rows)
         
-        # Increase soil water levels
-        for y in range(self.height):
-            for x in range(self.width):
-                if self._is_plantable_soil(x, y):
-                    self.water_levels[y][x] = min(5, self.water_levels[y][x] + 2)
+        # Increase soil water levels (unallocated chunks have no soil)
+        for chunk in self.chunks.values():
+            plantable = chunk.soil_quality > 0
+            chunk.water_levels[plantable] = np.minimum(5, chunk.water_levels[plantable] + 2)
     
     def _end_rain_effect(self):
         """End rain effect"""
@@ -190,21 +563,42 @@ class Garden:
         if not self.pest_infestation:
             self.pest_infestation = True
             self.pest_timer = 0.0
+            self.infestations += 1
+            self.pest_spread_steps = 0
             
-            # Randomly destroy some plants
-            import random
-            plant_positions = list(self.plants.keys())
-            if plant_positions:
-                num_to_destroy = min(3, len(plant_positions))
-                positions_to_destroy = random.sample(plant_positions, num_to_destroy)
-                
-                for x, y in positions_to_destroy:
-                    self.remove_plant(x, y)
+            # Randomly destroy some plants; the pests spread from there
+            num_to_destroy = min(PEST_INITIAL_PLANTS, len(self.plant_positions))
+            positions_to_destroy = self.plant_positions.sample(self.pest_rng, num_to_destroy)
+            for x, y in positions_to_destroy:
+                self.remove_plant(x, y)
+            self.pest_front = np.array(positions_to_destroy, dtype=np.int64).reshape(-1, 2)
+    
+    def _spread_pests(self):
+        """Contagion step: pests reach plants next to newly infested tiles"""
+        self.pest_spread_steps += 1
+        if not len(self.pest_front):
+            return
+        
+        # Every distinct neighbour of the front that holds a plant
+        neighbours = (self.pest_front[:, None, :] + PEST_NEIGHBOUR_OFFSETS[None, :, :]).reshape(-1, 2)
+        neighbours = np.unique(neighbours, axis=0)
+        occupied = np.fromiter((position in self.plant_positions for position in map(tuple, neighbours.tolist())),
+                               dtype=bool, count=len(neighbours))
+        candidates = neighbours[occupied]
+        
+        # Rolls are keyed by tile, so the outcome doesn't depend on step size
+        rolls = self.pest_rng.random_array(self.infestations, self.pest_spread_steps,
+                                           candidates[:, 0], candidates[:, 1])
+        infested = candidates[rolls < PEST_SPREAD_CHANCE]
+        for x, y in infested.tolist():
+            self.remove_plant(x, y)
+        self.pest_front = infested
     
     def _end_pest_infestation(self):
         """End pest infestation"""
         self.pest_infestation = False
         self.pest_timer = 0.0
+        self.pest_front = np.zeros((0, 2), dtype=np.int64)
     
     def _is_valid_position(self, x: int, y: int) -> bool:
         """Check if position is within garden bounds"""
@@ -212,7 +606,57 @@ class Garden:
     
     def _is_plantable_soil(self, x: int, y: int) -> bool:
         """Check if position has plantable soil"""
-        return self.soil_quality[y][x] > 0
+        return self.get_soil_quality(x, y) > 0
+    
+    def _get_chunk(self, x: int, y: int) -> Optional[GardenChunk]:
+        """Chunk holding a tile (None if it hasn't been allocated)"""
+        return self.chunks.get((x // CHUNK_SIZE, y // CHUNK_SIZE))
+    
+    def _chunk_areas(self, rect: Tuple[int, int, int, int], allocate: bool = False):
+        """Yield (chunk, local index) for each chunk overlapping a tile rectangle
+        
+        The rectangle (x0, y0, x1, y1) excludes x1 and y1 and is clipped to
+        the map. Missing chunks are skipped unless allocate is set.
+        """
+        x0, y0 = max(0, rect[0]), max(0, rect[1])
+        x1, y1 = min(self.width, rect[2]), min(self.height, rect[3])
+        if x0 >= x1 or y0 >= y1:
+            return
+        for chunk_y in range(y0 // CHUNK_SIZE, (y1 - 1) // CHUNK_SIZE + 1):
+            for chunk_x in range(x0 // CHUNK_SIZE, (x1 - 1) // CHUNK_SIZE + 1):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if chunk is None:
+                    if not allocate:
+                        continue
+                    chunk = self.chunks[(chunk_x, chunk_y)] = GardenChunk(chunk_x, chunk_y)
+                local_x0 = max(x0, chunk.origin_x) - chunk.origin_x
+                local_y0 = max(y0, chunk.origin_y) - chunk.origin_y
+                local_x1 = min(x1, chunk.origin_x + CHUNK_SIZE) - chunk.origin_x
+                local_y1 = min(y1, chunk.origin_y + CHUNK_SIZE) - chunk.origin_y
+                yield chunk, (slice(local_y0, local_y1), slice(local_x0, local_x1))
+    
+    def _unlock(self, rect: Tuple[int, int, int, int], soil_quality: float, water_level: int):
+        """Turn the barren tiles of a rectangle into plantable soil"""
+        for chunk, area in self._chunk_areas(rect, allocate=True):
+            barren = chunk.soil_quality[area] == 0
+            chunk.soil_quality[area][barren] = soil_quality
+            chunk.water_levels[area][barren] = water_level
+            self.plantable_tiles += int(np.count_nonzero(barren))
+    
+    def get_soil_quality(self, x: int, y: int) -> float:
+        """Soil quality of a tile (0 for barren or unallocated tiles)"""
+        chunk = self._get_chunk(x, y)
+        return chunk.soil_quality[y - chunk.origin_y, x - chunk.origin_x] if chunk is not None else 0.0
+    
+    def get_water_level(self, x: int, y: int) -> int:
+        """Soil water level of a tile"""
+        chunk = self._get_chunk(x, y)
+        return int(chunk.water_levels[y - chunk.origin_y, x - chunk.origin_x]) if chunk is not None else 0
+    
+    def get_fertilizer_level(self, x: int, y: int) -> int:
+        """Soil fertilizer level of a tile"""
+        chunk = self._get_chunk(x, y)
+        return int(chunk.fertilizer_levels[y - chunk.origin_y, x - chunk.origin_x]) if chunk is not None else 0
     
     def get_garden_summary(self) -> Dict:
         """Get summary of garden state"""
@@ -222,7 +666,9 @@ class Garden:
             "expansions": self.expansions,
             "max_expansions": self.max_expansions,
             "total_plants": len(self.plants),
-            "plantable_tiles": sum(1 for row in self.soil_quality for quality in row if quality > 0),
+            "plantable_tiles": self.plantable_tiles,
+            "chunks": len(self.chunks),
+            "active_chunks": len(self.active_chunks),
             "weather": {
                 "rain_timer": self.rain_timer,
                 "pest_infestation": self.pest_infestation,
@@ -237,8 +683,8 @@ class Garden:
     def get_plantable_positions(self) -> List[Tuple[int, int]]:
         """Get list of all plantable positions"""
         positions = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self._is_plantable_soil(x, y):
-                    positions.append((x, y))
+        for key in sorted(self.chunks, key=lambda key: (key[1], key[0])):
+            chunk = self.chunks[key]
+            ys, xs = np.nonzero(chunk.soil_quality > 0)
+            positions.extend(zip((xs + chunk.origin_x).tolist(), (ys + chunk.origin_y).tolist()))
         return positions
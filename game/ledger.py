@@ -0,0 +1,203 @@
+"""
+Transaction Ledger
+Append-only columnar record of every money transaction
+"""
+
+import os
+import tempfile
+import weakref
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from constants import *
+
+# One ledger entry; kind and item are ids into Ledger.names
+ENTRY_DTYPE = np.dtype([
+    ("time", "<f8"),  # Game seconds since the start of the session
+    ("amount", "<f8"),  # Positive for income, negative for spending
+    ("kind", "<u2"),  # What the money was for ("sale", "seeds", "tools", ...)
+    ("item", "<u2"),  # Plant type or item name ("" when there is none)
+])
+
+
+def _remove(path: str):
+    """Delete a spill file this process created"""
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class Ledger:
+    """Append-only transaction log in chunked typed arrays
+
+    Entries fill fixed-size chunks of ENTRY_DTYPE. Once more than
+    memory_chunks full chunks are held, the oldest is appended to a spill
+    file of raw records and read back through a memory map, so a long
+    session keeps a bounded number of entries in memory. Entries arrive in
+    time order, which lets time-window queries binary search every segment.
+
+    Running totals per (kind, item) and per day answer the common
+    aggregate queries without touching the entries at all.
+    """
+
+    def __init__(self, chunk_size: int = LEDGER_CHUNK_SIZE, memory_chunks: int = LEDGER_MEMORY_CHUNKS,
+                 spill_path: Optional[str] = None, day_length: float = DAY_LENGTH):
+        self.chunk_size = chunk_size
+        self.memory_chunks = memory_chunks
+        self.day_length = day_length
+        self.names = [""]  # Interned kind and item names
+        self.ids = {"": 0}
+
+        self.chunks = []  # Full chunks still in memory, oldest first
+        self.current = np.empty(chunk_size, dtype=ENTRY_DTYPE)
+        self.fill = 0  # Entries in the current chunk
+
+        # Spilled entries (a temporary file unless a path is given)
+        self.spill_path = spill_path
+        self.spilled = 0
+        self._spill_map = None
+        self._finalizer = None
+
+        self.income = {}  # (kind id, item id) -> money received
+        self.spending = {}  # (kind id, item id) -> money spent
+        self.daily = {}  # Day number -> net amount
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.chunks) * self.chunk_size + self.fill
+
+    def _intern(self, name: str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+        return self.ids[name]
+
+    def day_of(self, time: float) -> int:
+        """Day number (starting at 1) of a game time"""
+        return int(time // self.day_length) + 1
+
+    def append(self, time: float, kind: str, item: str, amount: float):
+        """Record one transaction"""
+        key = (self._intern(kind), self._intern(item))
+        self.current[self.fill] = (time, amount, key[0], key[1])
+        self.fill += 1
+        totals = self.income if amount >= 0 else self.spending
+        totals[key] = totals.get(key, 0.0) + abs(amount)
+        day = self.day_of(time)
+        self.daily[day] = self.daily.get(day, 0.0) + amount
+        if self.fill == self.chunk_size:
+            self._seal()
+
+    def extend(self, time: float, kind: str, items: Sequence[str], amounts: Sequence[float]):
+        """Record several transactions of one kind made at the same time"""
+        for item, amount in zip(items, amounts):
+            self.append(time, kind, item, amount)
+
+    def _seal(self):
+        """Retire the full current chunk, spilling the oldest chunk if needed"""
+        self.chunks.append(self.current)
+        self.current = np.empty(self.chunk_size, dtype=ENTRY_DTYPE)
+        self.fill = 0
+        while len(self.chunks) > self.memory_chunks:
+            self._spill(self.chunks.pop(0))
+
+    def _spill(self, chunk: np.ndarray):
+        """Append a chunk to the spill file"""
+        if self.spill_path is None:
+            handle, self.spill_path = tempfile.mkstemp(prefix="ledger-", suffix=".bin")
+            os.close(handle)
+            self._finalizer = weakref.finalize(self, _remove, self.spill_path)
+        with open(self.spill_path, "ab") as f:
+            chunk.tofile(f)
+        self.spilled += len(chunk)
+        self._spill_map = None
+
+    def _segments(self) -> List[np.ndarray]:
+        """Every entry as time-ordered segments (spilled, sealed, current)"""
+        segments = []
+        if self.spilled:
+            if self._spill_map is None:
+                self._spill_map = np.memmap(self.spill_path, dtype=ENTRY_DTYPE, mode="r", shape=(self.spilled,))
+            segments.append(self._spill_map)
+        segments.extend(self.chunks)
+        if self.fill:
+            segments.append(self.current[:self.fill])
+        return segments
+
+    def _windows(self, start: Optional[float], end: Optional[float]) -> List[np.ndarray]:
+        """Segment slices with start <= time < end"""
+        windows = []
+        for segment in self._segments():
+            times = segment["time"]
+            if (start is not None and times[-1] < start) or (end is not None and times[0] >= end):
+                continue
+            lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+            hi = len(segment) if end is None else int(np.searchsorted(times, end, side="left"))
+            if hi > lo:
+                windows.append(segment[lo:hi])
+        return windows
+
+    def entries(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Copy of the entries with start <= time < end (all by default)"""
+        windows = self._windows(start, end)
+        return np.concatenate(windows) if windows else np.empty(0, dtype=ENTRY_DTYPE)
+
+    def total(self, kind: Optional[str] = None, item: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None, sign: int = 0) -> float:
+        """Sum of matching amounts; sign 1 or -1 keeps only income or spending
+
+        Whole-session totals come from the running totals; a time window
+        scans only the entries inside it.
+        """
+        kind_id = self.ids.get(kind, -1) if kind is not None else None
+        item_id = self.ids.get(item, -1) if item is not None else None
+        if start is None and end is None:
+            total = 0.0
+            for totals, direction in ((self.income, 1), (self.spending, -1)):
+                if sign in (0, direction):
+                    total += direction * sum(amount for (k, i), amount in totals.items()
+                                             if (kind_id is None or k == kind_id) and (item_id is None or i == item_id))
+            return float(total)
+
+        total = 0.0
+        for window in self._windows(start, end):
+            keep = np.ones(len(window), dtype=bool)
+            if kind_id is not None:
+                keep &= window["kind"] == kind_id
+            if item_id is not None:
+                keep &= window["item"] == item_id
+            if sign:
+                keep &= window["amount"] * sign > 0
+            total += float(window["amount"][keep].sum())
+        return total
+
+    def _net_totals(self, sign: int = 0) -> Dict[Tuple[int, int], float]:
+        """Running totals per (kind, item); sign 1 or -1 keeps only income or spending"""
+        totals = dict(self.income) if sign >= 0 else {}
+        if sign <= 0:
+            for key, amount in self.spending.items():
+                totals[key] = totals.get(key, 0.0) - amount
+        return totals
+    
+    def totals_by_item(self, kind: str, sign: int = 0) -> Dict[str, float]:
+        """Net amount per item for one kind of transaction (sign as in total)"""
+        kind_id = self.ids.get(kind)
+        return {self.names[item]: amount for (k, item), amount in self._net_totals(sign).items() if k == kind_id}
+    
+    def totals_by_kind(self, sign: int = 0) -> Dict[str, float]:
+        """Net amount per kind of transaction (sign as in total)"""
+        totals = {}
+        for (kind, _), amount in self._net_totals(sign).items():
+            totals[self.names[kind]] = totals.get(self.names[kind], 0.0) + amount
+        return totals
+    
+    def daily_net(self) -> Dict[int, float]:
+        """Net amount (income minus spending) per day"""
+        return dict(self.daily)
+
+    def rolling_spend(self, now: float, window: float) -> float:
+        """Money spent in the window seconds up to and including now"""
+        return -self.total(start=now - window, end=np.nextafter(now, np.inf), sign=-1)
+
+    def close(self):
+        """Delete the temporary spill file, if any"""
+        self._spill_map = None
+        if self._finalizer is not None:
+            self._finalizer()
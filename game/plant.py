@@ -3,86 +3,583 @@ Plant Class
 Handles individual plant growth, mutations, and states
 """
 
-import random
 import time
-from typing import Dict, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
 from constants import *
+from catalog import Catalog
+from rng import RandomStream, RandomStreams
 
-class Plant:
-    """Individual plant with growth stages and mutations"""
+
+class PlantSpec(NamedTuple):
+    """Immutable species data shared by every plant of that type"""
+    plant_type: str
+    type_id: int
+    name: str
+    growth_time: float
+    water_need: int
+    base_value: int
+    mutation_chance: float
+    color: Tuple[int, int, int]
+
+
+def build_growth_rate_table(growth_time: np.ndarray) -> np.ndarray:
+    """Growth rate per second indexed by [type id, water bucket, fertilized]
     
-    def __init__(self, plant_type: str, x: int, y: int):
-        self.plant_type = plant_type
-        self.x = x
-        self.y = y
+    Water buckets are 0 (dry), 1 (partly watered) and 2 (fully watered).
+    """
+    water_bonus = np.array([0.5, 1.0, 1.0 + WATERING_BONUS])  # Slow growth when dry
+    fertilizer_bonus = np.array([1.0, 1.0 + FERTILIZER_BONUS])
+    base_rate = 1.0 / np.asarray(growth_time, dtype=np.float64)
+    return base_rate[:, None, None] * water_bonus[None, :, None] * fertilizer_bonus[None, None, :]
+
+
+def load_species(catalog: Optional[Catalog] = None):
+    """(Re)build the shared species specs and lookup tables from a catalog
+    
+    Type ids are the catalog's species ids. Called at import with CATALOG;
+    call again (e.g. with CATALOG.with_species(PLANT_TYPES)) after changing
+    species values, WATERING_BONUS or FERTILIZER_BONUS so new plants pick up
+    the new values.
+    """
+    global SPECIES_IDS, SPECIES_MUTATION_CHANCE, GROWTH_RATE_TABLE
+    catalog = catalog if catalog is not None else CATALOG
+    
+    # One shared spec per species, indexed by type id (updated in place so
+    # modules that imported the list see the new specs)
+    growth_time, water_need = catalog.growth_time.tolist(), catalog.water_need.tolist()
+    base_value, mutation_chance = catalog.base_value.tolist(), catalog.mutation_chance.tolist()
+    SPECIES[:] = [
+        PlantSpec(plant_type, type_id, catalog.species_names[type_id], growth_time[type_id],
+                  water_need[type_id], base_value[type_id], mutation_chance[type_id],
+                  tuple(catalog.color[type_id].tolist()))
+        for type_id, plant_type in enumerate(catalog.species_keys)
+    ]
+    SPECIES_IDS = catalog.species_ids
+    
+    # Species lookup arrays indexed by a plant's type id
+    SPECIES_MUTATION_CHANCE = np.asarray(catalog.mutation_chance, dtype=np.float64)
+    GROWTH_RATE_TABLE = build_growth_rate_table(catalog.growth_time)
+
+
+SPECIES = []
+load_species()
+
+
+def plant_values(base_price, stage, mutated, fertilized, well_watered, market_multiplier: float = 1.0):
+    """Sale value of plants, element-wise over arrays (or scalars)
+    
+    The one pricing formula: the base price grows 10% per stage, doubles
+    for mutated plants and gains 20% for fertilizer and 10% for a full
+    water level. A market boom or crash then scales the rounded-down value.
+    Values are whole coins, at least 1.
+    """
+    value = np.asarray(base_price, dtype=np.float64) * (1.0 + np.asarray(stage) * 0.1)
+    value = value * np.where(mutated, 2.0, 1.0)  # Mutated plants worth double
+    care_bonus = 1.0 + np.where(fertilized, 0.2, 0.0) + np.where(well_watered, 0.1, 0.0)
+    value = value * care_bonus
+    if market_multiplier != 1.0:
+        value = np.floor(value * market_multiplier)
+    return np.maximum(1, np.floor(value)).astype(np.int64)
+
+
+def visual_size(stage, size_multiplier):
+    """Drawn size of plants (in tiles), element-wise over arrays (or scalars)"""
+    return (0.3 + np.asarray(stage) * 0.15) * size_multiplier
+
+
+def get_plant_spec(plant_type: str) -> PlantSpec:
+    """Get the shared spec for a plant type"""
+    if plant_type not in SPECIES_IDS:
+        raise KeyError(f"Unknown plant type: {plant_type}")
+    return SPECIES[SPECIES_IDS[plant_type]]
+
+FINAL_STAGE = len(GROWTH_STAGES) - 1
+
+# Tolerance when checking whether an event threshold has been reached
+EVENT_EPSILON = 1e-9
+
+# Events this close (in seconds) to the end of a step are applied in that step
+STEP_EPSILON = 1e-10
+
+
+class PlantTable:
+    """Structure-of-arrays storage for plant state, one row per plant"""
+    
+    # Column name -> dtype
+    COLUMNS = {
+        "plant_id": np.int64,  # Stable id keying the plant's random rolls
+        "type_id": np.int16,
+        "stage": np.int8,
+        "progress": np.float64,
+        "growth_timer": np.float64,
+        "stage_timer": np.float64,
+        "water_level": np.int8,
+        "max_water_level": np.int8,
+        "last_watered": np.float64,
+        "fertilized": np.bool_,
+        "mutated": np.bool_,
+        "size_multiplier": np.float64,
+        "growth_rate": np.float64,  # Cached from GROWTH_RATE_TABLE, zero once fully grown
+        "active": np.bool_,
+        "synced_at": np.float64,  # Table time the row was last brought up to date
+        "version": np.int64,  # Bumped whenever scheduled events become stale
+    }
+    
+    def __init__(self, capacity: int = 64, rng: Optional[RandomStream] = None,
+                 hold_views: bool = True, index_states: bool = False):
+        self.capacity = 0
+        self.size = 0  # One past the highest row ever used
+        self.free_rows = []
+        self.views = []  # row -> Plant view (None for free rows)
         
-        # Get plant data from constants
-        plant_data = PLANT_TYPES.get(plant_type, PLANT_TYPES["carrot"])
-        self.name = plant_data["name"]
-        self.base_growth_time = plant_data["growth_time"]
-        self.water_need = plant_data["water_need"]
-        self.base_value = plant_data["base_value"]
-        self.base_mutation_chance = plant_data["mutation_chance"]
-        self.base_color = plant_data["color"]
-        
-        # Growth state
-        self.current_stage = 0  # Index into GROWTH_STAGES
-        self.growth_progress = 0.0  # 0.0 to 1.0
-        self.growth_timer = 0.0
-        self.stage_timer = 0.0
+        # Tables that don't hold their views rely on Plant.__del__ to free rows
+        self.hold_views = hold_views
         
-        # Water and care
-        self.water_level = 0
-        self.max_water_level = self.water_need
-        self.last_watered = 0.0
-        self.fertilized = False
+        # Mutation rolls are keyed by (plant id, stage) on this stream
+        self.rng = rng if rng is not None else RandomStreams().stream("mutations")
+        self.next_plant_id = 0
         
-        # Mutations
-        self.mutations = []
-        self.is_mutated = False
-        self.mutation_multiplier = 1.0
+        # Rows may lag behind the table clock when a scheduler drives them,
+        # or when they are only evaluated lazily as they are observed
+        self.time = 0.0
+        self.lagging = False
+        self.lazy = False
+        self.changed = None  # Rows whose care state changed, while a scheduler listens
         
-        # Visual properties
-        self.size_multiplier = 1.0
-        self.color_variants = []
+        # Live row sets by growth stage and care state, updated on every change
+        self.stage_rows = None
+        if index_states:
+            self.stage_rows = [set() for _ in GROWTH_STAGES]
+            self.thirsty_rows = set()  # Water level below the plant's maximum
+            self.unfertilized_rows = set()
+            self.indexed_stage = {}  # row -> stage set holding it
         
-        # Check for initial mutation
-        self._check_initial_mutation()
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self._grow(max(1, capacity))
+    
+    def _grow(self, capacity: int):
+        """Resize every column to the given capacity"""
+        for name, dtype in self.COLUMNS.items():
+            column = np.zeros(capacity, dtype=dtype)
+            column[:self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        self.views.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+    
+    def add(self, plant, spec: PlantSpec) -> int:
+        """Allocate and initialise a row for a plant, returning its index"""
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.size >= self.capacity:
+                self._grow(self.capacity * 2)
+            row = self.size
+            self.size += 1
+        
+        version = self.version[row]
+        for name in self.COLUMNS:
+            getattr(self, name)[row] = 0
+        self.plant_id[row] = self.next_plant_id
+        self.next_plant_id += 1
+        self.type_id[row] = spec.type_id
+        self.max_water_level[row] = spec.water_need
+        self.size_multiplier[row] = 1.0
+        self.active[row] = True
+        self.synced_at[row] = self.time
+        self.version[row] = version + 1
+        self.refresh_rates(row)
+        self.views[row] = plant if self.hold_views else None
+        if self.changed is not None:
+            self.changed.add(row)
+        return row
+    
+    def remove(self, row: int):
+        """Free a row so it can be reused"""
+        self.active[row] = False
+        self.growth_rate[row] = 0.0
+        self.version[row] += 1
+        self.views[row] = None
+        self.free_rows.append(row)
+        if self.changed is not None:
+            self.changed.discard(row)
+        if self.stage_rows is not None:
+            self.stage_rows[self.indexed_stage.pop(row)].discard(row)
+            self.thirsty_rows.discard(row)
+            self.unfertilized_rows.discard(row)
+    
+    def remove_rows(self, rows: np.ndarray):
+        """Vectorized remove for an index array of rows"""
+        self.active[rows] = False
+        self.growth_rate[rows] = 0.0
+        self.version[rows] += 1
+        row_list = rows.tolist()
+        views = self.views
+        for row in row_list:
+            views[row] = None
+        self.free_rows.extend(row_list)
+        if self.changed is not None:
+            self.changed.difference_update(row_list)
+        if self.stage_rows is not None:
+            for stage_rows in self.stage_rows:
+                stage_rows.difference_update(row_list)
+            self.thirsty_rows.difference_update(row_list)
+            self.unfertilized_rows.difference_update(row_list)
+            for row in row_list:
+                del self.indexed_stage[row]
+    
+    def take_rows(self, source: "PlantTable", rows: np.ndarray, views: List) -> np.ndarray:
+        """Copy rows of another table into new rows of this one, a column at a time
+        
+        Returns the new rows, lined up with the source rows and their views.
+        """
+        count = len(rows)
+        reused = min(count, len(self.free_rows))
+        new_rows = self.free_rows[len(self.free_rows) - reused:][::-1]  # Popped as add would
+        del self.free_rows[len(self.free_rows) - reused:]
+        needed = self.size + count - reused
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity > self.capacity:
+            self._grow(capacity)
+        new_rows.extend(range(self.size, needed))
+        self.size = needed
+        new_rows = np.array(new_rows, dtype=np.intp)
+        
+        # Versions stay per row here, so stale events for a reused row never match
+        version = self.version[new_rows] + 1
+        for name in self.COLUMNS:
+            getattr(self, name)[new_rows] = getattr(source, name)[rows]
+        self.version[new_rows] = version
+        if self.hold_views:
+            for row, view in zip(new_rows.tolist(), views):
+                self.views[row] = view
+        if self.changed is not None:
+            self.changed.update(new_rows.tolist())
+        if self.stage_rows is not None:
+            self._index_states(new_rows)
+        return new_rows
+    
+    def __len__(self) -> int:
+        return self.size - len(self.free_rows)
+    
+    def refresh_rates(self, rows):
+        """Recompute cached growth rates after a water, fertilizer or stage change
+        
+        Rows may be an index or index array. Every such change passes through
+        here, so the stage and care state sets are kept in step too.
+        """
+        water_level = self.water_level[rows]
+        water_bucket = np.minimum(water_level, 1) + (water_level >= self.max_water_level[rows])
+        rate = GROWTH_RATE_TABLE[self.type_id[rows], water_bucket, self.fertilized[rows].astype(np.intp)]
+        self.growth_rate[rows] = np.where(self.stage[rows] < FINAL_STAGE, rate, 0.0)
+        if self.stage_rows is not None:
+            self._index_states(rows)
+    
+    def _index_states(self, rows):
+        """Move rows into the stage and care sets matching their state"""
+        for row in np.atleast_1d(rows).tolist():
+            stage = int(self.stage[row])
+            indexed = self.indexed_stage.get(row)
+            if indexed != stage:
+                if indexed is not None:
+                    self.stage_rows[indexed].discard(row)
+                self.stage_rows[stage].add(row)
+                self.indexed_stage[row] = stage
+            
+            if self.water_level[row] < self.max_water_level[row]:
+                self.thirsty_rows.add(row)
+            else:
+                self.thirsty_rows.discard(row)
+            
+            if self.fertilized[row]:
+                self.unfertilized_rows.discard(row)
+            else:
+                self.unfertilized_rows.add(row)
     
     def update(self, dt: float):
-        """Update plant growth"""
-        self.growth_timer += dt
-        self.stage_timer += dt
+        """Advance every active plant by dt using whole-array operations
+        
+        Any dt is integrated exactly: plants whose next stage transition or
+        water decay falls inside the step are split at each event.
+        """
+        self.time += dt
+        self.update_range(0, self.size, dt)
+    
+    def update_range(self, start: int, stop: int, dt: float) -> np.ndarray:
+        """Advance the rows start..stop-1 by dt, ending at the table clock
         
-        # Calculate growth rate
-        growth_rate = self._calculate_growth_rate()
+        Rows don't interact, so disjoint ranges can be advanced separately
+        (and in parallel). Returns the rows that may have passed an event.
+        """
+        rows = slice(start, stop)
+        if stop <= start:
+            return np.zeros(0, dtype=np.intp)
+        self.synced_at[rows] = self.time
         
-        # Update growth progress
-        self.growth_progress += growth_rate * dt
+        # Find plants that may reach an event during this step
+        growth = self.growth_rate[rows] * dt
+        growth_timer = self.growth_timer[rows]
+        due = self.progress[rows] + growth >= 1.0 - EVENT_EPSILON
+        due |= (self.water_level[rows] > 0) & (
+            growth_timer - self.last_watered[rows] >= WATER_DECAY_INTERVAL - EVENT_EPSILON - dt)
+        due &= self.active[rows]
+        due_rows = np.flatnonzero(due) + start
+        saved = (self.growth_timer[due_rows], self.stage_timer[due_rows], self.progress[due_rows])
         
-        # Check for stage advancement
-        if self.growth_progress >= 1.0 and self.current_stage < len(GROWTH_STAGES) - 1:
-            self._advance_stage()
+        # Everything grows linearly (rates are zero for free and fully grown rows)
+        growth_timer += dt
+        self.stage_timer[rows] += dt
+        self.progress[rows] += growth
+        
+        # Plants with events are restored and integrated event by event
+        if due_rows.size:
+            self.growth_timer[due_rows], self.stage_timer[due_rows], self.progress[due_rows] = saved
+            self.integrate_rows(due_rows, dt)
+        return due_rows
+    
+    def integrate_rows(self, rows: np.ndarray, dt):
+        """Advance an array of rows by dt (one value or one per row), applying every event each one passes"""
+        remaining = np.zeros(rows.size) + dt
+        while rows.size:
+            eta = self.times_to_next_event(rows)
+            due = eta <= remaining + STEP_EPSILON
+            self._advance_rows(rows, np.minimum(eta, remaining))
+            rows, remaining = rows[due], np.maximum(0.0, remaining[due] - eta[due])
+            self._apply_due_events_rows(rows)
+    
+    def times_to_next_event(self, rows) -> np.ndarray:
+        """Vectorized time_to_next_event for an index array or slice"""
+        with np.errstate(divide="ignore"):
+            stage_eta = np.where(self.stage[rows] < FINAL_STAGE,
+                                 (1.0 - self.progress[rows]) / self.growth_rate[rows], np.inf)
+        decay_eta = np.where(self.water_level[rows] > 0,
+                             self.last_watered[rows] + WATER_DECAY_INTERVAL - self.growth_timer[rows],
+                             np.inf)
+        return np.maximum(0.0, np.minimum(stage_eta, decay_eta))
+    
+    def _advance_rows(self, rows: np.ndarray, dts: np.ndarray):
+        """Advance rows by per-row durations at their current growth rates"""
+        self.growth_timer[rows] += dts
+        self.stage_timer[rows] += dts
+        self.progress[rows] += self.growth_rate[rows] * dts
+    
+    def _apply_due_events_rows(self, rows: np.ndarray):
+        """Vectorized apply_due_events for an index array"""
+        advancing = rows[(self.stage[rows] < FINAL_STAGE) &
+                         (self.progress[rows] >= 1.0 - EVENT_EPSILON)]
+        if advancing.size:
+            well_watered = self.water_level[advancing] >= self.max_water_level[advancing]
+            self.stage[advancing] += 1
+            self.progress[advancing] = 0.0
+            self.stage_timer[advancing] = 0.0
+            self.refresh_rates(advancing)
+            
+            # Mutation rolls for plants past the seed stage
+            rolling = (self.stage[advancing] > 1) & ~self.mutated[advancing]
+            candidates = advancing[rolling]
+            if candidates.size:
+                chance = SPECIES_MUTATION_CHANCE[self.type_id[candidates]]
+                chance = np.where(self.fertilized[candidates], chance * 1.5, chance)
+                chance = np.where(well_watered[rolling], chance * 1.2, chance)
+                rolls = self.rng.random_array(self.plant_id[candidates], self.stage[candidates])
+                self._mutate_rows(candidates[rolls < chance])
         
         # Reduce water over time
-        if self.growth_timer - self.last_watered > 10.0:  # Water depletes every 10 seconds
-            self.water_level = max(0, self.water_level - 1)
+        drying = rows[(self.water_level[rows] > 0) &
+                      (self.growth_timer[rows] - self.last_watered[rows] >=
+                       WATER_DECAY_INTERVAL - EVENT_EPSILON)]
+        if drying.size:
+            self.water_level[drying] -= 1
+            self.last_watered[drying] += WATER_DECAY_INTERVAL
+            self.refresh_rates(drying)
     
-    def _calculate_growth_rate(self) -> float:
-        """Calculate current growth rate based on conditions"""
-        base_rate = 1.0 / self.base_growth_time
+    def _mutate_rows(self, rows: np.ndarray):
+        """Give each row a growth spurt mutation"""
+        for row in rows:
+            self.views[row]._apply_mutation("growth_spurt")
+    
+    def time_to_next_event(self, row: int) -> float:
+        """Seconds until the row's next stage transition or water decay"""
+        stage_eta = float("inf")
+        if self.stage[row] < FINAL_STAGE:
+            stage_eta = max(0.0, (1.0 - self.progress[row]) / self.growth_rate[row])
         
-        # Water bonus
-        water_bonus = 1.0
-        if self.water_level >= self.max_water_level:
-            water_bonus = 1.0 + WATERING_BONUS
-        elif self.water_level == 0:
-            water_bonus = 0.5  # Slow growth when dry
+        decay_eta = float("inf")
+        if self.water_level[row] > 0:
+            decay_eta = max(0.0, self.last_watered[row] + WATER_DECAY_INTERVAL - self.growth_timer[row])
         
-        # Fertilizer bonus
-        fertilizer_bonus = 1.0 + FERTILIZER_BONUS if self.fertilized else 1.0
+        return min(stage_eta, decay_eta)
+    
+    def advance_row(self, row: int, dt: float):
+        """Advance one row by dt at its current growth rate, without events"""
+        self.growth_timer[row] += dt
+        self.stage_timer[row] += dt
+        self.progress[row] += self.growth_rate[row] * dt
+    
+    def apply_due_events(self, row: int, plant=None):
+        """Apply the stage transition and water decay the row has reached"""
+        if self.stage[row] < FINAL_STAGE and self.progress[row] >= 1.0 - EVENT_EPSILON:
+            (plant or self.views[row])._advance_stage()
         
-        return base_rate * water_bonus * fertilizer_bonus
+        if (self.water_level[row] > 0 and
+                self.growth_timer[row] - self.last_watered[row] >= WATER_DECAY_INTERVAL - EVENT_EPSILON):
+            self.water_level[row] -= 1
+            self.last_watered[row] += WATER_DECAY_INTERVAL
+            self.refresh_rates(row)
+    
+    def integrate(self, row: int, dt: float, plant=None):
+        """Advance one row by dt, applying every event it passes on the way"""
+        eta = self.time_to_next_event(row)
+        while eta <= dt + STEP_EPSILON:
+            self.advance_row(row, min(eta, dt))
+            dt = max(0.0, dt - eta)
+            self.apply_due_events(row, plant)
+            eta = self.time_to_next_event(row)
+        self.advance_row(row, dt)
+    
+    def sync(self, row: int, until: Optional[float] = None):
+        """Bring a lagging row up to the table clock (or an earlier time)
+        
+        Lazy rows catch up through every stage transition and water decay
+        they passed, giving the same outcome as stepping them each frame.
+        """
+        until = self.time if until is None else until
+        remaining = until - self.synced_at[row]
+        if remaining <= 0:
+            return
+        
+        # Claim the time first so reads made while applying events don't recurse
+        self.synced_at[row] = until
+        if self.lazy:
+            self.integrate(row, remaining)
+        else:
+            self.advance_row(row, remaining)
+
+    def sync_rows(self, rows: np.ndarray):
+        """Vectorized sync for an index array of rows, up to the table clock"""
+        remaining = self.time - self.synced_at[rows]
+        lagging = remaining > 0
+        rows, remaining = rows[lagging], remaining[lagging]
+        if not rows.size:
+            return
+        self.synced_at[rows] = self.time
+        if self.lazy:
+            self.integrate_rows(rows, remaining)
+        else:
+            self._advance_rows(rows, remaining)
+    
+    def sync_due_rows(self, rows: np.ndarray):
+        """Sync only the rows that have reached a stage transition or water decay
+        
+        Their stage and care state are then current. The other rows have only
+        grown within their stage, which the state sets don't track, and are
+        left to catch up when read.
+        """
+        due = self.synced_at[rows] + self.times_to_next_event(rows) <= self.time + STEP_EPSILON
+        self.sync_rows(rows[due])
+
+def _column(name: str, cast, affects_rate: bool = False):
+    """Property exposing one column of the plant's table row
+    
+    Writes to columns that affect the growth rate refresh the cached rate.
+    """
+    def getter(self):
+        table = self._table
+        if table.lagging:
+            table.sync(self._row)
+        return cast(getattr(table, name)[self._row])
+    
+    def setter(self, value):
+        table = self._table
+        if table.lagging:
+            table.sync(self._row)
+            if table.changed is not None:
+                table.changed.add(self._row)
+        getattr(table, name)[self._row] = value
+        if affects_rate:
+            table.refresh_rates(self._row)
+    
+    return property(getter, setter)
+
+
+def _spec_field(name: str):
+    """Read-only property exposing one field of the plant's species spec"""
+    return property(lambda self: getattr(self.spec, name))
+
+
+class Plant:
+    """Individual plant with growth stages and mutations
+    
+    A Plant is a lightweight view onto a row of a PlantTable. Plants created
+    on their own, or removed from a garden, live in a shared loose table;
+    the garden places all of its plants in one table so they can be updated
+    together.
+    """
+    
+    __slots__ = ("plant_type", "x", "y", "spec", "mutations", "color_variants", "_table", "_row")
+    
+    name = _spec_field("name")
+    base_growth_time = _spec_field("growth_time")
+    water_need = _spec_field("water_need")
+    base_value = _spec_field("base_value")
+    base_mutation_chance = _spec_field("mutation_chance")
+    base_color = _spec_field("color")
+    
+    plant_id = _column("plant_id", int)
+    current_stage = _column("stage", int, affects_rate=True)
+    growth_progress = _column("progress", float)
+    growth_timer = _column("growth_timer", float)
+    stage_timer = _column("stage_timer", float)
+    water_level = _column("water_level", int, affects_rate=True)
+    max_water_level = _column("max_water_level", int, affects_rate=True)
+    last_watered = _column("last_watered", float)
+    fertilized = _column("fertilized", bool, affects_rate=True)
+    is_mutated = _column("mutated", bool)
+    size_multiplier = _column("size_multiplier", float)
+    growth_rate = _column("growth_rate", float)
+    
+    def __init__(self, plant_type: str, x: int, y: int, table: Optional[PlantTable] = None):
+        self.plant_type = plant_type
+        self.x = x
+        self.y = y
+        self.spec = get_plant_spec(plant_type)
+        
+        # Mutations and color variants stay empty (and shared) until needed
+        self.mutations = ()
+        self.color_variants = ()
+        
+        # Growth, water and care state live in the table row
+        self._table = table if table is not None else LOOSE_PLANTS
+        self._row = self._table.add(self, self.spec)
+        
+        # Check for initial mutation
+        self._check_initial_mutation()
+    
+    def __del__(self):
+        # Free the row of a plant in a table that doesn't hold its views
+        table = getattr(self, "_table", None)
+        if table is not None and not table.hold_views:
+            table.remove(self._row)
+    
+    def update(self, dt: float):
+        """Update plant growth
+        
+        Integrates exactly for any dt, crossing as many stages and applying
+        as many water decay steps and mutation rolls as the interval spans.
+        """
+        table = self._table
+        if table.lagging:
+            table.sync(self._row)
+            if table.changed is not None:
+                table.changed.add(self._row)
+        table.integrate(self._row, dt, self)
+    
+    def _calculate_growth_rate(self) -> float:
+        """Calculate current growth rate based on conditions"""
+        return self.growth_rate  # Zero once fully grown
     
     def _advance_stage(self):
         """Advance to next growth stage"""
@@ -96,7 +593,8 @@ class Plant:
     
     def _check_initial_mutation(self):
         """Check for initial mutation when planted"""
-        if random.random() < self.base_mutation_chance * 0.1:  # Lower chance for initial
+        roll = self._table.rng.random_at(self.plant_id, 0)
+        if roll < self.base_mutation_chance * 0.1:  # Lower chance for initial
             self._apply_mutation("early_growth")
     
     def _check_mutation(self):
@@ -114,26 +612,23 @@ class Plant:
         if self.water_level >= self.max_water_level:
             mutation_chance *= 1.2
         
-        if random.random() < mutation_chance:
+        if self._table.rng.random_at(self.plant_id, self.current_stage) < mutation_chance:
             self._apply_mutation("growth_spurt")
     
     def _apply_mutation(self, mutation_type: str):
         """Apply a mutation to the plant"""
         self.is_mutated = True
-        self.mutations.append(mutation_type)
+        self.mutations += (mutation_type,)
         
+        # Every mutation doubles the sale value (see plant_values); types differ in looks and growth
         if mutation_type == "growth_spurt":
-            self.mutation_multiplier = 1.5
             self.size_multiplier = 1.3
         elif mutation_type == "early_growth":
-            self.mutation_multiplier = 1.2
             self.growth_progress += 0.3
         elif mutation_type == "rare_color":
-            self.color_variants.append("rare")
-            self.mutation_multiplier = 2.0
+            self.color_variants += ("rare",)
         elif mutation_type == "giant":
             self.size_multiplier = 2.0
-            self.mutation_multiplier = 3.0
     
     def water(self) -> bool:
         """Water the plant"""
@@ -159,31 +654,20 @@ class Plant:
         return self.current_stage == len(GROWTH_STAGES) - 1
     
     def get_value(self) -> int:
-        """Calculate plant's current value"""
-        base_value = self.base_value
-        
-        # Stage multiplier
-        stage_multiplier = 1.0 + (self.current_stage * 0.2)
-        
-        # Mutation multiplier
-        mutation_multiplier = self.mutation_multiplier
-        
-        # Care bonus
-        care_bonus = 1.0
-        if self.fertilized:
-            care_bonus += 0.3
-        if self.water_level >= self.max_water_level:
-            care_bonus += 0.2
+        """Calculate plant's current value at its species base price
         
-        return int(base_value * stage_multiplier * mutation_multiplier * care_bonus)
+        Uses the same formula as the market (plant_values), without market
+        prices or events.
+        """
+        return int(plant_values(self.base_value, self.current_stage, self.is_mutated,
+                                self.fertilized, self.water_level >= self.max_water_level))
     
     def get_visual_properties(self) -> Dict:
         """Get visual properties for rendering"""
         stage = self.get_current_stage()
         
         # Base size based on stage
-        base_size = 0.3 + (self.current_stage * 0.15)
-        final_size = base_size * self.size_multiplier
+        final_size = float(visual_size(self.current_stage, self.size_multiplier))
         
         # Color variations
         color = self.base_color
@@ -211,7 +695,27 @@ class Plant:
             "max_water_level": self.max_water_level,
             "fertilized": self.fertilized,
             "mutated": self.is_mutated,
-            "mutations": self.mutations.copy(),
+            "mutations": list(self.mutations),
             "value": self.get_value(),
             "position": (self.x, self.y)
         }
+
+
+# Shared table for standalone and removed plants
+LOOSE_PLANTS = PlantTable(hold_views=False)
+
+
+def detach_plants(plants: List[Plant]):
+    """Move plants' state out of their table into the loose table
+    
+    The plants must share one table and be up to date. Their rows are
+    copied a column at a time; freeing the old rows is left to the caller.
+    """
+    if not plants:
+        return
+    table = plants[0]._table
+    rows = np.fromiter((plant._row for plant in plants), dtype=np.intp, count=len(plants))
+    new_rows = LOOSE_PLANTS.take_rows(table, rows, plants)
+    for plant, row in zip(plants, new_rows.tolist()):
+        plant._table = LOOSE_PLANTS
+        plant._row = row
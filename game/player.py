@@ -3,13 +3,14 @@ Player Class
 Handles player movement, inventory, and interactions
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from constants import *
+from achievements import AchievementTracker
 
 class Player:
     """Player character with movement and inventory"""
     
-    def __init__(self):
+    def __init__(self, achievements: Optional[AchievementTracker] = None):
         # Position (center of screen initially)
         self.x = SCREEN_WIDTH // 2
         self.y = SCREEN_HEIGHT // 2
@@ -30,6 +31,7 @@ class Player:
         self.max_energy = 100
         self.experience = 0
         self.level = 1
+        self.achievements = achievements
         
     def update(self, dt: float):
         """Update player state"""
@@ -119,6 +121,7 @@ class Player:
     def add_experience(self, amount: int):
         """Add experience points"""
         self.experience += amount
+        leveled = False
         
         # Level up every 100 experience
         while self.experience >= 100:
@@ -126,6 +129,10 @@ class Player:
             self.level += 1
             self.max_energy += 10
             self.energy = self.max_energy
+            leveled = True
+        
+        if leveled and self.achievements is not None:
+            self.achievements.report("level", self.level)
     
     def get_inventory_summary(self) -> Dict:
         """Get summary of player inventory"""
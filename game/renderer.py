@@ -4,7 +4,7 @@ Handles all game graphics and UI rendering
 """
 
 import pygame
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 from constants import *
 
 class Renderer:
@@ -33,63 +33,80 @@ class Renderer:
         }
     
     def render_garden(self, garden):
-        """Render the garden grid"""
-        for y in range(garden.height):
-            for x in range(garden.width):
-                # Calculate screen position
-                screen_x = x * GRID_SIZE
-                screen_y = y * GRID_SIZE
-                
-                # Get soil quality
-                soil_quality = garden.soil_quality[y][x]
-                
-                # Determine soil color
-                soil_color = self._get_soil_color(soil_quality)
-                
-                # Draw soil tile
-                pygame.draw.rect(
-                    self.screen,
-                    soil_color,
-                    (screen_x, screen_y, GRID_SIZE, GRID_SIZE)
-                )
-                
-                # Draw grid lines
-                pygame.draw.rect(
-                    self.screen,
-                    GRAY,
-                    (screen_x, screen_y, GRID_SIZE, GRID_SIZE),
-                    1
-                )
-                
-                # Draw water level indicator
-                if garden.water_levels[y][x] > 0:
-                    water_alpha = min(255, garden.water_levels[y][x] * 50)
-                    water_surface = pygame.Surface((GRID_SIZE, GRID_SIZE))
-                    water_surface.set_alpha(water_alpha)
-                    water_surface.fill(LIGHT_BLUE)
-                    self.screen.blit(water_surface, (screen_x, screen_y))
-                
-                # Draw fertilizer indicator
-                if garden.fertilizer_levels[y][x] > 0:
-                    fert_color = GREEN if garden.fertilizer_levels[y][x] >= 2 else LIGHT_GREEN
-                    fert_size = min(GRID_SIZE // 4, garden.fertilizer_levels[y][x] * 2)
-                    fert_x = screen_x + (GRID_SIZE - fert_size) // 2
-                    fert_y = screen_y + (GRID_SIZE - fert_size) // 2
-                    pygame.draw.circle(
+        """Render the garden grid (only allocated chunks on screen)"""
+        visible_width = min(garden.width, SCREEN_WIDTH // GRID_SIZE + 1)
+        visible_height = min(garden.height, SCREEN_HEIGHT // GRID_SIZE + 1)
+        self.render_soil(garden.chunks.values(), visible_width, visible_height)
+    
+    def render_soil(self, chunks, visible_width: int, visible_height: int):
+        """Render the tiles of garden chunks (or snapshot copies of them) on screen"""
+        for chunk in chunks:
+            if chunk.origin_x >= visible_width or chunk.origin_y >= visible_height:
+                continue  # Chunk is off screen
+            
+            for local_y in range(min(CHUNK_SIZE, visible_height - chunk.origin_y)):
+                for local_x in range(min(CHUNK_SIZE, visible_width - chunk.origin_x)):
+                    # Calculate screen position
+                    screen_x = (chunk.origin_x + local_x) * GRID_SIZE
+                    screen_y = (chunk.origin_y + local_y) * GRID_SIZE
+                    
+                    # Get soil quality
+                    soil_quality = chunk.soil_quality[local_y, local_x]
+                    
+                    # Determine soil color
+                    soil_color = self._get_soil_color(soil_quality)
+                    
+                    # Draw soil tile
+                    pygame.draw.rect(
                         self.screen,
-                        fert_color,
-                        (fert_x + fert_size // 2, fert_y + fert_size // 2),
-                        fert_size // 2
+                        soil_color,
+                        (screen_x, screen_y, GRID_SIZE, GRID_SIZE)
                     )
+                    
+                    # Draw grid lines
+                    pygame.draw.rect(
+                        self.screen,
+                        GRAY,
+                        (screen_x, screen_y, GRID_SIZE, GRID_SIZE),
+                        1
+                    )
+                    
+                    # Draw water level indicator
+                    water_level = int(chunk.water_levels[local_y, local_x])
+                    if water_level > 0:
+                        water_alpha = min(255, water_level * 50)
+                        water_surface = pygame.Surface((GRID_SIZE, GRID_SIZE))
+                        water_surface.set_alpha(water_alpha)
+                        water_surface.fill(LIGHT_BLUE)
+                        self.screen.blit(water_surface, (screen_x, screen_y))
+                    
+                    # Draw fertilizer indicator
+                    fertilizer_level = int(chunk.fertilizer_levels[local_y, local_x])
+                    if fertilizer_level > 0:
+                        fert_color = GREEN if fertilizer_level >= 2 else LIGHT_GREEN
+                        fert_size = min(GRID_SIZE // 4, fertilizer_level * 2)
+                        fert_x = screen_x + (GRID_SIZE - fert_size) // 2
+                        fert_y = screen_y + (GRID_SIZE - fert_size) // 2
+                        pygame.draw.circle(
+                            self.screen,
+                            fert_color,
+                            (fert_x + fert_size // 2, fert_y + fert_size // 2),
+                            fert_size // 2
+                        )
     
-    def render_plant(self, plant):
-        """Render a plant"""
+    def render_plant(self, plant, size: Optional[float] = None):
+        """Render a plant (optionally at an interpolated size in tiles)"""
         # Get plant visual properties
         props = plant.get_visual_properties()
-        
+        if size is not None:
+            props["size"] = size
+        self.render_plant_visual(plant.x, plant.y, props)
+    
+    def render_plant_visual(self, x: int, y: int, props: Dict):
+        """Render a plant at a tile from its visual properties"""
         # Calculate screen position
-        screen_x = (plant.x * GRID_SIZE) + (GRID_SIZE // 2)
-        screen_y = (plant.y * GRID_SIZE) + (GRID_SIZE // 2)
+        screen_x = (x * GRID_SIZE) + (GRID_SIZE // 2)
+        screen_y = (y * GRID_SIZE) + (GRID_SIZE // 2)
         
         # Calculate plant size
         plant_size = int(props["size"] * GRID_SIZE * 0.8)
@@ -209,13 +226,16 @@ class Renderer:
                 (water_bar_x, water_bar_y, water_fill, water_bar_height)
             )
     
-    def render_player(self, player):
-        """Render the player character"""
+    def render_player(self, position: tuple, direction: tuple):
+        """Render the player character at a snapshot's position and direction"""
+        x, y = position
+        dx, dy = direction
+        
         # Draw player as a simple circle
         pygame.draw.circle(
             self.screen,
             BLUE,
-            (int(player.x), int(player.y)),
+            (int(x), int(y)),
             PLAYER_SIZE // 2
         )
         
@@ -223,22 +243,22 @@ class Renderer:
         pygame.draw.circle(
             self.screen,
             WHITE,
-            (int(player.x), int(player.y)),
+            (int(x), int(y)),
             PLAYER_SIZE // 2,
             2
         )
         
         # Draw direction indicator
-        if player.dx != 0 or player.dy != 0:
+        if dx != 0 or dy != 0:
             # Calculate direction
-            direction_x = player.dx * 8
-            direction_y = player.dy * 8
+            direction_x = dx * 8
+            direction_y = dy * 8
             
             pygame.draw.line(
                 self.screen,
                 WHITE,
-                (player.x, player.y),
-                (player.x + direction_x, player.y + direction_y),
+                (x, y),
+                (x + direction_x, y + direction_y),
                 3
             )
     
@@ -260,8 +280,8 @@ class Renderer:
         else:
             self.screen.blit(text_surface, (x, y))
     
-    def render_shop(self, shop, economy):
-        """Render shop interface"""
+    def render_shop(self, categories: Sequence[Tuple[str, Sequence[Mapping]]], money: int):
+        """Render shop interface from a snapshot's (category, items) listing"""
         # Background
         pygame.draw.rect(
             self.screen,
@@ -273,20 +293,18 @@ class Renderer:
         self.render_text("SHOP", SCREEN_WIDTH // 2, 130, WHITE, 32, center=True)
         
         # Money display
-        money_text = f"Money: {economy.money}"
+        money_text = f"Money: {money}"
         self.render_text(money_text, SCREEN_WIDTH // 2, 170, YELLOW, 24, center=True)
         
         # Categories
-        categories = shop.get_all_categories()
         y_offset = 220
         
-        for category in categories:
+        for category, items in categories:
             # Category header
             self.render_text(category.upper(), 150, y_offset, WHITE, 20)
             y_offset += 30
             
             # Items in category
-            items = shop.get_available_items(category)
             for item in items:
                 item_text = f"{item['name']} - {item['cost']} coins"
                 self.render_text(item_text, 170, y_offset, LIGHT_GRAY, 18)
@@ -297,8 +315,8 @@ class Renderer:
         # Close instruction
         self.render_text("Press ESC to close", SCREEN_WIDTH // 2, SCREEN_HEIGHT - 120, WHITE, 18, center=True)
     
-    def render_inventory(self, player):
-        """Render inventory interface"""
+    def render_inventory(self, stats: Mapping):
+        """Render inventory interface from a snapshot's inventory summary"""
         # Background
         pygame.draw.rect(
             self.screen,
@@ -310,7 +328,6 @@ class Renderer:
         self.render_text("INVENTORY", SCREEN_WIDTH // 2, 130, WHITE, 32, center=True)
         
         # Player stats
-        stats = player.get_inventory_summary()
         y_offset = 180
         
         # Seeds
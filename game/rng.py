@@ -0,0 +1,112 @@
+"""
+Random Streams
+Counter-based random numbers keyed by world seed, subsystem and counters
+"""
+
+import random
+import zlib
+from typing import List, Optional, Sequence
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX_MULTIPLIER_1 = 0xBF58476D1CE4E5B9
+MIX_MULTIPLIER_2 = 0x94D049BB133111EB
+
+
+def _mix(z: int) -> int:
+    """SplitMix64 finalizer for a single 64-bit integer"""
+    z = ((z ^ (z >> 30)) * MIX_MULTIPLIER_1) & MASK64
+    z = ((z ^ (z >> 27)) * MIX_MULTIPLIER_2) & MASK64
+    return z ^ (z >> 31)
+
+
+def _mix_array(z: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied element-wise to a uint64 array"""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX_MULTIPLIER_1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX_MULTIPLIER_2)
+    return z ^ (z >> np.uint64(31))
+
+
+def _counter(value) -> int:
+    """Turn a key part (int or name) into a 64-bit counter"""
+    if isinstance(value, str):
+        return zlib.crc32(value.encode("utf-8"))
+    return int(value) & MASK64
+
+
+class RandomStream:
+    """Independent random stream for one subsystem
+
+    Every number is a pure function of (world seed, stream name, counters),
+    so results don't depend on the order in which subsystems or plants are
+    evaluated and can be computed in vectorized batches.
+    """
+
+    def __init__(self, seed: int, name: str):
+        self.name = name
+        self.key = _mix((seed ^ _counter(name)) & MASK64)
+        self.counter = 0  # Position of the sequential draws
+
+    def _hash(self, counters: Sequence) -> int:
+        h = self.key
+        for value in counters:
+            h = _mix((h + _counter(value) * GOLDEN_GAMMA) & MASK64)
+        return h
+
+    def random_at(self, *counters) -> float:
+        """Uniform float in [0, 1) for the given counters"""
+        return (self._hash(counters) >> 11) * (1.0 / (1 << 53))
+
+    def random_array(self, *counters) -> np.ndarray:
+        """Vectorized random_at over equally shaped integer arrays"""
+        arrays = np.broadcast_arrays(*[np.asarray(c) for c in counters])
+        h = np.full(arrays[0].shape, self.key, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for array in arrays:
+                h = _mix_array(h + array.astype(np.uint64) * np.uint64(GOLDEN_GAMMA))
+        return (h >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+    def random(self) -> float:
+        """Next float in the stream's sequence"""
+        value = self.random_at(self.counter)
+        self.counter += 1
+        return value
+
+    def uniform(self, low: float, high: float) -> float:
+        """Next float in the sequence, scaled to [low, high)"""
+        return low + (high - low) * self.random()
+
+    def sample(self, population: Sequence, k: int) -> List:
+        """Choose k unique items from the population (partial Fisher-Yates)"""
+        pool = list(population)
+        return [pool[i] for i in self.sample_indices(len(pool), k)]
+
+    def sample_indices(self, n: int, k: int) -> List[int]:
+        """Choose k unique indices below n in O(k) time and memory
+
+        Runs the partial Fisher-Yates shuffle over a virtual range(n), only
+        remembering the slots it has swapped.
+        """
+        if not 0 <= k <= n:
+            raise ValueError("Sample larger than population")
+        swapped = {}
+        chosen = []
+        for i in range(k):
+            j = i + int(self.random() * (n - i))
+            chosen.append(swapped.get(j, j))
+            swapped[j] = swapped.get(i, i)
+        return chosen
+
+
+class RandomStreams:
+    """Seeded source of per-subsystem random streams for one game world"""
+
+    def __init__(self, seed: Optional[int] = None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed & MASK64
+
+    def stream(self, name: str) -> RandomStream:
+        """Get the random stream for a subsystem"""
+        return RandomStream(self.seed, name)
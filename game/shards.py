@@ -0,0 +1,207 @@
+"""
+Sharded Simulation
+Advances plant growth in worker processes over shared-memory plant columns
+"""
+
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from constants import *
+from plant import PlantTable
+from rng import RandomStream
+
+
+def _column_layout(capacity: int) -> Tuple[Dict[str, int], int]:
+    """Byte offset of each column in a shared block, and the block size"""
+    offsets = {}
+    size = 0
+    for name, dtype in PlantTable.COLUMNS.items():
+        offsets[name] = size
+        size += -(-capacity * np.dtype(dtype).itemsize // 8) * 8  # Keep columns 8-byte aligned
+    return offsets, max(size, 8)
+
+
+def _map_columns(table: PlantTable, block: shared_memory.SharedMemory, capacity: int):
+    """Point every column of a table at its slice of a shared block"""
+    offsets, _ = _column_layout(capacity)
+    for name, dtype in PlantTable.COLUMNS.items():
+        setattr(table, name, np.ndarray(capacity, dtype=dtype, buffer=block.buf, offset=offsets[name]))
+
+
+def _release(blocks: List[shared_memory.SharedMemory]):
+    """Free shared blocks owned by this process"""
+    for block in blocks:
+        block.close()
+        block.unlink()
+    blocks.clear()
+
+
+class SharedPlantTable(PlantTable):
+    """PlantTable whose columns live in one shared memory block
+
+    Growing the table moves the columns to a new, larger block; workers
+    attach to blocks by name and follow the move on their next task.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.blocks = []  # Blocks this process created (only the newest is in use)
+        self._finalizer = weakref.finalize(self, _release, self.blocks)
+        super().__init__(*args, **kwargs)
+
+    @property
+    def block_name(self) -> str:
+        return self.blocks[-1].name
+
+    def _grow(self, capacity: int):
+        """Move every column into a new shared block of the given capacity"""
+        _, size = _column_layout(capacity)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        old_columns = {name: getattr(self, name) for name in self.COLUMNS}
+        _map_columns(self, block, capacity)
+        for name, column in old_columns.items():
+            new_column = getattr(self, name)
+            new_column[:] = 0
+            new_column[:len(column)] = column
+        del old_columns, column, new_column  # Drop views into the old block before closing it
+        _release(self.blocks)
+        self.blocks.append(block)
+        self.views.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def close(self):
+        """Free the shared block"""
+        self._finalizer()
+
+
+class _ShardTable(PlantTable):
+    """Worker-side table over a shared block, without plant views
+
+    Mutations are written straight into the columns and reported back so
+    the main process can record them on its Plant views.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, capacity: int):
+        self.block = block
+        self.capacity = capacity
+        self.size = 0
+        self.lagging = False
+        self.lazy = False
+        self.changed = None
+        self.stage_rows = None  # State sets are kept by the main process
+        self.mutated_rows = []
+        _map_columns(self, block, capacity)
+
+    def _mutate_rows(self, rows: np.ndarray):
+        """Same column changes as Plant._apply_mutation("growth_spurt")"""
+        self.mutated[rows] = True
+        self.size_multiplier[rows] = 1.3
+        self.mutated_rows.extend(rows.tolist())
+
+
+_worker_table = None  # Shard table of this worker's current block
+
+
+def _attach(name: str, capacity: int) -> _ShardTable:
+    """Attach this worker to a shared block (reusing the last attachment)"""
+    global _worker_table
+    if _worker_table is not None and _worker_table.block.name == name:
+        return _worker_table
+    if _worker_table is not None:
+        old = _worker_table
+        _worker_table = None
+        for column in PlantTable.COLUMNS:
+            delattr(old, column)
+        old.block.close()
+
+    # The main process owns the block, so attaching must not register it
+    # with the resource tracker (which would unlink it when we exit)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+    _worker_table = _ShardTable(block, capacity)
+    return _worker_table
+
+
+def advance_shard(name: str, capacity: int, start: int, stop: int, time: float, dt: float,
+                  rng: RandomStream) -> Tuple[List[int], List[int]]:
+    """Worker task: advance rows start..stop-1 of a shared table by dt
+
+    Returns the rows that may have passed an event and the rows that mutated.
+    """
+    table = _attach(name, capacity)
+    table.time = time
+    table.rng = rng
+    table.mutated_rows = []
+    due_rows = table.update_range(start, stop, dt)
+    return due_rows.tolist(), table.mutated_rows
+
+
+def _shutdown(executor: ProcessPoolExecutor):
+    """Stop a pool's worker processes"""
+    executor.shutdown()
+
+
+class ShardPool:
+    """Worker processes that each advance one shard of a shared plant table
+
+    Shards are contiguous row ranges, split evenly at every update. Rows
+    never interact during growth, so the result is identical to advancing
+    the whole table in one process. Everything else (care actions, rain,
+    pests and the economy) stays in the main process and writes the shared
+    columns directly between updates.
+
+    Handing shards to other processes only pays off with several cores
+    and large tables, so until there are more than one worker and
+    min_rows plants per worker the table is advanced in this process, and
+    the workers are only started once sharding begins. Call close (or let
+    the owning Garden or GameState close) to stop them.
+    """
+
+    def __init__(self, table: SharedPlantTable, workers: Optional[int] = None,
+                 min_rows: int = SHARD_MIN_ROWS):
+        self.table = table
+        self.workers = workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self.executor = None
+        self._finalizer = None
+
+    def sharding(self) -> bool:
+        """Whether the next update goes to the worker processes"""
+        return self.workers > 1 and self.table.size >= self.workers * self.min_rows
+
+    def update(self, dt: float):
+        """Advance every shard by dt and fold the results back in"""
+        table = self.table
+        if not self.sharding():
+            table.update(dt)
+            return
+        table.time += dt
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._finalizer = weakref.finalize(self, _shutdown, self.executor)
+        bounds = np.linspace(0, table.size, self.workers + 1).astype(int)
+        futures = [
+            self.executor.submit(advance_shard, table.block_name, table.capacity, int(start), int(stop),
+                                 table.time, dt, table.rng)
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+        for future in futures:
+            due_rows, mutated_rows = future.result()
+            for row in mutated_rows:
+                table.views[row].mutations += ("growth_spurt",)
+            if table.stage_rows is not None and due_rows:
+                table._index_states(np.array(due_rows, dtype=np.intp))
+
+    def close(self):
+        """Stop the worker processes, if they were started"""
+        if self._finalizer is not None:
+            self._finalizer()
+        self.executor = None
+        self._finalizer = None
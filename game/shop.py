@@ -3,78 +3,155 @@ Shop Class
 Manages available items and their costs
 """
 
-from typing import Dict, List, Optional
+import heapq
+from bisect import bisect_right
+from numbers import Integral
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
 from constants import *
 
+
+class Cart:
+    """Shopping list of (category, item, quantity) lines for one checkout
+    
+    Adding an item that is already in the cart raises its quantity.
+    """
+    
+    def __init__(self):
+        self.quantities = {}  # (category, item name) -> quantity
+    
+    def __iter__(self) -> Iterator[Tuple[str, str, int]]:
+        for (category, item_name), quantity in self.quantities.items():
+            yield category, item_name, quantity
+    
+    def __len__(self) -> int:
+        return len(self.quantities)
+    
+    def add(self, category: str, item_name: str, quantity: int = 1):
+        """Add some of an item to the cart"""
+        key = (category, item_name)
+        self.quantities[key] = self.quantities.get(key, 0) + quantity
+    
+    def remove(self, category: str, item_name: str, quantity: Optional[int] = None):
+        """Take some (by default all) of an item out of the cart"""
+        key = (category, item_name)
+        remaining = 0 if quantity is None else self.quantities.get(key, 0) - quantity
+        if remaining > 0:
+            self.quantities[key] = remaining
+        else:
+            self.quantities.pop(key, None)
+    
+    def clear(self):
+        """Empty the cart"""
+        self.quantities.clear()
+
+
 class Shop:
-    """Shop system for purchasing seeds, tools, and upgrades"""
+    """Shop system for purchasing seeds, tools, and upgrades
+    
+    Items are the catalog's, referred to by item id. Effective prices (after
+    sales and daily deals) are computed from the catalog's cost array into a
+    table of shared read-only item records indexed by item id, plus a
+    cost-sorted index of the unlocked items of each category. Both are
+    rebuilt lazily, only after a price change or an unlock, so lookups and
+    "what can I afford" queries (a bisect over the index) don't copy or sort
+    anything.
+    """
     
     def __init__(self):
-        self.items = {
-            "seeds": {
-                "carrot": {"name": "Carrot Seeds", "cost": 10, "description": "Fast-growing basic vegetable"},
-                "tomato": {"name": "Tomato Seeds", "cost": 25, "description": "Medium growth, good value"},
-                "corn": {"name": "Corn Seeds", "cost": 40, "description": "Slow growth, high value"},
-                "strawberry": {"name": "Strawberry Seeds", "cost": 60, "description": "Rare fruit, high mutation chance"},
-                "sunflower": {"name": "Sunflower Seeds", "cost": 80, "description": "Decorative, attracts beneficial insects"}
-            },
-            "tools": {
-                "basic_watering_can": {"name": "Basic Watering Can", "cost": 0, "description": "Basic watering tool (starter item)"},
-                "advanced_watering_can": {"name": "Advanced Watering Can", "cost": 150, "description": "Waters more efficiently"},
-                "fertilizer_spreader": {"name": "Fertilizer Spreader", "cost": 200, "description": "Applies fertilizer to multiple plants"},
-                "sprinkler": {"name": "Sprinkler System", "cost": 500, "description": "Automatically waters plants"},
-                "pest_repellent": {"name": "Pest Repellent", "cost": 300, "description": "Protects plants from pests"}
-            },
-            "fertilizers": {
-                "basic_fertilizer": {"name": "Basic Fertilizer", "cost": 25, "description": "Increases growth rate"},
-                "premium_fertilizer": {"name": "Premium Fertilizer", "cost": 75, "description": "Significantly increases growth and mutation chance"},
-                "organic_fertilizer": {"name": "Organic Fertilizer", "cost": 100, "description": "Improves soil quality over time"}
-            },
-            "expansions": {
-                "garden_expansion": {"name": "Garden Expansion", "cost": 200, "description": "Unlocks more garden space"},
-                "greenhouse": {"name": "Greenhouse", "cost": 1000, "description": "Protects plants from weather, faster growth"}
-            }
-        }
+        self.catalog = CATALOG
+        
+        # Item ids by category, and by item name for daily deals
+        self.category_items = {category: [] for category in self.catalog.item_categories}
+        self.item_ids_by_name = {}
+        for item_id, category in enumerate(self.catalog.item_category.tolist()):
+            self.category_items[self.catalog.item_categories[category]].append(item_id)
+            self.item_ids_by_name.setdefault(self.catalog.item_keys[item_id], []).append(item_id)
         
         # Unlock progression
         self.unlocked_categories = ["seeds", "tools"]
-        self.unlocked_items = {
-            "seeds": ["carrot"],
-            "tools": ["basic_watering_can"],
-            "fertilizers": [],
-            "expansions": []
-        }
+        self.unlocked_items = {category: [] for category in self.category_items}
+        self.unlocked_items["seeds"].append("carrot")
+        self.unlocked_items["tools"].append("basic_watering_can")
         
         # Special offers and sales
         self.daily_deals = {}
         self.sale_multiplier = 1.0
+        
+        # Derived tables, rebuilt on first use after they are invalidated
+        self._records = None  # Read-only record at the effective price, by item id
+        self._available = None  # Category -> unlocked records, in unlock order
+        self._cost_index = None  # Category -> (sorted costs, records in the same order)
+    
+    @property
+    def items(self) -> Dict[str, Dict[str, Dict]]:
+        """Base prices and descriptions by category (a fresh listing)"""
+        return self.catalog.shop_items()
     
-    def get_item(self, category: str, item_name: str) -> Optional[Dict]:
-        """Get item information"""
-        if category in self.items and item_name in self.items[category]:
-            item = self.items[category][item_name].copy()
+    def _invalidate_prices(self):
+        """Forget the price table (and everything built from it)"""
+        self._records = None
+        self._invalidate_unlocks()
+    
+    def _invalidate_unlocks(self):
+        """Forget the per-category indexes of unlocked items"""
+        self._available = None
+        self._cost_index = None
+    
+    def _item_id(self, category: str, item_name: str) -> Optional[int]:
+        return self.catalog.item_ids.get((category, item_name))
+    
+    def _price_table(self) -> Tuple[Mapping, ...]:
+        """Read-only item records at their effective prices, by item id"""
+        if self._records is None:
+            catalog = self.catalog
             
-            # Apply sale multiplier
-            if item_name in self.daily_deals:
-                item["cost"] = int(item["cost"] * self.daily_deals[item_name])
-            else:
-                item["cost"] = int(item["cost"] * self.sale_multiplier)
+            # Apply the sale multiplier, or an item's daily deal instead
+            multipliers = np.full(len(catalog.item_keys), self.sale_multiplier)
+            for item_name, multiplier in self.daily_deals.items():
+                multipliers[self.item_ids_by_name.get(item_name, [])] = multiplier
+            costs = (catalog.item_costs * multipliers).astype(np.int64).tolist()
             
-            return item
-        return None
+            self._records = tuple(
+                MappingProxyType({"name": catalog.item_names[item_id], "cost": cost,
+                                  "description": catalog.item_descriptions[item_id],
+                                  "category": catalog.item_categories[category], "item": catalog.item_keys[item_id]})
+                for item_id, (category, cost) in enumerate(zip(catalog.item_category.tolist(), costs))
+            )
+        return self._records
+    
+    def _build_indexes(self):
+        """Index the unlocked items of every unlocked category"""
+        records = self._price_table()
+        self._available = {}
+        self._cost_index = {}
+        for category in self.unlocked_categories:
+            item_ids = (self._item_id(category, item_name) for item_name in self.unlocked_items.get(category, []))
+            available = tuple(records[item_id] for item_id in item_ids if item_id is not None)
+            by_cost = sorted(available, key=lambda item: item["cost"])
+            self._available[category] = available
+            self._cost_index[category] = ([item["cost"] for item in by_cost], tuple(by_cost))
     
-    def get_available_items(self, category: str) -> List[Dict]:
+    def get_item(self, category: str, item_name: str) -> Optional[Mapping]:
+        """Get item information (a shared, read-only record)"""
+        item_id = self._item_id(category, item_name)
+        return self._price_table()[item_id] if item_id is not None else None
+    
+    def get_available_items(self, category: str) -> Sequence[Mapping]:
         """Get list of available items in a category"""
-        if category not in self.unlocked_categories:
-            return []
-        
-        available = []
-        for item_name in self.unlocked_items[category]:
-            item = self.get_item(category, item_name)
-            if item:
-                available.append(item)
-        
-        return available
+        if self._available is None:
+            self._build_indexes()
+        return self._available.get(category, ())
+    
+    def get_affordable_items(self, money: int, category: str) -> Sequence[Mapping]:
+        """Unlocked items of a category costing at most money, cheapest first"""
+        if self._cost_index is None:
+            self._build_indexes()
+        if category not in self._cost_index:
+            return ()
+        costs, items = self._cost_index[category]
+        return items[:bisect_right(costs, money)]
     
     def get_all_categories(self) -> List[str]:
         """Get all available categories"""
@@ -82,13 +159,14 @@ class Shop:
     
     def unlock_item(self, category: str, item_name: str) -> bool:
         """Unlock a new item for purchase"""
-        if category in self.items and item_name in self.items[category]:
+        if self._item_id(category, item_name) is not None:
             if category not in self.unlocked_categories:
                 self.unlocked_categories.append(category)
             
             if category not in self.unlocked_items:
                 self.unlocked_items[category] = []
             
+            self._invalidate_unlocks()
             if item_name not in self.unlocked_items[category]:
                 self.unlocked_items[category].append(item_name)
                 return True
@@ -97,23 +175,27 @@ class Shop:
     
     def unlock_category(self, category: str) -> bool:
         """Unlock an entire category"""
-        if category in self.items and category not in self.unlocked_categories:
+        if category in self.category_items and category not in self.unlocked_categories:
             self.unlocked_categories.append(category)
-            self.unlocked_items[category] = list(self.items[category].keys())
+            self.unlocked_items[category] = [self.catalog.item_keys[item_id] for item_id in self.category_items[category]]
+            self._invalidate_unlocks()
             return True
         return False
     
     def set_sale(self, multiplier: float):
         """Set a general sale multiplier"""
         self.sale_multiplier = max(0.1, min(1.0, multiplier))
+        self._invalidate_prices()
     
     def add_daily_deal(self, item_name: str, discount: float):
         """Add a daily deal for a specific item"""
         self.daily_deals[item_name] = max(0.1, min(1.0, 1.0 - discount))
+        self._invalidate_prices()
     
     def clear_daily_deals(self):
         """Clear all daily deals"""
         self.daily_deals.clear()
+        self._invalidate_prices()
     
     def get_shop_summary(self) -> Dict:
         """Get summary of shop state"""
@@ -136,22 +218,44 @@ class Shop:
         item = self.get_item(category, item_name)
         return item["cost"] if item else 0
     
-    def get_recommended_items(self, money: int, category: str = None) -> List[Dict]:
-        """Get items the player can afford, optionally filtered by category"""
-        recommended = []
-        
-        categories = [category] if category else self.unlocked_categories
+    def quote(self, lines: Iterable[Tuple[str, str, int]], limits: Optional[Mapping[str, int]] = None) -> Dict:
+        """Price (category, item, quantity) lines against one snapshot of prices
         
-        for cat in categories:
-            if cat not in self.unlocked_categories:
+        Repeated items are merged. limits caps the total quantity of each
+        category listed in it (0 to refuse it). Returns the priced lines as
+        (record, quantity, cost), their total, and the lines that can't be
+        bought (unknown items, quantities that aren't whole numbers of at
+        least one, and every line of a category over its limit).
+        """
+        records = self._price_table()
+        quantities = {}  # Item id -> quantity
+        invalid = []
+        for category, item_name, quantity in lines:
+            item_id = self._item_id(category, item_name)
+            # bool is an int subclass, but never a quantity
+            if item_id is None or isinstance(quantity, bool) or not isinstance(quantity, Integral) or quantity < 1:
+                invalid.append((category, item_name, quantity))
                 continue
-                
-            for item_name in self.unlocked_items[cat]:
-                if self.can_afford_item(cat, item_name, money):
-                    item = self.get_item(cat, item_name)
-                    if item:
-                        recommended.append(item)
+            quantities[item_id] = quantities.get(item_id, 0) + int(quantity)
+        
+        if limits:
+            ordered = {}
+            for item_id, quantity in quantities.items():
+                category = records[item_id]["category"]
+                ordered[category] = ordered.get(category, 0) + quantity
+            over = {category for category, quantity in ordered.items() if quantity > limits.get(category, quantity)}
+            for item_id in [item_id for item_id in quantities if records[item_id]["category"] in over]:
+                invalid.append((records[item_id]["category"], records[item_id]["item"], quantities.pop(item_id)))
+        
+        # Costs in Python ints, so huge quantities can't overflow into a negative total
+        priced = [(records[item_id], quantity, records[item_id]["cost"] * quantity)
+                  for item_id, quantity in quantities.items()]
+        return {"lines": priced, "total": sum(cost for _, _, cost in priced), "invalid": invalid}
+    
+    def get_recommended_items(self, money: int, category: str = None) -> List[Mapping]:
+        """Get items the player can afford, optionally filtered by category"""
+        categories = [category] if category else self.unlocked_categories
         
-        # Sort by cost (cheapest first)
-        recommended.sort(key=lambda x: x["cost"])
-        return recommended
+        # Merge the affordable prefix of each category's cost index (cheapest first)
+        return list(heapq.merge(*(self.get_affordable_items(money, cat) for cat in categories),
+                                key=lambda item: item["cost"]))
@@ -0,0 +1,122 @@
+"""
+Simulation Thread
+Advances the game state on its own thread and publishes snapshots for drawing
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+from constants import *
+from timestep import FixedTimestep, Interpolator, VisualSnapshot
+
+# A command runs on the simulation thread with the game state and may
+# return a notification message for the player
+Command = Callable[..., Optional[str]]
+
+
+class SimulationThread:
+    """Runs a GameState at a fixed tick rate on a dedicated thread
+
+    Only the simulation thread touches the game state. The render thread
+    sends player input as commands through a deque (appends and pops are
+    atomic, so neither side locks) and draws the immutable snapshots
+    published into the interpolator's double buffer, one per advance that
+    ran steps. Notifications come back through a second deque.
+
+    Both threads share the GIL, which numpy only releases inside its array
+    loops, so a tick and a frame mostly take turns; the thread keeps the
+    frame rate independent of the tick rate rather than adding parallelism.
+    """
+
+    def __init__(self, game_state, rect: Tuple[int, int, int, int], tick_rate: float = SIM_TICK_RATE,
+                 max_steps: int = MAX_CATCH_UP_STEPS):
+        self.game_state = game_state
+        self.timestep = FixedTimestep(tick_rate, max_steps)
+        self.interpolator = Interpolator(rect)
+        self.interpolator.capture(game_state)
+
+        self.commands = deque()  # Render thread -> simulation thread
+        self.notifications = deque()  # Simulation thread -> render thread
+        self.paused = False
+        self.error = None  # Exception that stopped the simulation thread
+
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        """Start simulating"""
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop simulating and wait for the thread to finish"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def submit(self, command: Command, *args):
+        """Queue command(game_state, *args) to run before the next step"""
+        self.commands.append((command, args))
+        self._wake.set()
+
+    def read(self) -> Tuple[Optional[VisualSnapshot], VisualSnapshot]:
+        """The last two published snapshots, read together"""
+        return self.interpolator.read()
+
+    def alpha(self, snapshots) -> float:
+        """Blend factor for drawing now: time since the latest snapshot, in steps"""
+        return min(1.0, (time.perf_counter() - snapshots[1].time) / self.timestep.step)
+
+    def take_notifications(self) -> List[str]:
+        """Notifications produced since the last call"""
+        messages = []
+        while self.notifications:
+            messages.append(self.notifications.popleft())
+        return messages
+
+    def _apply_commands(self) -> bool:
+        """Run every queued command; returns whether any ran"""
+        ran = False
+        while self.commands:
+            command, args = self.commands.popleft()
+            message = command(self.game_state, *args)
+            if message:
+                self.notifications.append(message)
+            ran = True
+        return ran
+
+    def advance(self, dt: float) -> int:
+        """Apply queued commands, run the steps due after dt seconds and publish
+
+        The thread calls this in a loop; it can also drive the simulation
+        directly (e.g. in tests). Returns the number of steps run.
+        """
+        changed = self._apply_commands()
+        steps = 0 if self.paused else self.timestep.advance(dt)
+        if self.paused:
+            self.timestep.accumulator = 0.0
+        for _ in range(steps):
+            self.game_state.update(self.timestep.step)
+        if steps:
+            self.interpolator.capture(self.game_state, steps)  # Only the last step is ever drawn
+        for _, _, name in self.game_state.achievements.collect():
+            self.notifications.append(f"Achievement unlocked: {name}!")
+        if changed and not steps:
+            self.interpolator.refresh(self.game_state)
+        return steps
+
+    def _run(self):
+        last_time = time.perf_counter()
+        try:
+            while not self._stopping:
+                self._wake.clear()
+                now = time.perf_counter()
+                self.advance(now - last_time)
+                last_time = now
+
+                # Sleep until the next step is due or a command arrives
+                self._wake.wait(max(0.0, self.timestep.step - self.timestep.accumulator))
+        except Exception as e:
+            self.error = e
@@ -0,0 +1,255 @@
+"""
+Spatial Index
+Bucket grid for finding plants by area, distance and state, and a dense
+position set for uniform random picks
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from constants import *
+from plant import Plant
+from rng import RandomStream
+
+
+class DensePositions:
+    """Set of tile positions packed into a dense array
+
+    A position-to-slot map lets removal swap the last position into the
+    freed slot, so adding, removing and picking the i-th position are O(1)
+    and a uniform random sample of k positions is O(k).
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.positions = np.zeros((capacity, 2), dtype=np.int64)  # slot -> (x, y)
+        self.slots = {}  # (x, y) -> slot
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, position: Tuple[int, int]) -> bool:
+        return position in self.slots
+
+    def __getitem__(self, slot: int) -> Tuple[int, int]:
+        x, y = self.positions[slot].tolist()
+        return x, y
+
+    def add(self, x: int, y: int):
+        """Add a position (no effect if already present)"""
+        if (x, y) in self.slots:
+            return
+        if self.size == len(self.positions):
+            self.positions = np.concatenate([self.positions, np.zeros_like(self.positions)])
+        self.positions[self.size] = (x, y)
+        self.slots[(x, y)] = self.size
+        self.size += 1
+
+    def remove(self, x: int, y: int) -> bool:
+        """Remove a position by moving the last one into its slot"""
+        slot = self.slots.pop((x, y), None)
+        if slot is None:
+            return False
+        self.size -= 1
+        if slot != self.size:
+            last = self.positions[self.size]
+            self.positions[slot] = last
+            self.slots[(int(last[0]), int(last[1]))] = slot
+        return True
+
+    def remove_many(self, xs: np.ndarray, ys: np.ndarray) -> int:
+        """Remove many positions at once, returning how many were present
+
+        Positions left past the new end move into the freed slots below it,
+        so only the moved positions get new slots.
+        """
+        slots = self.slots
+        freed = np.fromiter((slots.pop(position, -1) for position in zip(xs.tolist(), ys.tolist())),
+                            dtype=np.int64, count=len(xs))
+        freed = freed[freed >= 0]
+        if not freed.size:
+            return 0
+        size = self.size - freed.size
+        holes = freed[freed < size]
+        kept_tail = np.ones(self.size - size, dtype=bool)
+        kept_tail[freed[freed >= size] - size] = False
+        movers = np.flatnonzero(kept_tail) + size
+        self.positions[holes] = self.positions[movers]
+        for (x, y), slot in zip(self.positions[holes].tolist(), holes.tolist()):
+            slots[(x, y)] = slot
+        self.size = size
+        return int(freed.size)
+
+    def sample(self, rng: RandomStream, k: int) -> List[Tuple[int, int]]:
+        """Pick k distinct positions uniformly at random"""
+        return [self[slot] for slot in rng.sample_indices(self.size, k)]
+
+
+class SpatialIndex:
+    """Bucket grid of plant positions
+
+    Plants are kept in square buckets of bucket_size tiles, so area queries
+    only visit the buckets they overlap and nearest-plant queries search
+    outward one ring of buckets at a time.
+
+    Every query takes the same optional filters: stage (growth stage index),
+    harvestable, mutated and fertilized. A filter left as None matches all.
+    """
+
+    def __init__(self, bucket_size: int = SPATIAL_BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self.buckets = {}  # (bucket x, bucket y) -> {(x, y): Plant}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _bucket_key(self, x: int, y: int) -> Tuple[int, int]:
+        return x // self.bucket_size, y // self.bucket_size
+
+    def insert(self, x: int, y: int, plant: Plant):
+        """Add a plant at a tile (replacing any plant already there)"""
+        bucket = self.buckets.setdefault(self._bucket_key(x, y), {})
+        if (x, y) not in bucket:
+            self.size += 1
+        bucket[(x, y)] = plant
+
+    def remove(self, x: int, y: int) -> Optional[Plant]:
+        """Remove and return the plant at a tile"""
+        key = self._bucket_key(x, y)
+        bucket = self.buckets.get(key)
+        if bucket is None or (x, y) not in bucket:
+            return None
+        plant = bucket.pop((x, y))
+        if not bucket:
+            del self.buckets[key]  # Empty buckets cost nothing to skip
+        self.size -= 1
+        return plant
+
+    def remove_many(self, xs: np.ndarray, ys: np.ndarray) -> int:
+        """Remove the plants at many tiles, a bucket at a time
+
+        Returns how many tiles held a plant.
+        """
+        if not len(xs):
+            return 0
+        bucket_x, bucket_y = xs // self.bucket_size, ys // self.bucket_size
+        order = np.lexsort((bucket_x, bucket_y))
+        bucket_x, bucket_y = bucket_x[order], bucket_y[order]
+        starts = np.flatnonzero(np.r_[True, (bucket_x[1:] != bucket_x[:-1]) | (bucket_y[1:] != bucket_y[:-1])])
+        tiles = list(zip(xs[order].tolist(), ys[order].tolist()))
+        removed = 0
+        for start, stop in zip(starts.tolist(), np.r_[starts[1:], len(order)].tolist()):
+            key = (int(bucket_x[start]), int(bucket_y[start]))
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                continue
+            for tile in tiles[start:stop]:
+                if bucket.pop(tile, None) is not None:
+                    removed += 1
+            if not bucket:
+                del self.buckets[key]
+        self.size -= removed
+        return removed
+
+    @staticmethod
+    def _matches(plant: Plant, stage: Optional[int], harvestable: Optional[bool],
+                 mutated: Optional[bool], fertilized: Optional[bool]) -> bool:
+        """Check a plant against the query filters"""
+        if stage is not None and plant.current_stage != stage:
+            return False
+        if harvestable is not None and plant.is_harvestable() != harvestable:
+            return False
+        if mutated is not None and plant.is_mutated != mutated:
+            return False
+        if fertilized is not None and plant.fertilized != fertilized:
+            return False
+        return True
+
+    def _buckets_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[Dict]:
+        """Non-empty buckets overlapping the tiles x0 <= x < x1, y0 <= y < y1"""
+        bx0, by0 = self._bucket_key(x0, y0)
+        bx1, by1 = self._bucket_key(x1 - 1, y1 - 1)
+        if (bx1 - bx0 + 1) * (by1 - by0 + 1) > len(self.buckets):
+            # Cheaper to check every occupied bucket than every covered one
+            return [bucket for (bx, by), bucket in self.buckets.items()
+                    if bx0 <= bx <= bx1 and by0 <= by <= by1]
+        buckets = []
+        for by in range(by0, by1 + 1):
+            for bx in range(bx0, bx1 + 1):
+                bucket = self.buckets.get((bx, by))
+                if bucket is not None:
+                    buckets.append(bucket)
+        return buckets
+
+    def query_rect(self, x0: int, y0: int, x1: int, y1: int, stage: Optional[int] = None,
+                   harvestable: Optional[bool] = None, mutated: Optional[bool] = None,
+                   fertilized: Optional[bool] = None) -> List[Plant]:
+        """Plants on tiles with x0 <= x < x1 and y0 <= y < y1"""
+        if x0 >= x1 or y0 >= y1:
+            return []
+        return [plant
+                for bucket in self._buckets_in_rect(x0, y0, x1, y1)
+                for (x, y), plant in bucket.items()
+                if x0 <= x < x1 and y0 <= y < y1
+                and self._matches(plant, stage, harvestable, mutated, fertilized)]
+
+    def query_radius(self, x: int, y: int, radius: float, stage: Optional[int] = None,
+                     harvestable: Optional[bool] = None, mutated: Optional[bool] = None,
+                     fertilized: Optional[bool] = None) -> List[Plant]:
+        """Plants within a (Euclidean) tile distance of a position"""
+        reach = int(radius)
+        limit = radius * radius
+        return [plant
+                for bucket in self._buckets_in_rect(x - reach, y - reach, x + reach + 1, y + reach + 1)
+                for (px, py), plant in bucket.items()
+                if (px - x) ** 2 + (py - y) ** 2 <= limit
+                and self._matches(plant, stage, harvestable, mutated, fertilized)]
+
+    def nearest(self, x: int, y: int, k: int = 1, stage: Optional[int] = None,
+                harvestable: Optional[bool] = None, mutated: Optional[bool] = None,
+                fertilized: Optional[bool] = None) -> List[Plant]:
+        """Up to k matching plants closest to a position, nearest first
+
+        Ties are broken by row, then column.
+        """
+        if k <= 0 or not self.buckets:
+            return []
+        filters = (stage, harvestable, mutated, fertilized)
+        center_x, center_y = self._bucket_key(x, y)
+        found = []  # Max-heap of the best k: (-distance², -y, -x, plant)
+
+        def consider(bucket: Dict):
+            for (px, py), plant in bucket.items():
+                if not self._matches(plant, *filters):
+                    continue
+                entry = (-((px - x) ** 2 + (py - y) ** 2), -py, -px, plant)
+                if len(found) < k:
+                    heapq.heappush(found, entry)
+                elif entry[:3] > found[0][:3]:
+                    heapq.heapreplace(found, entry)
+
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 > len(self.buckets):
+                # The search area now covers more buckets than are occupied:
+                # finish with the occupied buckets not visited yet
+                for (bx, by), bucket in self.buckets.items():
+                    if max(abs(bx - center_x), abs(by - center_y)) >= ring:
+                        consider(bucket)
+                break
+
+            for by in range(center_y - ring, center_y + ring + 1):
+                step = 1 if by in (center_y - ring, center_y + ring) else 2 * ring
+                for bx in range(center_x - ring, center_x + ring + 1, max(1, step)):
+                    bucket = self.buckets.get((bx, by))
+                    if bucket is not None:
+                        consider(bucket)
+
+            # Tiles in the next ring are at least this far away
+            closest_next = ring * self.bucket_size + 1
+            if len(found) == k and -found[0][0] < closest_next * closest_next:
+                break
+            ring += 1
+
+        return [entry[3] for entry in sorted(found, reverse=True)]
@@ -0,0 +1,182 @@
+"""
+Fixed Timestep
+Steps the simulation at a fixed rate and interpolates what is drawn between steps
+"""
+
+import time
+from types import MappingProxyType
+from typing import List, Mapping, NamedTuple, Optional, Tuple
+import numpy as np
+from constants import *
+
+
+class FixedTimestep:
+    """Accumulator turning variable frame times into fixed simulation steps
+
+    Frame time builds up in the accumulator and is paid out in whole steps.
+    After a hitch at most max_steps run in one frame and the rest of the
+    backlog is dropped, so a stall never turns into one huge step or a
+    spiral of catch-up work. alpha is how far the accumulator is into the
+    next step, for interpolating between the last two simulated states.
+    """
+
+    def __init__(self, tick_rate: float = SIM_TICK_RATE, max_steps: int = MAX_CATCH_UP_STEPS):
+        self.accumulator = 0.0
+        self.dropped = 0.0  # Seconds of backlog discarded so far
+        self.max_steps = max_steps
+        self.set_tick_rate(tick_rate)
+
+    def set_tick_rate(self, tick_rate: float):
+        """Change how many steps run per second"""
+        self.tick_rate = tick_rate
+        self.step = 1.0 / tick_rate
+
+    def advance(self, frame_dt: float) -> int:
+        """Add a frame's time and return how many steps to run now"""
+        self.accumulator += max(0.0, frame_dt)
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            backlog = (steps - self.max_steps) * self.step
+            self.dropped += backlog
+            self.accumulator -= backlog
+            steps = self.max_steps
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step since the last one (0 to 1)"""
+        return min(1.0, self.accumulator / self.step)
+
+
+class PlantVisual(NamedTuple):
+    """How to draw one plant (its visual properties are read-only)"""
+    plant_id: int
+    x: int
+    y: int
+    props: Mapping
+
+
+class SoilChunk(NamedTuple):
+    """Read-only copy of an on-screen garden chunk's tiles"""
+    origin_x: int
+    origin_y: int
+    soil_quality: np.ndarray
+    water_levels: np.ndarray
+    fertilizer_levels: np.ndarray
+
+
+class VisualSnapshot(NamedTuple):
+    """Everything drawn from one simulated state, captured after a step
+
+    Snapshots are immutable and share nothing mutable with the live game
+    state, so they can be drawn on another thread while the simulation moves
+    on; the game screens, shop and inventory included, draw only from them.
+    Plant sizes are keyed by plant id so a reused table row is never
+    mistaken for the plant that used to live there.
+    """
+    tick: int  # Steps simulated when captured
+    time: float  # perf_counter() when captured
+    player_position: Tuple[float, float]
+    player_direction: Tuple[int, int]
+    plants: Tuple[PlantVisual, ...]
+    sizes: Mapping  # Plant id -> drawn size in tiles
+    soil: Tuple[SoilChunk, ...]
+    soil_size: Tuple[int, int]  # Visible garden width and height in tiles
+    hud: Mapping  # Values shown by the in-game UI, shop and inventory screens
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    copy = array.copy()
+    copy.flags.writeable = False
+    return copy
+
+
+def capture_snapshot(game_state, rect: Tuple[int, int, int, int], tick: int = 0) -> VisualSnapshot:
+    """Capture the visible part of a game state for drawing"""
+    player = game_state.player
+    garden = game_state.garden
+    plants = tuple(
+        PlantVisual(plant.plant_id, plant.x, plant.y, MappingProxyType(plant.get_visual_properties()))
+        for plant in garden.get_plants_in_rect(*rect)
+    )
+
+    # Copy only the allocated chunks overlapping the rect
+    x0, y0, x1, y1 = rect
+    width, height = min(garden.width, x1), min(garden.height, y1)
+    chunk_keys = [(chunk_x, chunk_y)
+                  for chunk_y in range(max(0, y0) // CHUNK_SIZE, -(-height // CHUNK_SIZE))
+                  for chunk_x in range(max(0, x0) // CHUNK_SIZE, -(-width // CHUNK_SIZE))]
+    soil = tuple(
+        SoilChunk(chunk.origin_x, chunk.origin_y, _read_only(chunk.soil_quality),
+                  _read_only(chunk.water_levels), _read_only(chunk.fertilizer_levels))
+        for chunk in (garden.chunks.get(key) for key in chunk_keys) if chunk is not None
+    )
+
+    counts = garden.get_care_counts()  # Live row sets; lazy plants only sync once past an event
+    shop = game_state.shop
+    hud = {
+        "money": game_state.economy.money,
+        "day": game_state.day,
+        "weather": game_state.weather,
+        "seed": player.get_selected_seed(),
+        "tool": player.get_selected_tool(),
+        "harvestable": counts["harvestable"],
+        "thirsty": counts["thirsty"],
+        "inventory": MappingProxyType(player.get_inventory_summary()),
+        # (category, items) the shop offers; its item records are read-only and
+        # replaced rather than changed, so they can be shared
+        "shop": tuple((category, shop.get_available_items(category)) for category in shop.get_all_categories())
+    }
+    return VisualSnapshot(tick, time.perf_counter(), (player.x, player.y), (player.dx, player.dy), plants,
+                          MappingProxyType({visual.plant_id: visual.props["size"] for visual in plants}),
+                          soil, (width, height), MappingProxyType(hud))
+
+
+def lerp(start: float, end: float, alpha: float) -> float:
+    """Linear interpolation from start (alpha 0) to end (alpha 1)"""
+    return start + (end - start) * alpha
+
+
+class Interpolator:
+    """Double buffer of the last two snapshots, blended for drawing between steps
+
+    Publishing replaces the (previous, latest) pair in one assignment, so a
+    render thread can read a consistent pair while the simulation thread
+    publishes, without taking a lock.
+    """
+
+    def __init__(self, rect: Tuple[int, int, int, int]):
+        self.rect = rect  # Tile area to capture
+        self.tick = 0
+        self.snapshots = (None, None)
+
+    def capture(self, game_state, steps: int = 1):
+        """Record the state after the steps run since the last capture"""
+        self.tick += steps
+        self.snapshots = (self.snapshots[1], capture_snapshot(game_state, self.rect, self.tick))
+
+    def refresh(self, game_state):
+        """Recapture the latest state after a change made between steps"""
+        self.snapshots = (self.snapshots[0], capture_snapshot(game_state, self.rect, self.tick))
+
+    def read(self) -> Tuple[Optional[VisualSnapshot], VisualSnapshot]:
+        """The (previous, latest) snapshots, read together"""
+        return self.snapshots
+
+    def player_position(self, alpha: float, snapshots=None) -> Tuple[float, float]:
+        """Player position alpha of the way from the previous to the latest step"""
+        previous, current = snapshots or self.snapshots
+        (x1, y1) = current.player_position
+        (x0, y0) = previous.player_position if previous else (x1, y1)
+        return lerp(x0, x1, alpha), lerp(y0, y1, alpha)
+
+    def plants(self, alpha: float, snapshots=None) -> List[Tuple[PlantVisual, float]]:
+        """Plants of the latest step with their interpolated sizes"""
+        previous, current = snapshots or self.snapshots
+        previous_sizes = previous.sizes if previous else {}
+        drawn = []
+        for visual in current.plants:
+            size = current.sizes[visual.plant_id]
+            drawn.append((visual, lerp(previous_sizes.get(visual.plant_id, size), size, alpha)))
+        return drawn
@@ -22,8 +22,8 @@ def main():
     # Initialize game state
     game_state = GameState()
     
-    # Create game loop
-    game_loop = GameLoop(screen, game_state, clock)
+    # Create game loop (--threaded simulates on a separate thread)
+    game_loop = GameLoop(screen, game_state, clock, threaded="--threaded" in sys.argv)
     
     try:
         # Run the game
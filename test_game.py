@@ -154,6 +154,1298 @@ def test_economy():
         print(f"✗ Economy test failed: {e}")
         return False
 
+def test_vectorized_garden_update():
+    """Test that the column-based garden update matches per-plant updates"""
+    print("\nTesting vectorized garden update...")
+    
+    try:
+        import constants
+        from garden import Garden
+        from rng import RandomStreams
+        
+        positions = [(8, 8, "carrot"), (9, 8, "tomato"), (8, 9, "corn"), (9, 9, "carrot")]
+        
+        gardens = []
+        for _ in range(2):
+            garden = Garden(growth_mode=constants.GROWTH_MODE_VECTORIZED, rng=RandomStreams(42))
+            for x, y, seed_type in positions:
+                garden.plant_seed(x, y, seed_type)
+            garden.water_plant(8, 8)
+            garden.fertilize_plant(9, 8)
+            gardens.append(garden)
+        
+        garden, stepped = gardens
+        plants = list(stepped.plants.values())
+        for _ in range(600):
+            garden.update(0.05)
+            for plant in plants:
+                plant.update(0.05)
+        
+        for plant in plants:
+            garden_plant = garden.get_plant(plant.x, plant.y)
+            assert garden_plant.current_stage == plant.current_stage
+            assert abs(garden_plant.growth_progress - plant.growth_progress) < 1e-9
+            assert garden_plant.water_level == plant.water_level
+            assert garden_plant.get_value() == plant.get_value()
+        print(f"✓ {len(plants)} plants match per-plant updates after 30s")
+        
+        # Removed plants stay readable after their row is reused
+        removed = garden.get_plant(8, 8)
+        stage = removed.current_stage
+        garden.remove_plant(8, 8)
+        garden.plant_seed(8, 8, "corn")
+        assert removed.current_stage == stage and removed.plant_type == "carrot"
+        print("✓ Removed plant keeps its state")
+        
+        print("\nVectorized garden update tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Vectorized garden update test failed: {e}")
+        return False
+
+def test_scheduled_garden_update():
+    """Test that the event scheduler matches frame-by-frame updates"""
+    print("\nTesting scheduled garden update...")
+    
+    try:
+        import constants
+        from garden import Garden
+        from rng import RandomStreams
+        
+        gardens = [Garden(growth_mode=constants.GROWTH_MODE_VECTORIZED, rng=RandomStreams(3)),
+                   Garden(growth_mode=constants.GROWTH_MODE_SCHEDULED, rng=RandomStreams(3))]
+        for garden in gardens:
+            for x, seed_type in enumerate(["carrot", "tomato", "corn"]):
+                garden.plant_seed(5 + x, 5, seed_type)
+                garden.water_plant(5 + x, 5)
+                garden.water_plant(5 + x, 5)
+            garden.fertilize_plant(6, 5)
+        
+        vectorized, scheduled = gardens
+        for _ in range(3700):
+            vectorized.update(0.01)
+        scheduled.update(37.0)
+        
+        for position, plant in vectorized.plants.items():
+            other = scheduled.plants[position]
+            assert plant.current_stage == other.current_stage
+            assert plant.water_level == other.water_level
+            assert abs(plant.growth_progress - other.growth_progress) < 0.02
+        print("✓ One 37s scheduler step matches 3700 vectorized frames")
+        
+        # Care changes reschedule the plant
+        plant = scheduled.get_plant(5, 5)
+        plant.water()
+        assert plant.water_level == 1
+        scheduled.update(constants.WATER_DECAY_INTERVAL)
+        assert plant.water_level == 0
+        print(f"✓ Scheduler holds {len(scheduled.scheduler)} pending events")
+        
+        print("\nScheduled garden update tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Scheduled garden update test failed: {e}")
+        return False
+
+def test_lazy_garden_update():
+    """Test that lazily evaluated plants catch up correctly when observed"""
+    print("\nTesting lazy garden update...")
+    
+    try:
+        import constants
+        from garden import Garden
+        from rng import RandomStreams
+        
+        modes = [constants.GROWTH_MODE_VECTORIZED, constants.GROWTH_MODE_SCHEDULED,
+                 constants.GROWTH_MODE_LAZY]
+        gardens = []
+        for mode in modes:
+            garden = Garden(growth_mode=mode, rng=RandomStreams(7))
+            for x, seed_type in enumerate(["carrot", "tomato", "corn", "carrot"]):
+                garden.plant_seed(5 + x, 6, seed_type)
+                for _ in range(x):
+                    garden.water_plant(5 + x, 6)
+            garden.fertilize_plant(7, 6)
+            gardens.append(garden)
+        
+        vectorized, scheduled, lazy = gardens
+        for _ in range(2300):
+            vectorized.update(0.01)
+            lazy.update(0.01)
+        scheduled.update(23.0)
+        
+        table = lazy.plant_table
+        assert (table.synced_at[:table.size] == 0.0).all()
+        print("✓ Unobserved plants were not evaluated")
+        
+        for position, plant in lazy.plants.items():
+            for other in (vectorized.plants[position], scheduled.plants[position]):
+                assert plant.current_stage == other.current_stage
+                assert plant.water_level == other.water_level
+            assert abs(plant.growth_progress - scheduled.plants[position].growth_progress) < 1e-9
+        print("✓ Catch-up matches frame-by-frame and scheduled updates")
+        
+        lazy.plant_seed(2, 2, "corn")
+        vectorized.plant_seed(2, 2, "corn")
+        for _ in range(10):
+            vectorized.update(0.01)
+            lazy.update(0.01)
+        assert lazy.get_care_counts() == vectorized.get_care_counts()
+        assert table.synced_at[lazy.plants[(2, 2)]._row] < table.time
+        print("✓ Care counts only evaluate plants that passed an event")
+        
+        print("\nLazy garden update tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Lazy garden update test failed: {e}")
+        return False
+
+def test_random_streams():
+    """Test that seeded random streams are reproducible and order independent"""
+    print("\nTesting random streams...")
+    
+    try:
+        import numpy as np
+        from rng import RandomStreams
+        from game_state import GameState
+        
+        stream = RandomStreams(123).stream("mutations")
+        ids = np.arange(1000)
+        stages = np.full(1000, 3)
+        batch = stream.random_array(ids, stages)
+        single = [stream.random_at(plant_id, 3) for plant_id in reversed(range(1000))]
+        assert np.array_equal(batch, np.array(single[::-1]))
+        assert 0.45 < batch.mean() < 0.55
+        print("✓ Vectorized rolls match single rolls in any order")
+        
+        assert RandomStreams(123).stream("weather").random() != stream.random()
+        print("✓ Subsystem streams are independent")
+        
+        results = []
+        for _ in range(2):
+            game_state = GameState(seed=99)
+            for x in range(7, 12):
+                game_state.garden.plant_seed(x, 7, "carrot")
+            for _ in range(400):
+                game_state.update(1.0)
+            results.append((
+                [plant.current_stage for plant in game_state.garden.plants.values()],
+                [plant.is_mutated for plant in game_state.garden.plants.values()],
+                game_state.weather,
+                dict(game_state.economy.current_prices)
+            ))
+        assert results[0] == results[1]
+        print("✓ Seeded games are reproducible")
+        
+        print("\nRandom stream tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Random stream test failed: {e}")
+        return False
+
+def test_plant_specs():
+    """Test shared species specs and the slotted plant layout"""
+    print("\nTesting plant specs...")
+    
+    try:
+        import gc
+        from constants import PURPLE
+        from plant import Plant, get_plant_spec, LOOSE_PLANTS
+        
+        carrots = [Plant("carrot", x, 0) for x in range(3)]
+        assert all(plant.spec is carrots[0].spec for plant in carrots)
+        assert not hasattr(carrots[0], "__dict__")
+        assert carrots[0].name == "Carrot" and carrots[0].water_need == 2
+        print("✓ Plants share one immutable spec and have no __dict__")
+        
+        assert get_plant_spec("strawberry").name == "Strawberry"
+        try:
+            Plant("cactus", 0, 0)
+            assert False, "unknown species should be rejected"
+        except KeyError:
+            pass
+        print("✓ Every catalog species has a spec; unknown species are rejected")
+        
+        plant = Plant("tomato", 0, 0)
+        assert plant.mutations == () and plant.color_variants == ()
+        plant._apply_mutation("rare_color")
+        assert plant.mutations == ("rare_color",) and plant.get_visual_properties()["color"] == PURPLE
+        print("✓ Mutation storage is empty until a mutation happens")
+        
+        gc.collect()  # Don't count plants from earlier tests that are only waiting for the collector
+        in_use = len(LOOSE_PLANTS)
+        del carrots, plant
+        assert len(LOOSE_PLANTS) == in_use - 4
+        print("✓ Standalone plants free their rows when discarded")
+        
+        print("\nPlant spec tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Plant spec test failed: {e}")
+        return False
+
+def test_growth_rate_cache():
+    """Test that cached growth rates follow care state changes"""
+    print("\nTesting growth rate cache...")
+    
+    try:
+        from constants import GROWTH_STAGES, WATERING_BONUS, FERTILIZER_BONUS, WATER_DECAY_INTERVAL
+        from plant import Plant
+        
+        plant = Plant("tomato", 0, 0)
+        base_rate = 1.0 / plant.base_growth_time
+        assert abs(plant.growth_rate - base_rate * 0.5) < 1e-12
+        
+        plant.water()
+        assert abs(plant.growth_rate - base_rate) < 1e-12
+        plant.fertilize()
+        plant.water()
+        plant.water()
+        expected = base_rate * (1.0 + WATERING_BONUS) * (1.0 + FERTILIZER_BONUS)
+        assert abs(plant.growth_rate - expected) < 1e-12
+        print("✓ Watering and fertilizing refresh the cached rate")
+        
+        plant.update(WATER_DECAY_INTERVAL)
+        assert plant.water_level == 2
+        assert abs(plant.growth_rate - base_rate * (1.0 + FERTILIZER_BONUS)) < 1e-12
+        print("✓ Water decay refreshes the cached rate")
+        
+        plant.current_stage = len(GROWTH_STAGES) - 1
+        assert plant.growth_rate == 0.0
+        print("✓ Fully grown plants stop growing")
+        
+        print("\nGrowth rate cache tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Growth rate cache test failed: {e}")
+        return False
+
+def test_large_step_integration():
+    """Test that large time steps integrate exactly and time warp works"""
+    print("\nTesting large step integration...")
+    
+    try:
+        import constants
+        from garden import Garden
+        from game_state import GameState
+        from rng import RandomStreams
+        
+        gardens = []
+        for _ in range(2):
+            garden = Garden(growth_mode=constants.GROWTH_MODE_VECTORIZED, rng=RandomStreams(11))
+            for x in range(4, 16):
+                garden.plant_seed(x, 7, ["carrot", "tomato", "corn"][x % 3])
+                for _ in range(x % 5):
+                    garden.water_plant(x, 7)
+            gardens.append(garden)
+        
+        stepped, warped = gardens
+        for _ in range(2500):
+            stepped.update(0.016)
+        warped.update(40.0)
+        for position, plant in stepped.plants.items():
+            other = warped.plants[position]
+            assert plant.current_stage == other.current_stage
+            assert plant.water_level == other.water_level
+            assert plant.is_mutated == other.is_mutated
+            assert abs(plant.growth_progress - other.growth_progress) < 1e-6
+        print("✓ One 40s step matches 2500 frames, crossing several stages")
+        
+        plant = stepped.get_plant(9, 7)
+        assert plant.current_stage == len(constants.GROWTH_STAGES) - 1
+        print(f"✓ {plant.name} reached {plant.get_current_stage()}")
+        
+        game_state = GameState(seed=1)
+        game_state.set_time_warp(100.0)
+        game_state.update(3.5)
+        assert game_state.day == 2
+        assert abs(game_state.game_time - 50.0) < 1e-9
+        print(f"✓ Time warp x100 advanced to day {game_state.day}")
+        
+        print("\nLarge step integration tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Large step integration test failed: {e}")
+        return False
+
+def test_headless_simulation():
+    """Test fast-forwarding the whole game without pygame"""
+    print("\nTesting headless simulation...")
+    
+    try:
+        from game_state import GameState
+        
+        results = []
+        for step in (None, 1.0):
+            game_state = GameState(seed=5)
+            for x in range(8, 12):
+                game_state.garden.plant_seed(x, 8, "carrot")
+            game_state.economy.trigger_market_boom()
+            updates = game_state.simulate(3 * 300.0 + 45.0, step=step)
+            results.append((
+                game_state.day,
+                round(game_state.game_time, 6),
+                game_state.weather,
+                game_state.economy.market_boom,
+                dict(game_state.economy.current_prices),
+                [plant.current_stage for plant in game_state.garden.plants.values()]
+            ))
+            print(f"✓ Simulated 945s in {updates} updates (step={step})")
+        
+        assert results[0] == results[1]
+        assert results[0][0] == 4
+        print("✓ Event jumping matches fixed steps")
+        
+        for seconds, step in ((10.0, -1.0), (10.0, 0.0), (-1.0, None)):
+            try:
+                game_state.simulate(seconds, step=step)
+                assert False, f"simulate({seconds}, step={step}) should fail"
+            except ValueError:
+                pass
+        assert game_state.simulate(0.0) == 0
+        print("✓ Negative durations and non-positive steps are rejected")
+        
+        print("\nHeadless simulation tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Headless simulation test failed: {e}")
+        return False
+
+def test_batch_runner():
+    """Test the parameter sweep runner and its results cache"""
+    print("\nTesting batch runner...")
+    
+    try:
+        import tempfile
+        import numpy as np
+        import plant
+        from batch import apply_parameters, run_batch, run_game, load_results
+        
+        default_rate = plant.GROWTH_RATE_TABLE[0, 2, 0]
+        apply_parameters({"WATERING_BONUS": 1.0, "PLANT_TYPES.carrot.growth_time": 5.0})
+        assert abs(plant.GROWTH_RATE_TABLE[0, 2, 0] - 2.0 / 5.0) < 1e-12
+        apply_parameters({})
+        assert plant.GROWTH_RATE_TABLE[0, 2, 0] == default_rate
+        print("✓ Parameters override constants and restore defaults")
+        
+        slow, fast = (run_game({"WATERING_BONUS": bonus}, 1, 120.0, 10.0) for bonus in (0.3, 0.7))
+        apply_parameters({})
+        assert fast["harvests"] > slow["harvests"] and fast["final_money"] > slow["final_money"]
+        print(f"✓ WATERING_BONUS changes the outcome ({slow['harvests']} vs {fast['harvests']} harvests)")
+        
+        with tempfile.TemporaryDirectory() as output:
+            grid = {"WATERING_BONUS": [0.3, 0.7], "MARKET_VOLATILITY": [0.2]}
+            played = run_batch(grid, range(2), 60.0, 10.0, output, workers=0)
+            assert played == 4
+            assert run_batch(grid, range(2), 60.0, 10.0, output, workers=0) == 0
+            print("✓ Evaluated parameter points are skipped")
+            
+            results = load_results(output)
+            assert results["money"].shape == (4, 7)
+            assert sorted(results["param:WATERING_BONUS"]) == [0.3, 0.3, 0.7, 0.7]
+            assert list(results["point"]) == [0, 0, 1, 1]
+            assert np.all(results["money"][:, 0] == 100)
+            assert plant.GROWTH_RATE_TABLE[0, 2, 0] == default_rate
+            print(f"✓ Stored columns: {', '.join(sorted(results))}")
+        
+        print("\nBatch runner tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Batch runner test failed: {e}")
+        return False
+
+def test_garden_grids():
+    """Test the chunked soil, water and fertilizer grids"""
+    print("\nTesting garden grids...")
+    
+    try:
+        from constants import GRID_WIDTH, GRID_HEIGHT, CHUNK_SIZE
+        from garden import Garden
+        
+        garden = Garden()
+        assert garden.plantable_tiles == GRID_WIDTH * GRID_HEIGHT
+        assert garden.get_plantable_positions()[:2] == [(0, 0), (1, 0)]
+        assert len(garden.chunks) == 1
+        print("✓ Default garden fits in one chunk")
+        
+        garden = Garden(width=100000, height=100000)
+        assert garden.plantable_tiles == GRID_WIDTH * GRID_HEIGHT
+        assert len(garden.get_plantable_positions()) == garden.plantable_tiles
+        assert len(garden.chunks) <= 4
+        assert not garden.plant_seed(0, 0, "carrot")  # Barren, unallocated tile
+        print(f"✓ 100000x100000 map allocates {len(garden.chunks)} chunks")
+        
+        x0, y0, x1, y1 = garden.unlocked
+        assert garden.plant_seed(x0, y0, "carrot")
+        assert garden.active_chunks == {(x0 // CHUNK_SIZE, y0 // CHUNK_SIZE)}
+        assert garden.get_water_level(50000, 50000) == 2 and garden.get_water_level(x0, y0) == 0
+        assert garden.get_plant(x0, y0).water_level == 0
+        garden.apply_rain_effect()
+        assert garden.get_plant(x0, y0).water_level == 1
+        for _ in range(2):
+            garden.apply_rain_effect()
+        assert garden.get_water_level(50000, 50000) == 5 and garden.get_water_level(x0, y0) == 5
+        assert garden.get_plant(x0, y0).water_level == garden.get_plant(x0, y0).max_water_level
+        garden.remove_plant(x0, y0)
+        assert not garden.active_chunks
+        print("✓ Rain and active chunk tracking")
+        
+        assert garden.expand()
+        assert garden.plantable_tiles == (GRID_WIDTH + 4) * (GRID_HEIGHT + 4)
+        assert garden.get_soil_quality(x0 - 1, y0 - 1) == 0.8
+        assert garden.get_garden_summary()["plantable_tiles"] == len(garden.get_plantable_positions())
+        print("✓ Expansion unlocks a ring of new tiles and keeps the plantable count")
+        
+        print("\nGarden grid tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Garden grid test failed: {e}")
+        return False
+
+def test_spatial_index():
+    """Test region and nearest-plant queries against a full scan"""
+    print("\nTesting spatial index...")
+    
+    try:
+        import random
+        from garden import Garden
+        
+        garden = Garden(width=1000, height=1000)
+        for _ in range(4):
+            garden.expand()
+        x0, y0, x1, y1 = garden.unlocked
+        rand = random.Random(3)
+        positions = rand.sample([(x, y) for y in range(y0, y1) for x in range(x0, x1)], 150)
+        for x, y in positions:
+            garden.plant_seed(x, y, "carrot")
+        for x, y in positions[:20]:
+            garden.get_plant(x, y).current_stage = 4
+        for x, y in positions[20:30]:
+            garden.remove_plant(x, y)
+        plants = list(garden.plants.values())
+        assert len(garden.spatial_index) == len(plants) == 140
+        
+        def positions_of(found):
+            return sorted((plant.x, plant.y) for plant in found)
+        
+        rect = (x0 + 3, y0 + 2, x0 + 15, y0 + 11)
+        expected = [p for p in plants if rect[0] <= p.x < rect[2] and rect[1] <= p.y < rect[3]]
+        assert positions_of(garden.get_plants_in_rect(*rect)) == positions_of(expected)
+        print(f"✓ Rectangle query found {len(expected)} plants")
+        
+        cx, cy = (x0 + x1) // 2, (y0 + y1) // 2
+        expected = [p for p in plants if (p.x - cx) ** 2 + (p.y - cy) ** 2 <= 36 and p.is_harvestable()]
+        found = garden.get_plants_in_radius(cx, cy, 6, harvestable=True)
+        assert positions_of(found) == positions_of(expected)
+        print(f"✓ Radius query found {len(expected)} harvestable plants")
+        
+        for px, py in ((cx, cy), (0, 0), (999, 5)):
+            ranked = sorted(plants, key=lambda p: ((p.x - px) ** 2 + (p.y - py) ** 2, p.y, p.x))
+            assert garden.get_nearest_plants(px, py, 5) == ranked[:5]
+            ripe = [p for p in ranked if p.current_stage == 4]
+            assert garden.get_nearest_plants(px, py, 3, stage=4) == ripe[:3]
+        assert len(garden.get_nearest_plants(cx, cy, 500)) == 140
+        print("✓ Nearest queries match a full scan")
+        
+        print("\nSpatial index tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Spatial index test failed: {e}")
+        return False
+
+def test_state_indexes():
+    """Test the live stage and care state sets against a full scan"""
+    print("\nTesting plant state indexes...")
+    
+    try:
+        from constants import GROWTH_MODE_VECTORIZED, GROWTH_MODE_SCHEDULED, GROWTH_MODE_LAZY
+        from garden import Garden
+        from rng import RandomStreams
+        
+        for mode in (GROWTH_MODE_VECTORIZED, GROWTH_MODE_SCHEDULED, GROWTH_MODE_LAZY):
+            garden = Garden(growth_mode=mode, rng=RandomStreams(11))
+            for i in range(60):
+                garden.plant_seed(i % 20, i // 20, ("carrot", "tomato", "corn")[i % 3])
+            for i in range(0, 60, 4):
+                garden.water_plant(i % 20, i // 20)
+                garden.water_plant(i % 20, i // 20)
+            for i in range(0, 60, 5):
+                garden.fertilize_plant(i % 20, i // 20)
+            for t in range(12):
+                garden.update(3.7)
+                if t == 6:
+                    garden.remove_plant(0, 0)
+                    garden.remove_plant(5, 1)
+            
+            plants = sorted(garden.plants.values(), key=lambda p: (p.y, p.x))
+            def keys(found):
+                return sorted((p.y, p.x) for p in found)
+            assert keys(garden.get_harvestable_plants()) == keys(p for p in plants if p.is_harvestable())
+            assert keys(garden.get_thirsty_plants()) == keys(p for p in plants if p.water_level < p.max_water_level)
+            assert keys(garden.get_unfertilized_plants()) == keys(p for p in plants if not p.fertilized)
+            for stage in range(5):
+                assert keys(garden.get_plants_at_stage(stage)) == keys(p for p in plants if p.current_stage == stage)
+            counts = garden.get_care_counts()
+            assert sum(counts["stages"].values()) == len(plants) == 58
+            print(f"✓ {mode}: {counts['harvestable']} ready, {counts['thirsty']} thirsty, "
+                  f"{counts['unfertilized']} unfertilized")
+        
+        print("\nPlant state index tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Plant state index test failed: {e}")
+        return False
+
+def test_bulk_operations():
+    """Test that bulk garden actions match one-tile actions"""
+    print("\nTesting bulk operations...")
+    
+    try:
+        import numpy as np
+        from constants import GROWTH_MODE_VECTORIZED, GROWTH_MODE_SCHEDULED
+        from game_state import GameState
+        
+        def play(mode, bulk):
+            game_state = GameState(seed=21)
+            game_state.garden = type(game_state.garden)(growth_mode=mode, rng=game_state.rng)
+            for i in range(80):
+                game_state.garden.plant_seed(i % 20, i // 20, ("carrot", "tomato")[i % 2])
+            reports = []
+            for turn in range(10):
+                targets = [(x, y) for x in range(0, 20, 2) for y in range(4)] + [(19, 14), (-1, 3)]
+                if bulk:
+                    reports.append(game_state.water_plants(targets))
+                    mask = np.zeros((2, 20), dtype=bool)
+                    mask[:, turn:] = True
+                    reports.append(game_state.fertilize_plants(mask=mask, origin=(0, 1)))
+                    reports.append(game_state.harvest_plants(region=(0, 0, 20, 4)))
+                else:
+                    for x, y in targets:
+                        game_state.water_plant(x, y)
+                    for y in (1, 2):
+                        for x in range(turn, 20):
+                            game_state.garden.fertilize_plant(x, y)
+                    for x, y in list(game_state.garden.plants):
+                        game_state.harvest_plant(x, y)
+                game_state.simulate(7.3)
+            state = sorted((pos, p.current_stage, p.water_level, p.fertilized, p.growth_progress)
+                           for pos, p in game_state.garden.plants.items())
+            return (game_state.economy.money, game_state.plants_harvested, state), reports
+        
+        for mode in (GROWTH_MODE_VECTORIZED, GROWTH_MODE_SCHEDULED):
+            single, _ = play(mode, False)
+            bulk, reports = play(mode, True)
+            assert single == bulk
+            print(f"✓ {mode}: bulk actions match single actions ({bulk[1]} harvested)")
+        
+        assert reports[0] == {"targeted": 40, "applied": 40, "missing": 2}
+        assert reports[1]["applied"] == 40
+        assert any(report.get("harvested") for report in reports)
+        print(f"✓ Reports: {reports[0]}")
+        
+        # Bulk removal keeps every index in step and detaches the removed plants
+        from garden import Garden
+        from plant import LOOSE_PLANTS
+        garden = Garden()
+        for y in range(15):
+            for x in range(20):
+                garden.plant_seed(x, y, "carrot")
+        garden.water_plants()
+        held = garden.get_plant(3, 3)
+        removed = garden.get_plants_in_rect(0, 0, 10, 15)
+        assert garden.remove_plants(removed + [held]) == 150  # Repeats are removed once
+        assert len(garden.plants) == len(garden.plant_positions) == len(garden.spatial_index) == 150
+        assert len(garden.plant_table) == 150 and garden.chunks[(0, 0)].plant_count == 150
+        assert sorted(garden.plant_positions[slot] for slot in range(150)) == sorted(garden.plants)
+        assert len(garden.get_plants_in_rect(0, 0, 20, 15)) == 150 and garden.get_soil_quality(3, 3) == 1.1
+        assert all(plant._table is LOOSE_PLANTS for plant in removed)
+        assert held.water_level == 1 and garden.plant_seed(3, 3, "tomato") and held.plant_type == "carrot"
+        del removed
+        
+        # A plant that isn't in the garden fails before anything is removed
+        try:
+            garden.remove_plants([garden.get_plant(12, 0), held])
+            assert False, "removing a plant that isn't in the garden should fail"
+        except ValueError:
+            pass
+        assert len(garden.plants) == 151 and garden.get_plant(12, 0) is not None
+        print("✓ Bulk removal frees rows together and detaches the removed plants")
+        
+        print("\nBulk operation tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Bulk operation test failed: {e}")
+        return False
+
+def test_pest_contagion():
+    """Test random pest picks and the contagion spread"""
+    print("\nTesting pest contagion...")
+    
+    try:
+        from garden import Garden
+        from rng import RandomStreams
+        from constants import PEST_DURATION, PEST_INITIAL_PLANTS
+        
+        outcomes = []
+        for step in (None, 1.0, 7.0):
+            garden = Garden(rng=RandomStreams(8))
+            for y in range(15):
+                for x in range(20):
+                    garden.plant_seed(x, y, "carrot")
+            garden.remove_plant(4, 4)
+            garden.trigger_pest_infestation()
+            assert len(garden.plants) == 299 - PEST_INITIAL_PLANTS
+            
+            while garden.pest_infestation:
+                garden.update(step or garden.time_to_next_event())
+            assert len(garden.plant_positions) == len(garden.plants)
+            assert all(garden.plant_positions[i] in garden.plants for i in range(len(garden.plants)))
+            outcomes.append(sorted(garden.plants))
+        
+        assert outcomes[0] == outcomes[1] == outcomes[2]
+        assert len(outcomes[0]) < 299 - PEST_INITIAL_PLANTS
+        print(f"✓ Pests spread to {299 - PEST_INITIAL_PLANTS - len(outcomes[0])} more plants, "
+              f"independent of step size")
+        
+        print("\nPest contagion tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Pest contagion test failed: {e}")
+        return False
+
+def test_sharded_simulation():
+    """Test that worker-process shards match the single-process update"""
+    print("\nTesting sharded simulation...")
+    
+    try:
+        import numpy as np
+        from constants import GROWTH_MODE_VECTORIZED, GROWTH_MODE_SHARDED
+        from garden import Garden
+        from plant import PlantTable
+        from rng import RandomStreams
+        
+        def play(mode):
+            garden = Garden(growth_mode=mode, rng=RandomStreams(4), shard_workers=2, shard_min_rows=0)
+            positions = garden.get_plantable_positions()
+            for i, (x, y) in enumerate(positions[:50]):
+                garden.plant_seed(x, y, ("carrot", "tomato", "corn")[i % 3])
+            for step in range(30):
+                garden.update(1.7)
+                if step == 5:
+                    garden.water_plants()
+                    # Growing the table moves it to a new shared block
+                    for i, (x, y) in enumerate(positions[50:200]):
+                        garden.plant_seed(x, y, ("carrot", "corn")[i % 2])
+                if step == 12:
+                    garden.fertilize_plants(region=(0, 0, 10, 15))
+            table = garden.plant_table
+            columns = {name: getattr(table, name)[:table.size].copy() for name in PlantTable.COLUMNS}
+            mutations = {position: plant.mutations for position, plant in garden.plants.items()}
+            counts = garden.get_care_counts()
+            assert garden.shards is None or garden.shards.executor is not None
+            garden.close()
+            return columns, mutations, counts
+        
+        single = play(GROWTH_MODE_VECTORIZED)
+        sharded = play(GROWTH_MODE_SHARDED)
+        for name in PlantTable.COLUMNS:
+            assert np.array_equal(single[0][name], sharded[0][name]), name
+        assert single[1] == sharded[1] and single[2] == sharded[2]
+        print(f"✓ 2 shards match one process ({sharded[2]['harvestable']} ready, "
+              f"{sum(1 for m in sharded[1].values() if m)} mutated)")
+        
+        # Small tables stay in this process and no workers are started
+        from game_state import GameState
+        with GameState(seed=4) as game_state:
+            game_state.garden = Garden(growth_mode=GROWTH_MODE_SHARDED, shard_workers=2)
+            assert game_state.garden.plant_seed(0, 0, "carrot")
+            game_state.update(30.0)
+            assert game_state.garden.get_plant(0, 0).current_stage > 0
+            assert not game_state.garden.shards.sharding() and game_state.garden.shards.executor is None
+        assert game_state.garden.shards is None
+        print("✓ Small gardens grow in-process; closing the game releases the pool")
+        
+        print("\nSharded simulation tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Sharded simulation test failed: {e}")
+        return False
+
+def test_price_history():
+    """Test the ring-buffer price history statistics"""
+    print("\nTesting price history...")
+    
+    try:
+        import random
+        import numpy as np
+        from economy import Economy, PriceHistory
+        from rng import RandomStreams
+        
+        history = PriceHistory(capacity=10, ema_alpha=0.5)
+        rand = random.Random(2)
+        prices = []
+        ema = None
+        for _ in range(57):
+            price = rand.randint(5, 60)
+            prices.append(price)
+            history.append(price)
+            ema = price if ema is None else ema + 0.5 * (price - ema)
+            held = prices[-10:]
+            assert list(history.values()) == held
+            assert history.minimum() == min(held) and history.maximum() == max(held)
+            for window in (1, 3, 10):
+                assert abs(history.mean(window) - np.mean(held[-window:])) < 1e-9
+                assert abs(history.variance(window) - np.var(held[-window:])) < 1e-9
+            assert abs(history.ema - ema) < 1e-9
+        print("✓ Rolling mean, variance, min/max and EMA match a full recount")
+        
+        economy = Economy(rng=RandomStreams(9))
+        for _ in range(40):
+            economy.update_market_prices()
+        stats = economy.get_price_statistics("corn", window=7)
+        assert stats["samples"] == 7 and stats["min"] <= stats["mean"] <= stats["max"]
+        assert economy.get_price_trend("corn") in ("rising", "falling", "stable")
+        assert economy.get_best_investment() in economy.base_prices
+        print(f"✓ Corn over 7 days: mean {stats['mean']:.1f}, std {stats['std']:.1f}, "
+              f"trend {economy.get_price_trend('corn')}")
+        
+        print("\nPrice history tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Price history test failed: {e}")
+        return False
+
+def test_batch_valuation():
+    """Test vectorized valuation against the per-plant formula"""
+    print("\nTesting batch valuation...")
+    
+    try:
+        from constants import GROWTH_MODE_LAZY
+        from game_state import GameState
+        from garden import Garden
+        
+        game_state = GameState(seed=12)
+        garden = game_state.garden
+        for i in range(120):
+            garden.plant_seed(i % 20, i // 20, ("carrot", "tomato", "corn")[i % 3])
+        game_state.water_plants(region=(0, 0, 10, 6))
+        game_state.fertilize_plants(region=(5, 0, 15, 6))
+        game_state.simulate(23.0)
+        game_state.water_plants(region=(0, 0, 4, 6))
+        
+        economy = game_state.economy
+        for event in (None, economy.trigger_market_boom, economy.trigger_market_crash):
+            if event:
+                economy.market_boom = False
+                event()
+            plants = list(garden.plants.values())
+            rows = [plant._row for plant in plants]
+            values = economy.calculate_values(garden.plant_table, rows)
+            assert list(values) == [economy.calculate_plant_value(plant) for plant in plants]
+            print(f"✓ {len(plants)} plants valued in one pass: {int(values.sum())} coins")
+        assert game_state.get_garden_value() == sum(economy.calculate_plant_value(p) for p in plants)
+        
+        lazy = Garden(growth_mode=GROWTH_MODE_LAZY)
+        lazy.plant_seed(3, 3, "carrot")
+        lazy.update(30.0)
+        assert list(economy.calculate_values(lazy.plant_table)) == [economy.calculate_plant_value(lazy.get_plant(3, 3))]
+        print("✓ Lazy plants catch up before valuation")
+        
+        print("\nBatch valuation tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Batch valuation test failed: {e}")
+        return False
+
+def test_achievements():
+    """Test cursor-based milestone and achievement tracking"""
+    print("\nTesting achievements...")
+    
+    try:
+        from achievements import AchievementTracker
+        from game_state import GameState
+        
+        tracker = AchievementTracker({"score": {30: "c", 10: "a", 20: "b"}})
+        assert tracker.report("score", 5) == []
+        assert [name for _, _, name in tracker.report("score", 25)] == ["a", "b"]
+        assert tracker.report("score", 26) == []
+        assert tracker.next_achievement("score") == (30, "c")
+        tracker.add("score", 15, "late")  # Already passed, so unlocked at once
+        assert [name for _, _, name in tracker.collect()] == ["a", "b", "late"]
+        assert tracker.collect() == []
+        print("✓ Crossing thresholds unlocks each achievement once, in order")
+        
+        # Thousands of achievements cost one comparison per idle report
+        many = AchievementTracker({"score": {i: f"score {i}" for i in range(1, 5001)}})
+        assert len(many.report("score", 4999)) == 4999
+        assert many.report("score", 4999) == [] and many.next_achievement("score") == (5000, "score 5000")
+        print("✓ 5000 thresholds tracked with a single cursor")
+        
+        game_state = GameState(seed=4)
+        economy = game_state.economy
+        economy.add_money(600)
+        assert economy.achieved_milestones == {100, 500}
+        assert economy.get_economic_summary()["next_milestone"] == "Established Gardener (400 more needed)"
+        economy.update(1.0)
+        assert economy.achieved_milestones == {100, 500}
+        print("✓ Money milestones unlock as earnings arrive")
+        
+        game_state.player.add_experience(450)
+        for x in range(3):
+            game_state.garden.plant_seed(x, 0, "carrot")
+        for _ in range(12):
+            game_state.water_plants()
+            game_state.simulate(10.0)
+        assert game_state.harvest_plants()["harvested"] == 3
+        names = {name for _, _, name in game_state.achievements.collect()}
+        assert {"First Harvest", "Small Farmer", "Apprentice Gardener", "First Crop"} <= names
+        print(f"✓ Harvest and level achievements unlocked: {sorted(names)}")
+        
+        print("\nAchievement tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Achievement test failed: {e}")
+        return False
+
+def test_transaction_ledger():
+    """Test the columnar transaction ledger and its disk spill"""
+    print("\nTesting transaction ledger...")
+    
+    try:
+        import os
+        import numpy as np
+        from game_state import GameState
+        from constants import STARTING_MONEY
+        from ledger import Ledger
+        
+        # Tiny chunks so most entries end up spilled to disk
+        ledger = Ledger(chunk_size=8, memory_chunks=2, day_length=100.0)
+        for i in range(200):
+            ledger.append(i * 2.0, "sale", ("carrot", "corn")[i % 2], 10)
+            if i % 5 == 0:
+                ledger.append(i * 2.0, "seeds", "carrot", -3)
+        assert len(ledger) == 240 and ledger.spilled == 224 and os.path.exists(ledger.spill_path)
+        assert len(ledger.chunks) <= 2
+        print(f"✓ {ledger.spilled} of {len(ledger)} entries spilled to disk")
+        
+        assert ledger.totals_by_item("sale") == {"carrot": 1000.0, "corn": 1000.0}
+        assert ledger.totals_by_kind(sign=-1) == {"seeds": -120.0} and ledger.totals_by_kind(sign=1) == {"sale": 2000.0}
+        assert ledger.total(sign=-1) == -120.0
+        entries = ledger.entries()
+        assert np.all(np.diff(entries["time"]) >= 0)
+        for start, end in ((0.0, 100.0), (55.0, 301.0), (390.0, 1000.0)):
+            inside = entries[(entries["time"] >= start) & (entries["time"] < end)]
+            assert ledger.total(start=start, end=end) == inside["amount"].sum()
+            assert ledger.total(kind="sale", item="corn", start=start, end=end) == \
+                inside["amount"][inside["item"] == ledger.ids["corn"]].sum()
+        assert ledger.daily_net() == {1: 470.0, 2: 470.0, 3: 470.0, 4: 470.0}
+        assert ledger.rolling_spend(now=40.0, window=10.0) == 6.0
+        print("✓ Windowed totals match a scan of every entry")
+        spill_path = ledger.spill_path
+        ledger.close()
+        assert not os.path.exists(spill_path)
+        print("✓ Spill file removed on close")
+        
+        game_state = GameState(seed=5)
+        economy = game_state.economy
+        assert game_state.purchase_item("seeds", "carrot")
+        for x in range(4):
+            game_state.garden.plant_seed(x, 0, ("carrot", "tomato")[x % 2])
+        for _ in range(20):
+            game_state.water_plants()
+            game_state.simulate(10.0)
+        result = game_state.harvest_plants()
+        assert result["harvested"] == 4
+        income = economy.get_income_by_type()
+        assert set(income) == {"carrot", "tomato"} and sum(income.values()) == result["earnings"]
+        assert economy.get_spending_by_kind() == {"seeds": 10.0}
+        assert sum(economy.get_daily_net().values()) == economy.money - STARTING_MONEY
+        assert economy.get_rolling_spend(100.0) == 0.0 and economy.get_rolling_spend() == 10.0
+        
+        # Spending stays visible for kinds that also bring money in
+        economy.add_money(50, "other")
+        economy.spend_money(20, "other")
+        assert economy.get_spending_by_kind() == {"seeds": 10.0, "other": 20.0}
+        print(f"✓ Game transactions recorded: income {income}")
+        
+        print("\nTransaction ledger tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Transaction ledger test failed: {e}")
+        return False
+
+def test_shop_price_table():
+    """Test the cached shop price table and affordability index"""
+    print("\nTesting shop price table...")
+    
+    try:
+        from shop import Shop
+        
+        shop = Shop()
+        for category in ("seeds", "tools"):
+            for item_name in shop.items[category]:
+                shop.unlock_item(category, item_name)
+        carrot = shop.get_item("seeds", "carrot")
+        assert carrot is shop.get_item("seeds", "carrot") and carrot["cost"] == 10
+        try:
+            carrot["cost"] = 0
+            assert False, "item records should be read-only"
+        except TypeError:
+            pass
+        assert shop.items["seeds"]["carrot"]["cost"] == 10
+        print("✓ Item records are shared and read-only")
+        
+        def brute_force(money):
+            items = [shop.get_item(cat, name) for cat in shop.unlocked_categories
+                     for name in shop.unlocked_items[cat]]
+            return sorted((item for item in items if item["cost"] <= money), key=lambda item: item["cost"])
+        
+        for money in (0, 9, 10, 59, 60, 150, 10000):
+            assert shop.get_recommended_items(money) == brute_force(money)
+        assert [item["item"] for item in shop.get_affordable_items(45, "seeds")] == ["carrot", "tomato", "corn"]
+        print("✓ Affordable items found by bisect match a full scan")
+        
+        shop.set_sale(0.5)
+        assert shop.get_item("seeds", "corn")["cost"] == 20
+        shop.add_daily_deal("sunflower", 0.75)
+        assert shop.get_item("seeds", "sunflower")["cost"] == 20
+        assert [item["item"] for item in shop.get_affordable_items(20, "seeds")] == \
+            ["carrot", "tomato", "corn", "sunflower"]
+        shop.clear_daily_deals()
+        assert shop.get_item_cost("seeds", "sunflower") == 40
+        assert shop.get_affordable_items(100, "fertilizers") == ()
+        shop.unlock_item("fertilizers", "basic_fertilizer")
+        assert [item["item"] for item in shop.get_recommended_items(20, "fertilizers")] == ["basic_fertilizer"]
+        for money in (0, 12, 40, 75, 300):
+            assert shop.get_recommended_items(money) == brute_force(money)
+        print("✓ Sales, deals and unlocks rebuild the index")
+        
+        print("\nShop price table tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Shop price table test failed: {e}")
+        return False
+
+def test_catalog():
+    """Test catalog validation, compilation and the compiled cache"""
+    print("\nTesting catalog...")
+    
+    try:
+        import json
+        import tempfile
+        import numpy as np
+        from catalog import CatalogError, load_catalog
+        from economy import Economy
+        from plant import get_plant_spec
+        from shop import Shop
+        
+        shop, economy = Shop(), Economy()
+        for seed_type in shop.items["seeds"]:
+            assert get_plant_spec(seed_type).base_value == economy.base_prices[seed_type]
+        assert set(shop.items["seeds"]) == set(economy.base_prices)
+        print("✓ Shop seeds, market prices and species come from one catalog")
+        
+        from constants import CATALOG
+        from garden import Garden
+        assert [get_plant_spec(key).type_id for key in CATALOG.species_keys] == list(range(len(CATALOG.species_keys)))
+        assert np.array_equal(economy.prices, CATALOG.base_value)
+        carrot_id = CATALOG.item_ids[("seeds", "carrot")]
+        shop.set_sale(0.5)
+        assert shop.get_item_cost("seeds", "carrot") == int(CATALOG.item_costs[carrot_id] * 0.5)
+        garden = Garden()
+        x, y = garden.get_plantable_positions()[0]
+        assert not garden.plant_seed(x, y, "not_a_plant") and garden.get_plant(x, y) is None
+        print("✓ Species, market prices and shop costs are indexed by catalog id")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.json")
+            species = {f"plant_{i}": {"name": f"Plant {i}", "growth_time": 5.0 + i % 20, "water_need": 1 + i % 4,
+                                      "base_value": 10 + i, "mutation_chance": 0.05, "color": [i % 256, 0, 0],
+                                      "seed": {"name": f"Plant {i} Seeds", "cost": 5 + i, "description": ""}}
+                       for i in range(3000)}
+            catalog = {"version": 1, "species": species,
+                       "items": {"tools": {"hoe": {"name": "Hoe", "cost": 5, "description": "Digs"}}}}
+            with open(path, "w") as f:
+                json.dump(catalog, f)
+            
+            compiled = load_catalog(path)
+            assert os.path.exists(os.path.join(directory, "catalog.cache.npz"))
+            cached = load_catalog(path)
+            assert cached.species_keys == compiled.species_keys and cached.item_ids == compiled.item_ids
+            assert np.array_equal(cached.base_value, np.arange(3000) + 10)
+            assert cached.item_ids[("tools", "hoe")] == 3000 and cached.item_costs[3000] == 5
+            print(f"✓ {len(cached.species_keys)} species compiled once and reloaded from the cache")
+            
+            catalog["species"]["plant_0"]["base_value"] = 99
+            with open(path, "w") as f:
+                json.dump(catalog, f)
+            assert load_catalog(path).base_value[0] == 99
+            print("✓ Editing the catalog invalidates the cache")
+            
+            bad_catalogs = [
+                '{"version": 1, "species": {"a": {}}, "items": {}}',
+                '{"version": 1, "species": {}, "items": {}}',
+                '{"version": 1, "species": {"a": {"name": "A", "growth_time": 1, "water_need": 1, '
+                '"base_value": 1, "mutation_chance": 0.1, "color": [1, 2]}}, "items": {}}',
+                '{"version": 1, "species": {"a": {"name": "A", "growth_time": 1, "water_need": 1, '
+                '"base_value": 1, "mutation_chance": 0.1, "color": [1, 2, 3]}, '
+                '"a": {"name": "A", "growth_time": 1, "water_need": 1, '
+                '"base_value": 1, "mutation_chance": 0.1, "color": [1, 2, 3]}}, "items": {}}',
+            ]
+            for text in bad_catalogs:
+                with open(path, "w") as f:
+                    f.write(text)
+                try:
+                    load_catalog(path)
+                    assert False, "malformed catalog was accepted"
+                except CatalogError as e:
+                    assert str(e).startswith(path)
+            print("✓ Malformed catalogs are rejected with the offending field")
+        
+        print("\nCatalog tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Catalog test failed: {e}")
+        return False
+
+def test_cart_checkout():
+    """Test all-or-nothing bulk purchases through a cart"""
+    print("\nTesting cart checkout...")
+    
+    try:
+        from game_state import GameState
+        from shop import Cart
+        
+        game_state = GameState(seed=6)
+        economy, player = game_state.economy, game_state.player
+        economy.add_money(10000)
+        cart = Cart()
+        cart.add("seeds", "carrot", 300)
+        cart.add("seeds", "tomato", 10)
+        cart.add("seeds", "carrot", 200)
+        cart.add("tools", "sprinkler")
+        cart.add("expansions", "garden_expansion", 2)
+        assert len(cart) == 4
+        
+        money, expansions = economy.money, game_state.garden.expansions
+        result = game_state.purchase_items(cart)
+        assert result["purchased"] and result["items"] == 513
+        assert result["total"] == 500 * 10 + 10 * 25 + 500 + 2 * 200 == money - economy.money
+        assert player.seeds["carrot"] == 505 and player.seeds["tomato"] == 10 and "sprinkler" in player.tools
+        assert game_state.garden_expansions == 3
+        assert game_state.garden.expansions == expansions + 2
+        assert economy.get_spending_by_kind() == {"seeds": 5250.0, "tools": 500.0, "expansions": 400.0}
+        print(f"✓ {result['items']} items bought in one checkout for {result['total']} coins")
+        
+        game_state.shop.set_sale(0.5)
+        assert game_state.purchase_items([("seeds", "corn", 10)])["total"] == 200
+        print("✓ Lines are priced at the current sale prices")
+        
+        money, seeds = economy.money, dict(player.seeds)
+        too_much = game_state.purchase_items([("seeds", "corn", 1), ("seeds", "tomato", 10 ** 6)])
+        unknown = game_state.purchase_items([("seeds", "corn", 1), ("seeds", "cactus", 1)])
+        assert not too_much["purchased"] and too_much["reason"] == "unaffordable"
+        assert not unknown["purchased"] and unknown["invalid"] == [("seeds", "cactus", 1)]
+        for quantity in (0, 1.5, True, "2"):
+            assert game_state.purchase_items([("seeds", "corn", quantity)])["reason"] == "invalid"
+        assert economy.money == money and player.seeds == seeds
+        print("✓ Failed checkouts leave money and inventory untouched")
+        
+        game_state.shop.unlock_category("fertilizers")
+        garden = game_state.garden
+        assert garden.max_expansions - garden.expansions == 0
+        for lines in ([("expansions", "greenhouse", 1)], [("fertilizers", "basic_fertilizer", 1)]):
+            result = game_state.purchase_items([("seeds", "corn", 1)] + lines)
+            assert result["reason"] == "invalid" and result["invalid"] == lines
+        assert economy.money == money and garden.expansions == garden.max_expansions
+        fresh = GameState(seed=6)
+        fresh.economy.add_money(10000)
+        result = fresh.purchase_items([("expansions", "garden_expansion", 2), ("expansions", "greenhouse", 1)])
+        assert result["reason"] == "invalid" and len(result["invalid"]) == 2 and fresh.garden.expansions == 1
+        print("✓ Expansions past the garden's cap and fertilizers are refused before payment")
+        
+        assert game_state.purchase_item("seeds", "corn") and player.seeds["corn"] == 11
+        print("✓ Single purchases go through the same path")
+        
+        print("\nCart checkout tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Cart checkout test failed: {e}")
+        return False
+
+def test_fixed_timestep():
+    """Test fixed-rate stepping and interpolation between steps"""
+    print("\nTesting fixed timestep...")
+    
+    try:
+        from game_state import GameState
+        from timestep import FixedTimestep, Interpolator
+        
+        timestep = FixedTimestep(tick_rate=20, max_steps=5)
+        steps = [timestep.advance(1 / 60) for _ in range(60)]
+        assert sum(steps) == 20 and max(steps) == 1
+        assert timestep.advance(0.025) == 0 and abs(timestep.alpha - 0.5) < 1e-9
+        print(f"✓ 60 frames at 60 Hz ran {sum(steps)} steps at 20 Hz")
+        
+        assert timestep.advance(2.0) == 5
+        assert abs(timestep.dropped - 1.75) < 1e-9 and 0 <= timestep.alpha < 1
+        print("✓ A 2 second hitch runs 5 catch-up steps and drops the rest")
+        
+        game_state = GameState(seed=7)
+        player = game_state.player
+        game_state.garden.plant_seed(1, 1, "carrot")
+        interpolator = Interpolator((0, 0, 10, 10))
+        interpolator.capture(game_state)
+        start = (player.x, player.y)
+        player.move("right", True)
+        game_state.update(0.05)
+        interpolator.capture(game_state)
+        x, y = interpolator.player_position(0.5)
+        assert abs(x - (start[0] + player.x) / 2) < 1e-9 and y == start[1]
+        print("✓ Player drawn halfway between the last two steps")
+        
+        # Grow the plant a stage between two captures
+        game_state.water_plants()
+        interpolator.capture(game_state)
+        plant = game_state.garden.get_plant(1, 1)
+        before = plant.get_visual_properties()["size"]
+        game_state.update(10.0)
+        interpolator.capture(game_state)
+        after = plant.get_visual_properties()["size"]
+        assert after > before
+        [(drawn, size)] = interpolator.plants(0.25)
+        old_id = plant.plant_id
+        assert drawn.plant_id == old_id and abs(size - (before + (after - before) * 0.25)) < 1e-9
+        
+        # A new plant in a reused row isn't blended with the old one
+        game_state.garden.remove_plant(1, 1)
+        game_state.garden.plant_seed(1, 1, "carrot")
+        interpolator.refresh(game_state)
+        [(drawn, size)] = interpolator.plants(0.5)
+        assert drawn.plant_id != old_id and size == drawn.props["size"]
+        print("✓ Plant sizes blend between steps, keyed by plant")
+        
+        # Only chunks overlapping the captured rect are copied
+        from garden import Garden
+        from timestep import capture_snapshot
+        game_state.garden = Garden(width=100, height=100)
+        game_state.garden._unlock((0, 0, 100, 100), 1.0, 0)
+        soil = capture_snapshot(game_state, (40, 40, 70, 60)).soil
+        assert sorted((chunk.origin_x, chunk.origin_y) for chunk in soil) == [(32, 32), (64, 32)]
+        print("✓ Snapshots copy only the soil chunks in view")
+        
+        print("\nFixed timestep tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Fixed timestep test failed: {e}")
+        return False
+
+def test_simulation_thread():
+    """Test the simulation thread's command queue and published snapshots"""
+    print("\nTesting simulation thread...")
+    
+    try:
+        import time
+        from game_state import GameState
+        from sim_thread import SimulationThread
+        
+        game_state = GameState(seed=7)
+        simulation = SimulationThread(game_state, (0, 0, 10, 10), tick_rate=20)
+        first = simulation.read()[1]
+        
+        # Commands run on the simulation side before the next step
+        def plant(state, x, y):
+            if state.plant_seed(x, y, "carrot"):
+                return "Planted carrot!"
+        simulation.submit(plant, 1, 1)
+        assert game_state.garden.get_plant(1, 1) is None
+        assert simulation.advance(0.05) == 1
+        assert simulation.take_notifications() == ["Planted carrot!"]
+        previous, latest = simulation.read()
+        assert previous is first and latest.tick == first.tick + 1
+        assert [(visual.x, visual.y) for visual in latest.plants] == [(1, 1)]
+        assert latest.hud["money"] == game_state.economy.money
+        assert dict(latest.hud["shop"])["seeds"] == game_state.shop.get_available_items("seeds")
+        print("✓ Submitted commands apply before the step and publish a snapshot")
+        
+        # Catch-up steps publish one snapshot for the frame
+        assert simulation.advance(0.16) == 3
+        previous, caught_up = simulation.read()
+        assert previous is latest and caught_up.tick == latest.tick + 3
+        latest = caught_up
+        
+        # A command between steps is shown without advancing the tick
+        simulation.submit(plant, 2, 1)
+        assert simulation.advance(0.0) == 0
+        assert simulation.read()[1].tick == latest.tick and len(simulation.read()[1].plants) == 2
+        
+        # Snapshots are immutable copies
+        chunk = latest.soil[0]
+        try:
+            chunk.water_levels[0, 0] = 1
+            assert False, "soil copy should be read-only"
+        except ValueError:
+            pass
+        try:
+            latest.plants[0].props["size"] = 2.0
+            assert False, "plant properties should be read-only"
+        except TypeError:
+            pass
+        water = chunk.water_levels.copy()
+        game_state.water_plants()
+        assert (chunk.water_levels == water).all()
+        assert not (game_state.garden.chunks[(0, 0)].water_levels == water).all()
+        print("✓ Snapshots are read-only and unaffected by later steps")
+        
+        # Pausing stops steps but still runs commands
+        simulation.paused = True
+        simulation.submit(plant, 3, 1)
+        assert simulation.advance(1.0) == 0 and simulation.timestep.accumulator == 0.0
+        assert game_state.garden.get_plant(3, 1) is not None
+        simulation.paused = False
+        print("✓ Pausing stops stepping")
+        
+        # The real thread keeps stepping until stopped
+        tick = simulation.read()[1].tick
+        simulation.start()
+        deadline = time.perf_counter() + 2.0
+        while simulation.read()[1].tick < tick + 3 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        simulation.stop(timeout=2.0)
+        assert simulation.error is None and simulation.read()[1].tick >= tick + 3
+        assert not simulation._thread.is_alive()
+        print("✓ Simulation thread steps on its own and stops cleanly")
+        
+        print("\nSimulation thread tests passed!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Simulation thread test failed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("=== Grow Plants Game Test Suite ===\n")
@@ -162,7 +1454,31 @@ def main():
         test_imports,
         test_basic_functionality,
         test_plant_growth,
-        test_economy
+        test_economy,
+        test_vectorized_garden_update,
+        test_scheduled_garden_update,
+        test_lazy_garden_update,
+        test_random_streams,
+        test_plant_specs,
+        test_growth_rate_cache,
+        test_large_step_integration,
+        test_headless_simulation,
+        test_batch_runner,
+        test_garden_grids,
+        test_spatial_index,
+        test_state_indexes,
+        test_bulk_operations,
+        test_pest_contagion,
+        test_sharded_simulation,
+        test_price_history,
+        test_batch_valuation,
+        test_achievements,
+        test_transaction_ledger,
+        test_shop_price_table,
+        test_catalog,
+        test_cart_checkout,
+        test_fixed_timestep,
+        test_simulation_thread
     ]
     
     passed = 0